@@ -0,0 +1,63 @@
+"""employer notification mode
+
+Revision ID: 3f9d2c71b0e5
+Revises: a4843ee54200
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9d2c71b0e5"
+down_revision: Union[str, None] = "a4843ee54200"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    notification_mode = sa.Enum(
+        "INSTANT", "BATCHED", "HOURLY", name="notification_mode"
+    )
+    notification_mode.create(op.get_bind(), checkfirst=True)
+
+    op.add_column(
+        "employers",
+        sa.Column(
+            "notification_mode",
+            notification_mode,
+            server_default="INSTANT",
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "employers",
+        sa.Column(
+            "digest_interval_minutes",
+            sa.Integer(),
+            server_default="15",
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "employers",
+        sa.Column("last_digest_at", sa.DateTime(), nullable=True),
+    )
+    # сводка выбирает новые заявки по created_at
+    op.create_index(
+        op.f("ix_applications_created_at"),
+        "applications",
+        ["created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_applications_created_at"), table_name="applications")
+    op.drop_column("employers", "last_digest_at")
+    op.drop_column("employers", "digest_interval_minutes")
+    op.drop_column("employers", "notification_mode")
+    sa.Enum(name="notification_mode").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,56 @@
+"""candidates without telegram (imported applications)
+
+Revision ID: a7d5e2b8c614
+Revises: f4a2c8e6b913
+Create Date: 2026-10-19 17:35:40.291877
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d5e2b8c614"
+down_revision: Union[str, None] = "f4a2c8e6b913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # заявки с бумаги и job-бордов: кандидат без Telegram, ключ — телефон
+    op.alter_column(
+        "candidates",
+        "tg_user_id",
+        existing_type=sa.Integer(),
+        nullable=True,
+    )
+    op.add_column(
+        "candidates",
+        sa.Column("phone", sa.String(length=40), nullable=True),
+    )
+    op.create_index(
+        "uq_candidates_offline_phone",
+        "candidates",
+        ["phone"],
+        unique=True,
+        postgresql_where=sa.text("tg_user_id IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    for table in ("applications", "applications_archive"):
+        op.execute(
+            f"DELETE FROM {table} WHERE candidate_id IN "
+            "(SELECT id FROM candidates WHERE tg_user_id IS NULL)"
+        )
+    op.execute("DELETE FROM candidates WHERE tg_user_id IS NULL")
+    op.drop_index("uq_candidates_offline_phone", table_name="candidates")
+    op.drop_column("candidates", "phone")
+    op.alter_column(
+        "candidates",
+        "tg_user_id",
+        existing_type=sa.Integer(),
+        nullable=False,
+    )
@@ -0,0 +1,63 @@
+"""sent messages registry (employer cards)
+
+Revision ID: a9c4e7f2b1d5
+Revises: e6a1b9d4c3f8
+Create Date: 2026-10-19 21:03:17.554120
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a9c4e7f2b1d5"
+down_revision: Union[str, None] = "e6a1b9d4c3f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sent_messages",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("application_id", sa.Integer(), nullable=False),
+        sa.Column("employer_tg_id", sa.Integer(), nullable=False),
+        sa.Column("chat_id", sa.Integer(), nullable=False),
+        sa.Column("message_id", sa.Integer(), nullable=False),
+        sa.Column("photo_url", sa.String(length=255), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "chat_id",
+            "message_id",
+            name="uq_sent_messages_chat_message",
+        ),
+    )
+    op.create_index(
+        op.f("ix_sent_messages_application_id"),
+        "sent_messages",
+        ["application_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_sent_messages_expires_at"),
+        "sent_messages",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_sent_messages_expires_at"), table_name="sent_messages")
+    op.drop_index(
+        op.f("ix_sent_messages_application_id"), table_name="sent_messages"
+    )
+    op.drop_table("sent_messages")
@@ -0,0 +1,56 @@
+"""employer auth_version for admin session revocation
+
+Revision ID: b3e9f1a4d702
+Revises: a7d5e2b8c614
+Create Date: 2026-10-19 18:20:05.617342
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e9f1a4d702"
+down_revision: Union[str, None] = "a7d5e2b8c614"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "employers",
+        sa.Column(
+            "auth_version",
+            sa.Integer(),
+            server_default="1",
+            nullable=False,
+        ),
+    )
+    # смена роли или деактивация отзывает выданные admin-токены,
+    # каким бы путём ни менялась строка (API, seed, руками в psql)
+    op.execute(
+        """
+        CREATE FUNCTION employers_bump_auth_version() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.role IS DISTINCT FROM OLD.role
+               OR NEW.is_active IS DISTINCT FROM OLD.is_active THEN
+                NEW.auth_version := OLD.auth_version + 1;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER employers_bump_auth_version "
+        "BEFORE UPDATE ON employers "
+        "FOR EACH ROW EXECUTE FUNCTION employers_bump_auth_version()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER employers_bump_auth_version ON employers")
+    op.execute("DROP FUNCTION employers_bump_auth_version()")
+    op.drop_column("employers", "auth_version")
@@ -0,0 +1,60 @@
+"""applications.status_changed_at for photo retention
+
+Revision ID: b6f2d9e4a318
+Revises: a9c4e7f2b1d5
+Create Date: 2026-10-19 21:40:12.508311
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b6f2d9e4a318"
+down_revision: Union[str, None] = "a9c4e7f2b1d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # в обе таблицы: порядок колонок должен совпадать (архивация — SELECT *)
+    for table in ("applications", "applications_archive"):
+        op.add_column(
+            table,
+            sa.Column("status_changed_at", sa.DateTime(), nullable=True),
+        )
+        # когда отклонили старые заявки, неизвестно — срок хранения фото
+        # отсчитываем с миграции, а не с created_at
+        op.execute(
+            f"UPDATE {table} SET status_changed_at = localtimestamp "
+            "WHERE status = 'REJECTED'"
+        )
+
+    # любая смена статуса (API, бот, руками в psql); на партиционированной
+    # таблице триггер наследуется партициями
+    op.execute(
+        """
+        CREATE FUNCTION applications_status_changed_at() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.status IS DISTINCT FROM OLD.status THEN
+                NEW.status_changed_at := localtimestamp;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER applications_status_changed_at "
+        "BEFORE UPDATE ON applications "
+        "FOR EACH ROW EXECUTE FUNCTION applications_status_changed_at()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER applications_status_changed_at ON applications")
+    op.execute("DROP FUNCTION applications_status_changed_at()")
+    for table in ("applications_archive", "applications"):
+        op.drop_column(table, "status_changed_at")
@@ -0,0 +1,41 @@
+"""sent_messages chat ids to bigint
+
+Revision ID: c3e8a5f1d724
+Revises: b6f2d9e4a318
+Create Date: 2026-10-19 22:10:41.173902
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3e8a5f1d724"
+down_revision: Union[str, None] = "b6f2d9e4a318"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # id пользователей и чатов Telegram не влезают в int4
+    for column in ("employer_tg_id", "chat_id"):
+        op.alter_column(
+            "sent_messages",
+            column,
+            existing_type=sa.Integer(),
+            type_=sa.BigInteger(),
+            existing_nullable=False,
+        )
+
+
+def downgrade() -> None:
+    for column in ("employer_tg_id", "chat_id"):
+        op.alter_column(
+            "sent_messages",
+            column,
+            existing_type=sa.BigInteger(),
+            type_=sa.Integer(),
+            existing_nullable=False,
+        )
@@ -0,0 +1,131 @@
+"""partition applications by month, add applications_archive
+
+Revision ID: c5a8d3e1f764
+Revises: 8b41e6f0c2d7
+Create Date: 2026-10-19 11:20:54.730016
+
+"""
+
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5a8d3e1f764"
+down_revision: Union[str, None] = "8b41e6f0c2d7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# сколько месяцев вперёд создаём партиции (дальше — app/db/partitions.py)
+MONTHS_AHEAD = 3
+
+INDEXES = {
+    "ix_applications_candidate_id": "candidate_id",
+    "ix_applications_vacancy_id": "vacancy_id",
+    "ix_applications_status": "status",
+    "ix_applications_created_at": "created_at",
+}
+
+
+def _add_months(d: date, months: int) -> date:
+    total = d.year * 12 + d.month - 1 + months
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def _create_month_partition(month: date) -> None:
+    op.execute(
+        f"CREATE TABLE IF NOT EXISTS applications_y{month:%Y}m{month:%m} "
+        f"PARTITION OF applications "
+        f"FOR VALUES FROM ('{month.isoformat()}') "
+        f"TO ('{_add_months(month, 1).isoformat()}')"
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # 1) освобождаем имена: старая таблица -> applications_old
+    op.execute("ALTER TABLE applications RENAME TO applications_old")
+    op.execute("ALTER INDEX applications_pkey RENAME TO applications_old_pkey")
+    for name in INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {name} RENAME TO {name}_old")
+    # последовательность id переезжает на новую таблицу
+    op.execute("ALTER SEQUENCE applications_id_seq OWNED BY NONE")
+
+    # 2) партиционированная таблица с теми же колонками
+    op.execute(
+        "CREATE TABLE applications (LIKE applications_old INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute("ALTER TABLE applications ADD PRIMARY KEY (id, created_at)")
+    # ключ партиции должен быть известен при INSERT — как и в модели,
+    # created_at заполняет БД
+    op.execute("ALTER TABLE applications ALTER COLUMN created_at SET DEFAULT now()")
+    op.execute(
+        "ALTER TABLE applications ADD CONSTRAINT applications_candidate_id_fkey "
+        "FOREIGN KEY (candidate_id) REFERENCES candidates (id)"
+    )
+    op.execute(
+        "ALTER TABLE applications ADD CONSTRAINT applications_vacancy_id_fkey "
+        "FOREIGN KEY (vacancy_id) REFERENCES vacancies (id)"
+    )
+    for name, column in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON applications ({column})")
+    op.execute("ALTER SEQUENCE applications_id_seq OWNED BY applications.id")
+
+    # 3) партиции: от самой старой заявки до MONTHS_AHEAD вперёд + default
+    first = bind.exec_driver_sql(
+        "SELECT date_trunc('month', min(created_at))::date FROM applications_old"
+    ).scalar()
+    this_month = date.today().replace(day=1)
+    month = min(first or this_month, this_month)
+    while month <= _add_months(this_month, MONTHS_AHEAD):
+        _create_month_partition(month)
+        month = _add_months(month, 1)
+    op.execute("CREATE TABLE applications_default PARTITION OF applications DEFAULT")
+
+    # 4) данные
+    op.execute("INSERT INTO applications SELECT * FROM applications_old")
+    op.execute("DROP TABLE applications_old")
+
+    # 5) холодный архив: те же колонки в том же порядке, без партиций
+    op.execute(
+        "CREATE TABLE applications_archive (LIKE applications INCLUDING DEFAULTS)"
+    )
+    op.execute("ALTER TABLE applications_archive ADD PRIMARY KEY (id)")
+    for name, column in INDEXES.items():
+        archive_name = name.replace("ix_applications_", "ix_applications_archive_")
+        op.execute(f"CREATE INDEX {archive_name} ON applications_archive ({column})")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE applications RENAME TO applications_part")
+    op.execute(
+        "ALTER TABLE applications_part "
+        "RENAME CONSTRAINT applications_pkey TO applications_part_pkey"
+    )
+    for name in INDEXES:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_part")
+    op.execute("ALTER SEQUENCE applications_id_seq OWNED BY NONE")
+
+    op.execute(
+        "CREATE TABLE applications (LIKE applications_part INCLUDING DEFAULTS)"
+    )
+    op.execute("ALTER TABLE applications ADD PRIMARY KEY (id)")
+    op.execute("INSERT INTO applications SELECT * FROM applications_part")
+    op.execute("INSERT INTO applications SELECT * FROM applications_archive")
+    op.execute("DROP TABLE applications_part")
+    op.execute("DROP TABLE applications_archive")
+
+    op.execute(
+        "ALTER TABLE applications ADD CONSTRAINT applications_candidate_id_fkey "
+        "FOREIGN KEY (candidate_id) REFERENCES candidates (id)"
+    )
+    op.execute(
+        "ALTER TABLE applications ADD CONSTRAINT applications_vacancy_id_fkey "
+        "FOREIGN KEY (vacancy_id) REFERENCES vacancies (id)"
+    )
+    for name, column in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON applications ({column})")
+    op.execute("ALTER SEQUENCE applications_id_seq OWNED BY applications.id")
@@ -0,0 +1,33 @@
+"""read_primary_marks for bot read-your-writes
+
+Revision ID: d7b2f6a9c145
+Revises: c3e8a5f1d724
+Create Date: 2026-10-19 22:48:05.362117
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7b2f6a9c145"
+down_revision: Union[str, None] = "c3e8a5f1d724"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # UNLOGGED: метка живёт секунды, WAL и реплика ей не нужны
+    op.create_table(
+        "read_primary_marks",
+        sa.Column("tg_user_id", sa.BigInteger(), nullable=False),
+        sa.Column("until", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("tg_user_id"),
+        prefixes=["UNLOGGED"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("read_primary_marks")
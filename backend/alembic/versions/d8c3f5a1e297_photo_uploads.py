@@ -0,0 +1,48 @@
+"""photo uploads (resumable)
+
+Revision ID: d8c3f5a1e297
+Revises: b3e9f1a4d702
+Create Date: 2026-10-19 19:12:44.208631
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d8c3f5a1e297"
+down_revision: Union[str, None] = "b3e9f1a4d702"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "photo_uploads",
+        sa.Column("id", sa.String(length=32), nullable=False),
+        sa.Column("tg_user_id", sa.Integer(), nullable=False),
+        sa.Column("content_type", sa.String(length=32), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("offset", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_photo_uploads_expires_at"),
+        "photo_uploads",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_photo_uploads_expires_at"), table_name="photo_uploads")
+    op.drop_table("photo_uploads")
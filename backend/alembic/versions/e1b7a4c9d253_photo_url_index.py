@@ -0,0 +1,41 @@
+"""photo_url index
+
+Revision ID: e1b7a4c9d253
+Revises: c5a8d3e1f764
+Create Date: 2026-10-19 16:02:37.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e1b7a4c9d253"
+down_revision: Union[str, None] = "c5a8d3e1f764"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # сборщик осиротевших фото ищет файлы по photo_url пачками
+    op.create_index(
+        op.f("ix_applications_photo_url"),
+        "applications",
+        ["photo_url"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_applications_archive_photo_url"),
+        "applications_archive",
+        ["photo_url"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_applications_archive_photo_url"),
+        table_name="applications_archive",
+    )
+    op.drop_index(op.f("ix_applications_photo_url"), table_name="applications")
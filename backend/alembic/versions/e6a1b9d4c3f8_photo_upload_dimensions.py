@@ -0,0 +1,28 @@
+"""photo upload declared dimensions
+
+Revision ID: e6a1b9d4c3f8
+Revises: d8c3f5a1e297
+Create Date: 2026-10-19 20:31:09.774120
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e6a1b9d4c3f8"
+down_revision: Union[str, None] = "d8c3f5a1e297"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("photo_uploads", sa.Column("width", sa.Integer(), nullable=True))
+    op.add_column("photo_uploads", sa.Column("height", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("photo_uploads", "height")
+    op.drop_column("photo_uploads", "width")
@@ -0,0 +1,32 @@
+"""applications summary covering index
+
+Revision ID: f4a2c8e6b913
+Revises: e1b7a4c9d253
+Create Date: 2026-10-19 16:48:12.504331
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f4a2c8e6b913"
+down_revision: Union[str, None] = "e1b7a4c9d253"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # WHERE status = ? ORDER BY created_at DESC — index-only scan по партициям
+    op.create_index(
+        "ix_applications_summary",
+        "applications",
+        ["status", "created_at"],
+        unique=False,
+        postgresql_include=["id", "full_name", "photo_url"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_applications_summary", table_name="applications")
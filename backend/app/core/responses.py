@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+from fastapi.responses import ORJSONResponse
+
+
+def rows_response(rows: Iterable[Sequence], fields: Sequence[str]) -> ORJSONResponse:
+    """
+    JSON-список из строк Core-запроса (кортежей) без ORM и pydantic.
+
+    Колонки запроса должны идти в порядке fields. Типы (datetime, date,
+    str-enum) orjson сериализует сам.
+    """
+    return ORJSONResponse([dict(zip(fields, row)) for row in rows])
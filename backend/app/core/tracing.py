@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Any, Iterator
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# пробы дёргаются каждые несколько секунд — в трейсах только шум
+EXCLUDED_URLS = "livez,health,readyz"
+
+# токен бота в пути запросов к Bot API — в трейсы не пишем
+_TOKEN_IN_PATH = re.compile(r"/bot[^/]+/")
+
+_provider = None
+
+
+def setup_tracing(app, engines: list) -> bool:
+    """
+    Трейсинг OpenTelemetry (settings.tracing_exporter):
+    - входящие запросы FastAPI, контекст — из заголовка traceparent
+      (его ставит бот);
+    - SQL-запросы движков engines;
+    - исходящие httpx (api.telegram.org).
+
+    Выключен — ничего не импортируется и не оборачивается.
+
+    Returns:
+        bool: трейсинг включён
+    """
+    global _provider
+    if not settings.tracing_exporter or _provider is not None:
+        return _provider is not None
+
+    from opentelemetry import trace
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.tracing_service_name}),
+        sampler=_sampler(),
+    )
+    provider.add_span_processor(BatchSpanProcessor(_exporter()))
+    trace.set_tracer_provider(provider)
+
+    FastAPIInstrumentor.instrument_app(app, excluded_urls=EXCLUDED_URLS)
+    for engine in engines:
+        if engine is not None:
+            SQLAlchemyInstrumentor().instrument(engine=engine)
+    HTTPXClientInstrumentor().instrument(request_hook=_name_client_span)
+
+    _provider = provider
+    logger.info(
+        "tracing: %s exporter, sample ratio %s",
+        settings.tracing_exporter,
+        settings.tracing_sample_ratio,
+    )
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Досылает накопленные спаны."""
+    global _provider
+    if _provider is not None:
+        _provider.shutdown()
+        _provider = None
+
+
+def _name_client_span(span, request) -> None:
+    """«telegram sendPhoto» вместо «POST», URL без токена бота."""
+    if not span.is_recording():
+        return
+    url = str(request.url)
+    if "/bot" in url:
+        span.update_name(f"telegram {url.rsplit('/', 1)[-1]}")
+        redacted = _TOKEN_IN_PATH.sub("/bot<token>/", url)
+        for key in ("http.url", "url.full"):
+            if key in span.attributes:
+                span.set_attribute(key, redacted)
+
+
+def _sampler():
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace.sampling import (
+        Decision,
+        ParentBased,
+        Sampler,
+        SamplingResult,
+        TraceIdRatioBased,
+    )
+
+    # решение о сэмплировании принимает бот, backend его продолжает
+    base = ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio))
+
+    class SkipOrphanClients(Sampler):
+        """
+        SQL и HTTP вне запроса (периодические задачи, /readyz) — без
+        трейса: отдельные спаны без родителя только засоряют выгрузку.
+        """
+
+        def should_sample(
+            self, parent_context, trace_id, name, kind=None, *args, **kwargs
+        ):
+            parent = trace.get_current_span(parent_context).get_span_context()
+            if not parent.is_valid and kind == trace.SpanKind.CLIENT:
+                return SamplingResult(Decision.DROP)
+            return base.should_sample(
+                parent_context, trace_id, name, kind, *args, **kwargs
+            )
+
+        def get_description(self) -> str:
+            return f"SkipOrphanClients({base.get_description()})"
+
+    return SkipOrphanClients()
+
+
+def _exporter():
+    if settings.tracing_exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+    if settings.tracing_exporter == "jsonl":
+        return _jsonl_exporter(Path(settings.tracing_jsonl_path))
+    raise RuntimeError(f"unknown TRACING_EXPORTER: {settings.tracing_exporter}")
+
+
+def _jsonl_exporter(path: Path):
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+    class JsonlSpanExporter(SpanExporter):
+        """Спан — строка JSON в файле: разбор без коллектора (jq, pandas)."""
+
+        def __init__(self) -> None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = path.open("a", encoding="utf-8")
+            self._lock = threading.Lock()
+
+        def export(self, spans) -> SpanExportResult:
+            lines = [
+                json.dumps(json.loads(span.to_json()), ensure_ascii=False)
+                for span in spans
+            ]
+            with self._lock:
+                self._file.write("\n".join(lines) + "\n")
+                self._file.flush()
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self) -> None:
+            with self._lock:
+                self._file.close()
+
+    return JsonlSpanExporter()
+
+
+def current_context() -> Any:
+    """
+    Контекст текущего спана — чтобы продолжить трейс в другом потоке
+    (очередь уведомлений). None, если трейсинг выключен.
+    """
+    if _provider is None:
+        return None
+    from opentelemetry import context
+
+    return context.get_current()
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes: Any) -> Iterator[None]:
+    """Свой спан вокруг блока; при выключенном трейсинге — ничего."""
+    if _provider is None:
+        yield
+        return
+    tracer = _provider.get_tracer(__name__)
+    with tracer.start_as_current_span(name, attributes=attributes):
+        yield
+
+
+@contextlib.contextmanager
+def attached(ctx: Any) -> Iterator[None]:
+    """Выполняет блок в контексте из current_context()."""
+    if ctx is None:
+        yield
+        return
+    from opentelemetry import context
+
+    token = context.attach(ctx)
+    try:
+        yield
+    finally:
+        context.detach(token)
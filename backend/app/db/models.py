@@ -5,15 +5,19 @@ from datetime import date, datetime
 
 from app.db.base import Base
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Date,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -49,21 +53,42 @@ class Vacancy(Base):
 
 class Candidate(Base):
     __tablename__ = "candidates"
+    __table_args__ = (
+        # кандидаты из импорта (без Telegram) различаются по телефону
+        Index(
+            "uq_candidates_offline_phone",
+            "phone",
+            unique=True,
+            postgresql_where=text("tg_user_id IS NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    tg_user_id: Mapped[int] = mapped_column(
-        Integer, unique=True, index=True, nullable=False
+    # NULL — кандидат пришёл не через бота (импорт CSV)
+    tg_user_id: Mapped[int | None] = mapped_column(
+        Integer, unique=True, index=True, nullable=True
     )
     tg_username: Mapped[str | None] = mapped_column(String(80), nullable=True)
+    # только цифры; заполняется для кандидатов без tg_user_id
+    phone: Mapped[str | None] = mapped_column(String(40), nullable=True)
 
     applications: Mapped[list["Application"]] = relationship(
         back_populates="candidate",
     )
 
 
-class Application(Base):
-    __tablename__ = "applications"
+class ApplicationColumns:
+    """
+    Колонки заявки. Общие для горячей applications (партиции по месяцам
+    created_at) и холодной applications_archive.
+
+    Порядок колонок в обеих таблицах одинаковый — архивация делает
+    INSERT ... SELECT * из DELETE ... RETURNING *. Новую колонку
+    добавлять в обе таблицы одной миграцией.
+    """
 
+    # в БД первичный ключ (id, created_at) — требование партиционирования;
+    # id уникален за счёт общей последовательности
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     candidate_id: Mapped[int] = mapped_column(
@@ -109,7 +134,9 @@ class Application(Base):
     )
     why_hire_facts: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    photo_url: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    photo_url: Mapped[str | None] = mapped_column(
+        String(255), nullable=True, index=True
+    )
 
     status: Mapped[ApplicationStatus] = mapped_column(
         Enum(ApplicationStatus, name="applicationstatus"),
@@ -119,7 +146,26 @@ class Application(Base):
     )
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), nullable=False
+        DateTime, server_default=func.now(), nullable=False, index=True
+    )
+    # последняя смена статуса (триггер в БД); от неё считается срок
+    # хранения фото отклонённых заявок
+    status_changed_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
+
+
+class Application(ApplicationColumns, Base):
+    __tablename__ = "applications"
+    __table_args__ = (
+        # списки в боте (fields=summary) читаются только из индекса
+        Index(
+            "ix_applications_summary",
+            "status",
+            "created_at",
+            postgresql_include=["id", "full_name", "photo_url"],
+        ),
     )
 
     candidate: Mapped["Candidate"] = relationship(
@@ -128,11 +174,32 @@ class Application(Base):
     vacancy: Mapped["Vacancy"] = relationship(back_populates="applications")
 
 
+class ApplicationArchive(ApplicationColumns, Base):
+    """
+    Закрытые (accepted/rejected) заявки старше settings.archive_after_days.
+    Только для чтения: переносятся сюда services/archive.py.
+    """
+
+    __tablename__ = "applications_archive"
+
+    # id приходит из applications как есть
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+
+
 class EmployerRole(str, enum.Enum):
     OWNER = "OWNER"
     RECRUITER = "RECRUITER"
 
 
+class NotificationMode(str, enum.Enum):
+    # каждое событие — отдельное сообщение
+    INSTANT = "instant"
+    # сводка раз в digest_interval_minutes
+    BATCHED = "batched"
+    # сводка раз в час
+    HOURLY = "hourly"
+
+
 class Employer(Base):
     __tablename__ = "employers"
 
@@ -141,7 +208,7 @@ class Employer(Base):
         Integer, unique=True, index=True, nullable=False
     )
     role: Mapped[EmployerRole] = mapped_column(
-        Enum(EmployerRole, name="employer_role"),
+        Enum(EmployerRole, name="employerrole"),
     )
     is_active: Mapped[bool] = mapped_column(
         Boolean,
@@ -149,6 +216,32 @@ class Employer(Base):
         nullable=False,
     )
 
+    notification_mode: Mapped[NotificationMode] = mapped_column(
+        Enum(NotificationMode, name="notification_mode"),
+        default=NotificationMode.INSTANT,
+        server_default=NotificationMode.INSTANT.name,
+        nullable=False,
+    )
+    digest_interval_minutes: Mapped[int] = mapped_column(
+        Integer,
+        default=15,
+        server_default="15",
+        nullable=False,
+    )
+    # до какого момента заявки уже попали в сводку
+    last_digest_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
+    # версия admin-сессий: токены со старой версией недействительны.
+    # Триггер в БД увеличивает её при смене role / is_active
+    auth_version: Mapped[int] = mapped_column(
+        Integer,
+        default=1,
+        server_default="1",
+        nullable=False,
+    )
+
 
 class EmployerInvite(Base):
     __tablename__ = "employer_invites"
@@ -177,3 +270,133 @@ class EmployerInvite(Base):
         server_default=func.now(),
         nullable=False,
     )
+
+
+class IdempotencyKey(Base):
+    """
+    Ответ на запрос с заголовком Idempotency-Key.
+    Повтор с тем же ключом получает сохранённый ответ, заявка не создаётся.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint(
+            "tg_user_id",
+            "scope",
+            "key",
+            name="uq_idempotency_keys_user_scope_key",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    tg_user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    # какой эндпоинт: "applications:create", "applications:photo:<id>"
+    scope: Mapped[str] = mapped_column(String(64), nullable=False)
+    key: Mapped[str] = mapped_column(String(128), nullable=False)
+
+    response_body: Mapped[str] = mapped_column(Text, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.now(),
+        nullable=False,
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        index=True,
+    )
+
+
+class PhotoUpload(Base):
+    """
+    Докачиваемая загрузка фото (routers/uploads.py): байты копятся в
+    media/uploads/<id>.part, offset — сколько уже принято.
+    После complete файл переезжает в media/photos, строка удаляется.
+    """
+
+    __tablename__ = "photo_uploads"
+
+    # uuid4 hex — не угадать чужую загрузку
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    tg_user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    content_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    # размер картинки, заявленный WebApp (сверяется с заголовком файла)
+    width: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    height: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    offset: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.now(),
+        nullable=False,
+    )
+    # сдвигается с каждым принятым куском
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        index=True,
+    )
+
+
+class SentMessage(Base):
+    """
+    Карточка заявки, отправленная работодателю (services/employer_cards.py).
+    По ней карточка правится на месте при смене статуса и появлении фото.
+    """
+
+    __tablename__ = "sent_messages"
+    __table_args__ = (
+        UniqueConstraint(
+            "chat_id",
+            "message_id",
+            name="uq_sent_messages_chat_message",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # без FK: у партиционированной applications ключ (id, created_at)
+    application_id: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        index=True,
+    )
+    employer_tg_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    message_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    # какое фото в сообщении (photo_url заявки); NULL — текстовое
+    # сообщение, фото в него уже не добавить
+    photo_url: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.now(),
+        nullable=False,
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        index=True,
+    )
+
+
+class ReadPrimaryMark(Base):
+    """
+    Метка read-your-writes для бота (app/db/replica.py): до until чтения
+    от имени этого HR идут на primary. Реплик бота несколько, поэтому
+    метка живёт здесь, а не в процессе бота. UNLOGGED: не реплицируется
+    и не пишет WAL — после сбоя пропадёт, что для метки не страшно.
+    """
+
+    __tablename__ = "read_primary_marks"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    tg_user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    until: Mapped[datetime] = mapped_column(DateTime, nullable=False)
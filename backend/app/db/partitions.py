@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import logging
+from datetime import date
+
+from app.core.settings import settings
+from app.db.session import engine
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+# произвольный ключ pg_advisory_xact_lock: партиции создаёт один воркер
+PARTITIONS_LOCK_KEY = 0x41505054
+
+
+def _add_months(d: date, months: int) -> date:
+    total = d.year * 12 + d.month - 1 + months
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"applications_y{month:%Y}m{month:%m}"
+
+
+def ensure_partitions(
+    months_ahead: int | None = None,
+    since: date | None = None,
+) -> list[str]:
+    """
+    Создаёт месячные партиции applications на текущий месяц и
+    months_ahead вперёд (если их ещё нет). Возвращает созданные.
+    since — начать с более раннего месяца (загрузка исторических данных).
+
+    Партиции создаются заранее: если строки месяца уже попали в
+    applications_default, CREATE ... PARTITION OF упадёт, и такой месяц
+    придётся разносить вручную.
+    """
+    if months_ahead is None:
+        months_ahead = settings.partitions_months_ahead
+
+    this_month = date.today().replace(day=1)
+    first = min(since.replace(day=1), this_month) if since else this_month
+    created: list[str] = []
+
+    with engine.begin() as conn:
+        conn.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"),
+            {"key": PARTITIONS_LOCK_KEY},
+        )
+        existing = set(
+            conn.execute(
+                text(
+                    "SELECT c.relname FROM pg_inherits i "
+                    "JOIN pg_class c ON c.oid = i.inhrelid "
+                    "WHERE i.inhparent = 'applications'::regclass"
+                )
+            ).scalars()
+        )
+
+        months = [first]
+        while months[-1] < _add_months(this_month, months_ahead):
+            months.append(_add_months(months[-1], 1))
+
+        for month in months:
+            name = partition_name(month)
+            if name in existing:
+                continue
+            try:
+                with conn.begin_nested():
+                    conn.execute(
+                        text(
+                            f"CREATE TABLE {name} PARTITION OF applications "
+                            f"FOR VALUES FROM ('{month.isoformat()}') "
+                            f"TO ('{_add_months(month, 1).isoformat()}')"
+                        )
+                    )
+            except DBAPIError:
+                logger.exception("cannot create partition %s", name)
+                continue
+            created.append(name)
+
+    if created:
+        logger.info("created partitions: %s", ", ".join(created))
+    return created
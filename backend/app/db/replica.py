@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from app.core.settings import settings
+from app.db.models import ReadPrimaryMark
+from app.db.session import ReplicaSessionLocal, SessionLocal, engine, replica_engine
+from fastapi import Request, Response
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Метка read-your-writes: после успешной записи клиент получает время
+# (unix ts), до которого его чтения идут на primary. Браузер (WebApp)
+# возвращает cookie сам, бот — заголовок. Живёт у клиента, поэтому
+# работает при любом числе воркеров и инстансов backend.
+STICKY_HEADER = "X-Read-Primary-Until"
+STICKY_COOKIE = "read_primary_until"
+
+# Бот присылает, от чьего имени вызов (tg_user_id HR). Реплик бота
+# несколько, апдейты одного HR попадают в разные, поэтому его метку
+# хранит backend — в read_primary_marks на primary
+ACTOR_HEADER = "X-Actor-Tg-Id"
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+# 0 — не реплика (например, вторая локальная БД для проверки)
+_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+_lag_lock = threading.Lock()
+_lag_checked_at = 0.0
+_replica_ok = False
+
+
+def replica_lag() -> float:
+    """Отставание реплики в секундах."""
+    with replica_engine.connect() as conn:
+        return float(conn.execute(_LAG_SQL).scalar() or 0)
+
+
+def replica_usable() -> bool:
+    """
+    Реплика настроена, доступна и отстаёт не больше
+    settings.replica_max_lag_seconds. Результат кэшируется на
+    settings.replica_lag_check_seconds.
+    """
+    global _lag_checked_at, _replica_ok
+    if replica_engine is None:
+        return False
+
+    now = time.monotonic()
+    if now - _lag_checked_at < settings.replica_lag_check_seconds:
+        return _replica_ok
+    with _lag_lock:
+        if now - _lag_checked_at < settings.replica_lag_check_seconds:
+            return _replica_ok
+        try:
+            lag = replica_lag()
+            ok = lag <= settings.replica_max_lag_seconds
+            if not ok:
+                logger.warning("replica lag %.1fs, reading from primary", lag)
+        except Exception:
+            logger.exception("replica check failed, reading from primary")
+            ok = False
+        _replica_ok = ok
+        _lag_checked_at = time.monotonic()
+        return ok
+
+
+def _sticky(request: Request) -> bool:
+    raw = request.headers.get(STICKY_HEADER) or request.cookies.get(STICKY_COOKIE)
+    if not raw:
+        return False
+    try:
+        return float(raw) > time.time()
+    except ValueError:
+        return False
+
+
+def request_actor(request: Request) -> int | None:
+    """tg_user_id из ACTOR_HEADER — только у запросов с internal token."""
+    if request.headers.get("X-Internal-Token") != settings.internal_api_token:
+        return None
+    try:
+        return int(request.headers[ACTOR_HEADER])
+    except (KeyError, ValueError):
+        return None
+
+
+def _actor_sticky(tg_user_id: int) -> bool:
+    with engine.connect() as conn:
+        return (
+            conn.scalar(
+                select(ReadPrimaryMark.tg_user_id).where(
+                    ReadPrimaryMark.tg_user_id == tg_user_id,
+                    ReadPrimaryMark.until > func.localtimestamp(),
+                )
+            )
+            is not None
+        )
+
+
+def read_session(request: Request) -> Session:
+    """Сессия для read-only эндпоинта: реплика, если можно."""
+    if _sticky(request) or not replica_usable():
+        return SessionLocal()
+    actor = request_actor(request)
+    if actor is not None and _actor_sticky(actor):
+        return SessionLocal()
+    return ReplicaSessionLocal()
+
+
+def mark_primary_reads(response: Response) -> None:
+    """Ставит клиенту метку read-your-writes после записи."""
+    until = time.time() + settings.replica_sticky_seconds
+    value = f"{until:.3f}"
+    response.headers[STICKY_HEADER] = value
+    response.set_cookie(
+        STICKY_COOKIE,
+        value,
+        max_age=int(settings.replica_sticky_seconds) + 1,
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def mark_actor_primary_reads(tg_user_id: int) -> None:
+    """Метка read-your-writes для HR из бота — общая для всех реплик."""
+    stmt = pg_insert(ReadPrimaryMark).values(
+        tg_user_id=tg_user_id,
+        until=func.localtimestamp()
+        + timedelta(seconds=settings.replica_sticky_seconds),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ReadPrimaryMark.tg_user_id],
+        set_={"until": stmt.excluded.until},
+    )
+    with engine.begin() as conn:
+        conn.execute(stmt)
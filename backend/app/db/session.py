@@ -4,3 +4,15 @@ from sqlalchemy.orm import sessionmaker
 
 engine = create_engine(settings.database_url, pool_pre_ping=True)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+# Реплика для чтения (необязательна). Маршрутизация — app/db/replica.py
+replica_engine = (
+    create_engine(settings.database_replica_url, pool_pre_ping=True)
+    if settings.database_replica_url
+    else None
+)
+ReplicaSessionLocal = (
+    sessionmaker(bind=replica_engine, autoflush=False, autocommit=False)
+    if replica_engine is not None
+    else None
+)
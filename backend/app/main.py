@@ -1,22 +1,125 @@
+import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+from app.core.settings import settings
+from app.core.tracing import setup_tracing, shutdown_tracing
+from app.db.partitions import ensure_partitions
+from app.db.replica import (
+    WRITE_METHODS,
+    mark_actor_primary_reads,
+    mark_primary_reads,
+    request_actor,
+)
+from app.db.session import engine, replica_engine
 from app.routers.admin import router as admin_router
 from app.routers.applications import router as applications_router
+from app.routers.config import router as config_router
+from app.routers.health import router as health_router
 from app.routers.internal_admin import router as internal_admin_router
 from app.routers.internal_employers import router as internal_employers_router
 from app.routers.internal_invites import router as internal_invites_router
+from app.routers.internal_profiling import router as internal_profiling_router
+from app.routers.media import router as media_router
+from app.routers.uploads import router as uploads_router
 from app.routers.vacancies import router as vacancies_router
-from fastapi import APIRouter, FastAPI
+from app.security.admin_session import employer_versions
+from app.services.archive import archive_closed_applications
+from app.services.digest import run_digests
+from app.services.employer_cards import prune_expired as prune_sent_messages
+from app.services.idempotency import prune_expired
+from app.services.notifications import notification_queue
+from app.services.profiling import ProfilingMiddleware, wrap_sync_endpoints
+from app.services.scheduler import PeriodicJob
+from app.services.uploads import purge_expired as purge_expired_uploads
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
 
 WEBAPP_DIR = Path(__file__).resolve().parent / "webapp"
 
+digest_job = PeriodicJob("digest", settings.digest_tick_seconds, run_digests)
+idempotency_prune_job = PeriodicJob("idempotency-prune", 3600, prune_expired)
+# миграция создаёт партиции на несколько месяцев вперёд, раз в сутки хватает
+partitions_job = PeriodicJob("partitions", 86400, ensure_partitions)
+archive_job = PeriodicJob(
+    "archive",
+    settings.archive_tick_seconds,
+    archive_closed_applications,
+)
+uploads_prune_job = PeriodicJob("uploads-prune", 3600, purge_expired_uploads)
+sent_messages_prune_job = PeriodicJob(
+    "sent-messages-prune",
+    3600,
+    prune_sent_messages,
+)
+# версии работодателей для проверки admin-токенов без БД
+employer_versions_job = PeriodicJob(
+    "employer-versions",
+    settings.admin_session_refresh_seconds,
+    employer_versions.refresh,
+)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # все роуты уже подключены: sync-эндпоинты — под профайлер
+    wrap_sync_endpoints(_app)
+    notification_queue.start()
+    digest_job.start()
+    idempotency_prune_job.start()
+    partitions_job.start()
+    archive_job.start()
+    employer_versions_job.start()
+    uploads_prune_job.start()
+    sent_messages_prune_job.start()
+    yield
+    # uvicorn уже не принимает новые соединения и дождался текущих запросов;
+    # останавливаем фоновые задачи
+    await asyncio.to_thread(sent_messages_prune_job.stop)
+    await asyncio.to_thread(uploads_prune_job.stop)
+    await asyncio.to_thread(employer_versions_job.stop)
+    await asyncio.to_thread(archive_job.stop)
+    await asyncio.to_thread(partitions_job.stop)
+    await asyncio.to_thread(idempotency_prune_job.stop)
+    await asyncio.to_thread(digest_job.stop)
+    # отправляем отложенные уведомления, не дожидаясь окна схлопывания
+    await asyncio.to_thread(
+        notification_queue.stop,
+        settings.shutdown_drain_seconds,
+    )
+    await asyncio.to_thread(shutdown_tracing)
+
+
 app = FastAPI(
     title="HR Bot API",
     docs_url="/docs",
     redoc_url=None,
+    lifespan=lifespan,
 )
+# до первого запроса: инструментирование добавляет middleware
+setup_tracing(app, [engine, replica_engine])
+# профилирование по запросу (/api/v1/internal/api/internal/profiling);
+# выключено — почти no-op
+app.add_middleware(ProfilingMiddleware)
+
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    # после записи клиент какое-то время читает с primary, а не с реплики
+    response = await call_next(request)
+    if (
+        replica_engine is not None
+        and request.method in WRITE_METHODS
+        and response.status_code < 400
+    ):
+        mark_primary_reads(response)
+        actor = request_actor(request)
+        if actor is not None:
+            # до ответа: следующий апдейт HR может прийти в другую реплику бота
+            await run_in_threadpool(mark_actor_primary_reads, actor)
+    return response
+
 
 # Роуты
 internal_router = APIRouter(prefix="/api/v1/internal")
@@ -24,24 +127,59 @@ internal_router = APIRouter(prefix="/api/v1/internal")
 internal_router.include_router(internal_admin_router)
 internal_router.include_router(internal_employers_router)
 internal_router.include_router(internal_invites_router)
+internal_router.include_router(internal_profiling_router)
 
+# probes
+app.include_router(health_router)
 # public
 app.include_router(applications_router)
+app.include_router(uploads_router)
+app.include_router(config_router)
 app.include_router(vacancies_router)
 # admin
 app.include_router(admin_router)
 # internal
 app.include_router(internal_router)
 
-# Статика для фото
-app.mount("/media", StaticFiles(directory="media"), name="media")
+# Фото: доступ проверяет backend, байты отдаёт nginx
+app.include_router(media_router)
+
+
+# В проде /webapp и /webapp/assets отдаёт nginx из сборки
+# (python -m app.scripts.build_webapp). Здесь — так же, для разработки
+# и замеров без nginx; без сборки — исходники с Tailwind CDN
+WEBAPP_DIST = WEBAPP_DIR / "dist"
+_ASSET_TYPES = {".js": "application/javascript", ".css": "text/css"}
+
+
+@app.get("/webapp/assets/{name}", include_in_schema=False)
+def webapp_asset(name: str, request: Request):
+    path = WEBAPP_DIST / "assets" / name
+    media_type = _ASSET_TYPES.get(path.suffix)
+    if media_type is None or "/" in name or not path.is_file():
+        raise HTTPException(status_code=404, detail="not found")
+
+    headers = {
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Vary": "Accept-Encoding",
+    }
+    accept = request.headers.get("accept-encoding", "")
+    for encoding, ext in (("br", ".br"), ("gzip", ".gz")):
+        if encoding in accept and path.with_name(name + ext).is_file():
+            path = path.with_name(name + ext)
+            headers["Content-Encoding"] = encoding
+            break
+    return FileResponse(path, media_type=media_type, headers=headers)
 
 
 @app.get("/webapp", include_in_schema=False)
 def webapp():
-    return FileResponse(WEBAPP_DIR / "index.html")
+    shell = WEBAPP_DIST / "index.html"
+    if not shell.is_file():
+        shell = WEBAPP_DIR / "index.html"
+    return FileResponse(shell, headers={"Cache-Control": "no-cache"})
 
 
-@app.get("/health", include_in_schema=False)
-def health():
-    return {"status": "ok"}
+@app.get("/webapp/app.js", include_in_schema=False)
+def webapp_js():
+    return FileResponse(WEBAPP_DIR / "app.js", headers={"Cache-Control": "no-cache"})
@@ -1,13 +1,50 @@
 from __future__ import annotations
 
+import io
 import json
+import time
+from datetime import datetime
 
 from app.core.settings import settings
-from app.db.models import Application, ApplicationStatus, Candidate, Employer
+from app.core.responses import rows_response
+from app.db.models import (
+    Application,
+    ApplicationArchive,
+    ApplicationStatus,
+    Employer,
+    EmployerRole,
+)
+from app.db.replica import read_session
 from app.db.session import SessionLocal
-from app.schemas.admin import AdminApplicationOut, AdminStatusUpdateIn
+from app.schemas.admin import (
+    AdminApplicationListOut,
+    AdminApplicationOut,
+    AdminApplicationSummaryOut,
+    AdminSessionOut,
+    AdminStatusUpdateIn,
+)
+from app.schemas.applications import ApplicationImportReport
+from app.security.admin_session import (
+    AdminSession,
+    employer_versions,
+    issue_session_token,
+    verify_session_token,
+)
 from app.security.telegram_webapp import verify_telegram_init_data
-from fastapi import APIRouter, Depends, Header, HTTPException
+from app.services.application_import import import_applications, notify_imported
+from app.services.application_lists import ListFields, list_columns
+from app.services.archive import application_source
+from app.services.employer_cards import schedule_refresh
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Request,
+    UploadFile,
+)
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
@@ -21,11 +58,16 @@ def get_db() -> Session:
         db.close()
 
 
-def get_tg_user_id(x_tg_init_data: str = Header(default="")) -> int:
-    """
-    Достаём tg_user_id из Telegram WebApp initData.
-    Работает для WebApp. Для бота сделаем internal token позже.
-    """
+def get_read_db(request: Request) -> Session:
+    # чтение: реплика, если настроена и не отстаёт (app/db/replica.py)
+    db = read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _init_data_user(x_tg_init_data: str) -> tuple[int, dict]:
     try:
         payload = verify_telegram_init_data(x_tg_init_data, settings.bot_token)
     except ValueError as exc:
@@ -46,16 +88,19 @@ def get_tg_user_id(x_tg_init_data: str = Header(default="")) -> int:
             detail="telegram user id not found",
         )
 
-    return int(tg_user_id)
+    return int(tg_user_id), payload
 
 
-def require_employer(
-    tg_user_id: int = Depends(get_tg_user_id),
-    db: Session = Depends(get_db),
-) -> Employer:
+def get_tg_user_id(x_tg_init_data: str = Header(default="")) -> int:
     """
-    Доступ только тем, кто есть в таблице employers и активен.
+    Достаём tg_user_id из Telegram WebApp initData.
+    Работает для WebApp. Для бота сделаем internal token позже.
     """
+    tg_user_id, _ = _init_data_user(x_tg_init_data)
+    return tg_user_id
+
+
+def _active_employer(db: Session, tg_user_id: int) -> Employer:
     employer = (
         db.query(Employer)
         .filter(
@@ -69,30 +114,138 @@ def require_employer(
     return employer
 
 
-@router.get("/applications", response_model=list[AdminApplicationOut])
+def _bearer_token(authorization: str) -> str | None:
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    return token.strip()
+
+
+def require_employer(
+    authorization: str = Header(default=""),
+    x_tg_init_data: str = Header(default=""),
+    db: Session = Depends(get_read_db),
+) -> AdminSession:
+    """
+    Доступ только активным работодателям.
+
+    Authorization: Bearer <token> (POST /api/admin/session) проверяется
+    без БД. Без токена — как раньше: initData на каждый запрос и
+    запрос в employers.
+    """
+    token = _bearer_token(authorization)
+    if token is not None:
+        try:
+            return verify_session_token(token)
+        except ValueError as exc:
+            raise HTTPException(status_code=401, detail=str(exc))
+
+    employer = _active_employer(db, get_tg_user_id(x_tg_init_data))
+    return AdminSession(
+        tg_user_id=employer.tg_user_id,
+        role=employer.role,
+        version=employer.auth_version,
+        expires_at=0,
+    )
+
+
+def require_owner(
+    session: AdminSession = Depends(require_employer),
+) -> AdminSession:
+    if session.role != EmployerRole.OWNER:
+        raise HTTPException(status_code=403, detail="owner only")
+    return session
+
+
+@router.post("/session", response_model=AdminSessionOut)
+def create_session(
+    x_tg_init_data: str = Header(default=""),
+    db: Session = Depends(get_db),
+):
+    """
+    Вход в админку: initData проверяется один раз, дальше WebApp
+    ходит с токеном (Authorization: Bearer). Токен живёт
+    admin_session_ttl_seconds, потом — снова сюда.
+    """
+    tg_user_id, payload = _init_data_user(x_tg_init_data)
+    try:
+        auth_date = int(payload.get("auth_date", 0))
+    except ValueError:
+        auth_date = 0
+    if time.time() - auth_date > settings.admin_login_max_age_seconds:
+        raise HTTPException(status_code=401, detail="init_data is too old")
+
+    employer = _active_employer(db, tg_user_id)
+    token, session = issue_session_token(
+        employer.tg_user_id,
+        employer.role,
+        employer.auth_version,
+    )
+    return AdminSessionOut(
+        token=token,
+        expires_at=session.expires_at,
+        role=session.role,
+    )
+
+
+@router.delete("/session")
+def revoke_sessions(
+    session: AdminSession = Depends(require_employer),
+    db: Session = Depends(get_db),
+):
+    """
+    Выход: отзывает все токены этого работодателя (на всех устройствах).
+    Другие воркеры узнают об этом при следующем обновлении версий.
+    """
+    db.execute(
+        update(Employer)
+        .where(Employer.tg_user_id == session.tg_user_id)
+        .values(auth_version=Employer.auth_version + 1)
+    )
+    db.commit()
+    employer_versions.refresh()
+    return {"ok": True}
+
+
+@router.get(
+    "/applications",
+    response_model=list[AdminApplicationListOut] | list[AdminApplicationSummaryOut],
+)
 def list_applications(
     status: ApplicationStatus | None = None,
     vacancy_id: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    fields: ListFields = "full",
     limit: int = 50,
     offset: int = 0,
-    _employer: Employer = Depends(require_employer),
-    db: Session = Depends(get_db),
+    _employer: AdminSession = Depends(require_employer),
+    db: Session = Depends(get_read_db),
 ):
     """
     Список заявок.
-    Фильтры: status, vacancy_id
+    Фильтры: status, vacancy_id, created_from/created_to
+    (закрытый статус или период до границы archive_after_days —
+    ищем и в архиве)
+    fields=summary — только id, full_name, status, created_at, has_photo
     Пагинация: limit/offset
     """
-    q = db.query(Application).join(Candidate)
+    src = application_source(created_from, created_to, status)
+    columns, names = list_columns(src, fields)
+    q = select(*columns)
 
     if status is not None:
-        q = q.filter(Application.status == status)
+        q = q.where(src.c.status == status)
     if vacancy_id is not None:
-        q = q.filter(Application.vacancy_id == vacancy_id)
+        q = q.where(src.c.vacancy_id == vacancy_id)
+    if created_from is not None:
+        q = q.where(src.c.created_at >= created_from)
+    if created_to is not None:
+        q = q.where(src.c.created_at < created_to)
 
-    q = q.order_by(Application.created_at.desc()).limit(limit).offset(offset)
+    q = q.order_by(src.c.created_at.desc()).limit(limit).offset(offset)
 
-    return q.all()
+    return rows_response(db.execute(q), names)
 
 
 @router.get(
@@ -101,18 +254,14 @@ def list_applications(
 )
 def get_application(
     application_id: int,
-    _employer: Employer = Depends(require_employer),
-    db: Session = Depends(get_db),
+    _employer: AdminSession = Depends(require_employer),
+    db: Session = Depends(get_read_db),
 ):
     """
-    Карточка заявки.
+    Карточка заявки (в том числе архивной).
     """
-    app = (
-        db.query(Application)
-        .filter(
-            Application.id == application_id,
-        )
-        .one_or_none()
+    app = db.get(Application, application_id) or db.get(
+        ApplicationArchive, application_id
     )
     if app is None:
         raise HTTPException(status_code=404, detail="not found")
@@ -123,7 +272,7 @@ def get_application(
 def update_application_status(
     application_id: int,
     payload: AdminStatusUpdateIn,
-    _employer: Employer = Depends(require_employer),
+    _employer: AdminSession = Depends(require_employer),
     db: Session = Depends(get_db),
 ):
     """
@@ -141,4 +290,30 @@ def update_application_status(
 
     app.status = payload.status
     db.commit()
+    # карточка у остальных HR тоже покажет новый статус
+    schedule_refresh(app.id)
     return {"ok": True, "id": app.id, "status": app.status}
+
+
+@router.post("/applications/import", response_model=ApplicationImportReport)
+def import_applications_csv(
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    notify: bool = True,
+    _owner: AdminSession = Depends(require_owner),
+):
+    """
+    Импорт заявок из CSV (бумажные анкеты, job-борды). Только owner.
+    Колонки — поля анкеты (full_name, phone обязательны), плюс
+    необязательные tg_user_id и created_at. Ответ — отчёт с ошибками
+    по номерам строк. Работодателям — одно сводное уведомление.
+    """
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = import_applications(lines, dry_run=dry_run)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    if notify and not dry_run:
+        notify_imported(report.imported)
+    return report
@@ -1,28 +1,60 @@
 from __future__ import annotations
 
+import asyncio
+import io
 import json
-import uuid
 from pathlib import Path
+from typing import Annotated
 
-import httpx
 from app.core.settings import settings
-from app.db.models import Application, Candidate, Employer, Vacancy
+from app.db.models import Application, Candidate, PhotoUpload
 from app.db.session import SessionLocal
-from app.schemas.applications import ApplicationCreate, ApplicationCreated
+from app.schemas.applications import (
+    ApplicationCreate,
+    ApplicationCreated,
+    ApplicationSubmitForm,
+    ApplicationSubmitted,
+    PhotoUploadComplete,
+)
+from app.security.rate_limit import rate_limit
 from app.security.telegram_webapp import verify_telegram_init_data
+from app.services.application_import import default_vacancy
+from app.services.employer_cards import notify_new_application, schedule_refresh
+from app.services.idempotency import get_replay, remember
+from app.services.notifications import notification_queue
+from app.services.telegram import send_plain_message
+from app.services.uploads import (
+    MAX_PHOTO_BYTES,
+    PHOTO_TYPES,
+    declared_size_error,
+    move_to_photos,
+    photo_head_error,
+    photo_path,
+    upload_head_error,
+)
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     Depends,
     File,
+    Form,
     Header,
     HTTPException,
     UploadFile,
 )
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/api/applications", tags=["applications"])
 
+CREATE_SCOPE = "applications:create"
+SUBMIT_SCOPE = "applications:submit"
+
+RECEIVED_TEXT = (
+    "✅ Ariza qabul qilindi!\n\n"
+    "Arizangiz tez orada ko‘rib chiqiladi va sizga bot orqali xabar beriladi."
+)
+
 
 def get_db() -> Session:
     """
@@ -74,255 +106,432 @@ def get_tg_user_id(x_tg_init_data: str = Header(default="")) -> int:
     return int(tg_user_id)
 
 
-@router.post("", response_model=ApplicationCreated)
+def get_idempotency_key(
+    idempotency_key: str | None = Header(default=None, max_length=128),
+) -> str | None:
+    """
+    Заголовок Idempotency-Key: WebApp генерирует его один раз на отправку
+    и повторяет при ретраях.
+    """
+    return idempotency_key or None
+
+
+@router.post(
+    "",
+    response_model=ApplicationCreated,
+    dependencies=[Depends(rate_limit("applications:create", get_tg_user_id))],
+)
 def create_application(
     data: ApplicationCreate,
-    background_tasks: BackgroundTasks,
     tg_user_id: int = Depends(get_tg_user_id),
+    idempotency_key: str | None = Depends(get_idempotency_key),
     db: Session = Depends(get_db),
 ) -> ApplicationCreated:
 
-    # --- get or create candidate ---
-    candidate = (
-        db.query(Candidate)
-        .filter(
-            Candidate.tg_user_id == tg_user_id,
+    # повтор того же запроса — отдаём прежний ответ, ничего не создаём
+    if idempotency_key:
+        replay = get_replay(db, tg_user_id, CREATE_SCOPE, idempotency_key)
+        if replay is not None:
+            return ApplicationCreated(**replay)
+
+    try:
+        app = _insert_application(db, data, tg_user_id)
+        if idempotency_key:
+            remember(db, tg_user_id, CREATE_SCOPE, idempotency_key, {"id": app.id})
+        db.commit()
+    except IntegrityError:
+        # параллельный дубль с тем же ключом успел закоммитить первым
+        db.rollback()
+        replay = (
+            get_replay(db, tg_user_id, CREATE_SCOPE, idempotency_key)
+            if idempotency_key
+            else None
         )
-        .one_or_none()
-    )
+        if replay is None:
+            raise
+        return ApplicationCreated(**replay)
 
-    if candidate is None:
-        candidate = Candidate(tg_user_id=tg_user_id)
-        db.add(candidate)
-        db.flush()
+    db.refresh(app)
 
-    # --- get or create default vacancy ---
-    vacancy = (
-        db.query(Vacancy)
-        .filter(
-            Vacancy.title == "Umumiy ariza",
-        )
-        .one_or_none()
+    # отправка — через очередь уведомлений: при остановке она дренируется
+    notification_queue.submit(
+        send_plain_message,
+        settings.bot_token,
+        tg_user_id,
+        RECEIVED_TEXT,
     )
 
-    if vacancy is None:
-        vacancy = Vacancy(
-            title="Umumiy ariza",
-            description="Default application",
+    # уведомляем активных работодателей с мгновенными уведомлениями,
+    # остальные увидят заявку в сводке (services/digest.py)
+    notify_new_application(db, app)
+
+    return ApplicationCreated(id=app.id)
+
+
+@router.post(
+    "/submit",
+    response_model=ApplicationSubmitted,
+    dependencies=[Depends(rate_limit("applications:create", get_tg_user_id))],
+)
+async def submit_application(
+    data: Annotated[ApplicationSubmitForm, Form()],
+    tg_user_id: int = Depends(get_tg_user_id),
+    idempotency_key: str | None = Depends(get_idempotency_key),
+    db: Session = Depends(get_db),
+) -> ApplicationSubmitted:
+    """
+    Анкета и фото одним запросом (multipart/form-data): одна проверка
+    initData, один commit и одно сообщение работодателю — фото с
+    анкетой в подписи (без фото — текст).
+
+    Фото необязательно: файл photo или upload_id (routers/uploads.py).
+    Эндпоинт async только ради чтения файла: БД и запись на диск —
+    в потоке (_submit), как _append в routers/uploads.py.
+    """
+    photo = data.photo
+    if photo is not None and data.upload_id:
+        raise HTTPException(status_code=400, detail="photo or upload_id, not both")
+
+    content = None
+    if photo is not None:
+        if photo.content_type not in PHOTO_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail="Only jpg, png, webp allowed",
+            )
+        error = declared_size_error(data.photo_width, data.photo_height)
+        if error:
+            raise HTTPException(status_code=400, detail=error)
+        content = await photo.read()
+        if len(content) > MAX_PHOTO_BYTES:
+            raise HTTPException(status_code=400, detail="Max file size is 5MB")
+        error = photo_head_error(
+            io.BytesIO(content),
+            photo.content_type,
+            data.photo_width,
+            data.photo_height,
         )
-        db.add(vacancy)
-        db.flush()
+        if error:
+            raise HTTPException(status_code=400, detail=error)
 
-    app = Application(
-        candidate_id=candidate.id,
-        vacancy_id=vacancy.id,
-        full_name=data.full_name,
-        phone=data.phone,
-        birth_date=data.birth_date,
-        nationality=data.nationality,
-        address=data.address,
-        gender=data.gender,
-        prev_job=data.prev_job,
-        prev_job_duration=data.prev_job_duration,
-        prev_job_leave_reason=data.prev_job_leave_reason,
-        is_married=data.is_married,
-        source=data.source,
-        desired_salary=data.desired_salary,
-        why_hire_facts=data.why_hire_facts,
+    return await asyncio.to_thread(
+        _submit, db, data, content, tg_user_id, idempotency_key
     )
 
-    db.add(app)
-    db.commit()
+
+def _submit(
+    db: Session,
+    data: ApplicationSubmitForm,
+    content: bytes | None,
+    tg_user_id: int,
+    idempotency_key: str | None,
+) -> ApplicationSubmitted:
+    """
+    Синхронная часть submit_application: заявка, фото и commit.
+    content — уже прочитанный и проверенный файл photo.
+    """
+    if idempotency_key:
+        replay = get_replay(db, tg_user_id, SUBMIT_SCOPE, idempotency_key)
+        if replay is not None:
+            return ApplicationSubmitted(**replay)
+
+    upload = None
+    if data.upload_id:
+        upload = _completed_upload(db, data.upload_id, tg_user_id)
+
+    app = _insert_application(db, data, tg_user_id)
+
+    filepath = None
+    upload_id = None
+    if content is not None:
+        filepath = photo_path(app.id, data.photo.content_type)
+        filepath.write_bytes(content)
+    elif upload is not None:
+        # файл переносится после commit (move_to_photos)
+        filepath = photo_path(app.id, upload.content_type)
+        upload_id = upload.id
+        db.delete(upload)
+    if filepath is not None:
+        app.photo_url = f"/media/photos/{filepath.name}"
+
+    result = ApplicationSubmitted(id=app.id, photo_url=app.photo_url)
+    try:
+        if idempotency_key:
+            remember(
+                db,
+                tg_user_id,
+                SUBMIT_SCOPE,
+                idempotency_key,
+                result.model_dump(),
+            )
+        db.commit()
+    except IntegrityError:
+        # параллельный дубль с тем же ключом успел первым
+        db.rollback()
+        if content is not None:
+            filepath.unlink(missing_ok=True)
+        replay = (
+            get_replay(db, tg_user_id, SUBMIT_SCOPE, idempotency_key)
+            if idempotency_key
+            else None
+        )
+        if replay is None:
+            raise
+        return ApplicationSubmitted(**replay)
+
+    if upload_id is not None:
+        move_to_photos(upload_id, filepath)
     db.refresh(app)
 
-    background_tasks.add_task(
-        _send_telegram_plain_message,
+    notification_queue.submit(
+        send_plain_message,
         settings.bot_token,
         tg_user_id,
-        "✅ Ariza qabul qilindi!\n\n",
-        "Arizangiz tez orada ko‘rib chiqiladi va sizga bot orqali xabar beriladi.",
+        RECEIVED_TEXT,
     )
 
-    # уведомляем всех активных работодателей
-    employers = db.query(Employer).filter(Employer.is_active == True).all()
-
-    text = _format_new_application_text(app)
-    for emp in employers:
-        background_tasks.add_task(
-            _send_telegram_message,
-            settings.bot_token,
-            emp.tg_user_id,
-            text,
-            app.id,
-        )
+    # одно сообщение на работодателя: фото с анкетой в подписи
+    notify_new_application(db, app)
 
-    return ApplicationCreated(id=app.id)
+    return result
 
 
-@router.post("/{application_id}/photo")
-async def upload_photo(
+@router.post(
+    "/{application_id}/photo",
+    dependencies=[Depends(rate_limit("applications:photo", get_tg_user_id))],
+)
+def upload_photo(
     application_id: int,
     photo: UploadFile = File(...),
+    width: int | None = Form(default=None, gt=0),
+    height: int | None = Form(default=None, gt=0),
     tg_user_id: int = Depends(get_tg_user_id),
+    idempotency_key: str | None = Depends(get_idempotency_key),
     db: Session = Depends(get_db),
 ):
     """
     Загрузка фото для конкретной заявки.
     Проверяем, что заявка принадлежит текущему tg_user_id.
     Сохраняем файл локально в media/photos.
+    Для плохой связи — докачиваемая загрузка (routers/uploads.py).
+    width/height — размер после уменьшения в WebApp, сверяется
+    с заголовком файла.
+    Синхронный: БД и запись файла — в threadpool, не в event loop.
 
     Returns:
         dict: photo_url
     """
-    app = (
-        db.query(Application)
-        .join(Candidate, Candidate.id == Application.candidate_id)
-        .filter(
-            Application.id == application_id,
-            Candidate.tg_user_id == tg_user_id,
-        )
-        .one_or_none()
-    )
-    if app is None:
-        raise HTTPException(status_code=404, detail="application not found")
+    app = _own_application(db, application_id, tg_user_id)
+
+    scope = f"applications:photo:{application_id}"
+    if idempotency_key:
+        replay = get_replay(db, tg_user_id, scope, idempotency_key)
+        if replay is not None:
+            return replay
 
-    allowed = {
-        "image/jpeg": ".jpg",
-        "image/png": ".png",
-        "image/webp": ".webp",
-    }
-    if photo.content_type not in allowed:
+    if photo.content_type not in PHOTO_TYPES:
         raise HTTPException(
             status_code=400,
             detail="Only jpg, png, webp allowed",
         )
 
-    content = await photo.read()
-    if len(content) > 5 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="Max file size is 5MB")
+    error = declared_size_error(width, height)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
 
-    media_root = Path(settings.media_root)
-    photos_dir = media_root / "photos"
-    photos_dir.mkdir(parents=True, exist_ok=True)
+    # не больше лимита + 1 байт: лишнего в память не читаем
+    content = photo.file.read(MAX_PHOTO_BYTES + 1)
+    if len(content) > MAX_PHOTO_BYTES:
+        raise HTTPException(status_code=400, detail="Max file size is 5MB")
+    error = photo_head_error(io.BytesIO(content), photo.content_type, width, height)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
 
-    ext = allowed[photo.content_type]
-    filename = f"{application_id}_{uuid.uuid4().hex}{ext}"
-    filepath = photos_dir / filename
+    filepath = photo_path(application_id, photo.content_type)
     filepath.write_bytes(content)
 
-    app.photo_url = f"/media/photos/{filename}"
-    db.commit()
-
-    # уведомляем всех активных работодателей, что фото загружено
-    employers = db.query(Employer).filter(Employer.is_active == True).all()
-
-    caption = f"📸 Rasm yuklandi — Ariza #{app.id}\n" + _format_new_application_text(
-        app
-    )
+    return _attach_photo(db, app, filepath, tg_user_id, scope, idempotency_key)
 
-    public_photo = f"{settings.backend_url}{app.photo_url}"
-    for emp in employers:
-        background_tasks.add_task(
-            _send_telegram_photo,
-            settings.bot_token,
-            emp.tg_user_id,
-            public_photo,
-            caption,
-            app.id,
-        )
 
-    return {"photo_url": app.photo_url}
+@router.post(
+    "/{application_id}/photo/complete",
+    dependencies=[Depends(rate_limit("applications:photo", get_tg_user_id))],
+)
+def complete_photo_upload(
+    application_id: int,
+    data: PhotoUploadComplete,
+    tg_user_id: int = Depends(get_tg_user_id),
+    idempotency_key: str | None = Depends(get_idempotency_key),
+    db: Session = Depends(get_db),
+):
+    """
+    Завершение докачиваемой загрузки: файл из media/uploads становится
+    фото заявки — дальше всё как у upload_photo.
 
+    Returns:
+        dict: photo_url
+    """
+    app = _own_application(db, application_id, tg_user_id)
+
+    scope = f"applications:photo:{application_id}"
+    if idempotency_key:
+        replay = get_replay(db, tg_user_id, scope, idempotency_key)
+        if replay is not None:
+            return replay
+
+    upload = _completed_upload(db, data.upload_id, tg_user_id)
+    filepath = photo_path(application_id, upload.content_type)
+    db.delete(upload)
+    return _attach_photo(
+        db,
+        app,
+        filepath,
+        tg_user_id,
+        scope,
+        idempotency_key,
+        upload_id=upload.id,
+    )
 
-def _format_new_application_text(app: Application) -> str:
-    parts = [
-        f"🆕 Yangi ariza #{app.id}",
-        f"👤 F.I.SH: {app.full_name}",
-        f"📞 Telefon: {app.phone}",
-    ]
 
-    if app.birth_date:
-        parts.append(
-            f"🎂 Tug‘ilgan sana: {app.birth_date.strftime('%d.%m.%Y')}",
+def _completed_upload(
+    db: Session,
+    upload_id: str,
+    tg_user_id: int,
+) -> PhotoUpload:
+    """
+    Докачанная загрузка текущего пользователя (строка заблокирована
+    до commit), файл проверен по заголовку.
+    """
+    upload = (
+        db.query(PhotoUpload)
+        .filter(
+            PhotoUpload.id == upload_id,
+            PhotoUpload.tg_user_id == tg_user_id,
+            PhotoUpload.expires_at > func.localtimestamp(),
         )
-    if app.nationality:
-        parts.append(f"🌍 Millat: {app.nationality}")
-    if app.address:
-        parts.append(f"📍 Manzil: {app.address}")
-    if app.gender:
-        parts.append(
-            f"🚻 Jins: {app.gender.value if hasattr(app.gender, 'value') else app.gender}"
+        .with_for_update()
+        .one_or_none()
+    )
+    if upload is None:
+        raise HTTPException(status_code=404, detail="upload not found")
+    if upload.offset < upload.size:
+        raise HTTPException(
+            status_code=409,
+            detail="upload is incomplete",
+            headers={"Upload-Offset": str(upload.offset)},
         )
+    error = upload_head_error(upload)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    return upload
 
-    if app.prev_job:
-        parts.append(f"🏢 Oldin ishlagan joy: {app.prev_job}")
-    if app.prev_job_duration:
-        parts.append(f"⏳ Ish muddati: {app.prev_job_duration}")
-    if app.prev_job_leave_reason:
-        parts.append(f"📌 Nega bo‘shagan: {app.prev_job_leave_reason}")
-
-    parts.append(f"💍 Oilali: {'Ha' if app.is_married else 'Yo‘q'}")
 
-    if app.source:
-        parts.append(f"🔎 Qayerdan bildi: {app.source}")
-    if app.desired_salary:
-        parts.append(f"💰 Istagan maosh: {app.desired_salary}")
-    if app.why_hire_facts:
-        parts.append(f"⭐ Nega ishga olish kerak: {app.why_hire_facts}")
+def _own_application(
+    db: Session,
+    application_id: int,
+    tg_user_id: int,
+) -> Application:
+    app = (
+        db.query(Application)
+        .join(Candidate, Candidate.id == Application.candidate_id)
+        .filter(
+            Application.id == application_id,
+            Candidate.tg_user_id == tg_user_id,
+        )
+        .one_or_none()
+    )
+    if app is None:
+        raise HTTPException(status_code=404, detail="application not found")
+    return app
+
+
+def _attach_photo(
+    db: Session,
+    app: Application,
+    filepath: Path,
+    tg_user_id: int,
+    scope: str,
+    idempotency_key: str | None,
+    upload_id: str | None = None,
+) -> dict:
+    """
+    Записывает photo_url (commit) и ставит фото в карточки работодателей.
+    Файл уже лежит в filepath; upload_id — файл докачанной загрузки,
+    переносится в filepath после commit.
+    """
+    app.photo_url = f"/media/photos/{filepath.name}"
+    try:
+        if idempotency_key:
+            remember(
+                db,
+                tg_user_id,
+                scope,
+                idempotency_key,
+                {"photo_url": app.photo_url},
+            )
+        db.commit()
+    except IntegrityError:
+        # дубль с тем же ключом уже сохранил своё фото — наш файл не нужен
+        db.rollback()
+        if upload_id is None:
+            filepath.unlink(missing_ok=True)
+        replay = get_replay(db, tg_user_id, scope, idempotency_key)
+        if replay is None:
+            raise
+        return replay
+
+    if upload_id is not None:
+        move_to_photos(upload_id, filepath)
+
+    # фото — в уже отправленные работодателям карточки
+    schedule_refresh(app.id)
 
-    parts.append("\nBot orqali ko‘rish: HR menyu → Arizalar")
-    return "\n".join(parts)
+    return {"photo_url": app.photo_url}
 
 
-def _hr_open_kb(application_id: int) -> dict:
+def _insert_application(
+    db: Session,
+    data: ApplicationCreate,
+    tg_user_id: int,
+) -> Application:
     """
-    Inline keyboard, чтобы бот поймал callback: hr:open:<id>
+    Создаёт заявку (и при необходимости кандидата/вакансию) без commit.
     """
-    return {
-        "inline_keyboard": [
-            [
-                {
-                    "text": "👀 Ko‘rish",
-                    "callback_data": f"hr:open:{application_id}",
-                }
-            ]
-        ]
-    }
-
-
-def _send_telegram_message(
-    bot_token: str,
-    chat_id: int,
-    text: str,
-    application_id: int,
-) -> None:
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-    payload = {
-        "chat_id": chat_id,
-        "text": text,
-        "disable_web_page_preview": True,
-        "reply_markup": _hr_open_kb(application_id),
-    }
-    # sync-запрос (мы вызовем через BackgroundTasks, чтобы не тормозить ответ)
-    with httpx.Client(timeout=10) as client:
-        r = client.post(url, json=payload)
-        r.raise_for_status()
-
-
-def _send_telegram_photo(
-    bot_token: str,
-    chat_id: int,
-    photo_url: str,
-    caption: str,
-    application_id: int,
-) -> None:
-    url = f"https://api.telegram.org/bot{bot_token}/sendPhoto"
-    payload = {
-        "chat_id": chat_id,
-        "photo": photo_url,
-        "caption": caption[:1024],  # лимит Telegram
-        "reply_markup": _hr_open_kb(application_id),
-    }
-    with httpx.Client(timeout=10) as client:
-        r = client.post(url, json=payload)
-        r.raise_for_status()
+    # --- get or create candidate ---
+    candidate = (
+        db.query(Candidate)
+        .filter(
+            Candidate.tg_user_id == tg_user_id,
+        )
+        .one_or_none()
+    )
+
+    if candidate is None:
+        candidate = Candidate(tg_user_id=tg_user_id)
+        db.add(candidate)
+        db.flush()
+
+    # --- get or create default vacancy ---
+    vacancy = default_vacancy(db)
+
+    app = Application(
+        candidate_id=candidate.id,
+        vacancy_id=vacancy.id,
+        full_name=data.full_name,
+        phone=data.phone,
+        birth_date=data.birth_date,
+        nationality=data.nationality,
+        address=data.address,
+        gender=data.gender,
+        prev_job=data.prev_job,
+        prev_job_duration=data.prev_job_duration,
+        prev_job_leave_reason=data.prev_job_leave_reason,
+        is_married=data.is_married,
+        source=data.source,
+        desired_salary=data.desired_salary,
+        why_hire_facts=data.why_hire_facts,
+    )
+
+    db.add(app)
+    db.flush()
+    return app
@@ -0,0 +1,21 @@
+from app.core.settings import settings
+from app.schemas.applications import WebAppConfig
+from app.services.uploads import MAX_PHOTO_BYTES
+from fastapi import APIRouter, Response
+
+router = APIRouter(prefix="/api/config", tags=["config"])
+
+
+@router.get("/webapp", response_model=WebAppConfig)
+def webapp_config(response: Response):
+    """
+    Параметры для WebApp: до какого размера уменьшать фото перед
+    загрузкой, качество JPEG, лимиты загрузки. Без авторизации.
+    """
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return WebAppConfig(
+        photo_max_dimension=settings.photo_max_dimension,
+        photo_jpeg_quality=settings.photo_jpeg_quality,
+        photo_max_bytes=MAX_PHOTO_BYTES,
+        upload_chunk_size=settings.upload_chunk_max_bytes,
+    )
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from app.core.settings import settings
+from app.db.session import engine
+from app.services.notifications import notification_queue
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+router = APIRouter(include_in_schema=False)
+
+_cache_lock = threading.Lock()
+_cache: tuple[float, bool, dict] | None = None
+
+
+def _check_db() -> str | None:
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as exc:
+        return f"db: {exc.__class__.__name__}"
+    return None
+
+
+def _check_media() -> str | None:
+    photos_dir = Path(settings.media_root) / "photos"
+    try:
+        photos_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=photos_dir, prefix=".readyz-"):
+            pass
+    except OSError as exc:
+        return f"media: {exc.__class__.__name__}"
+    return None
+
+
+def _check_notifications() -> str | None:
+    if not notification_queue.running():
+        return "notifications: worker is not running"
+    backlog = notification_queue.backlog()
+    if backlog > settings.readyz_max_backlog:
+        return f"notifications: backlog {backlog}"
+    return None
+
+
+def _run_checks() -> tuple[bool, dict]:
+    checks = {
+        "db": _check_db(),
+        "media": _check_media(),
+        "notifications": _check_notifications(),
+    }
+    ok = all(err is None for err in checks.values())
+    return ok, {name: err or "ok" for name, err in checks.items()}
+
+
+@router.get("/livez")
+@router.get("/health")
+def livez():
+    """
+    Процесс жив и отвечает. Зависимости не проверяем.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+def readyz():
+    """
+    Работоспособны ли зависимости: БД, запись в media, очередь
+    уведомлений (healthcheck контейнера). Результат кэшируется на
+    readyz_cache_seconds, чтобы частые пробы не били по БД.
+    """
+    global _cache
+
+    now = time.monotonic()
+    with _cache_lock:
+        if _cache is None or now - _cache[0] > settings.readyz_cache_seconds:
+            ok, checks = _run_checks()
+            _cache = (now, ok, checks)
+        _, ok, checks = _cache
+
+    return JSONResponse(
+        status_code=200 if ok else 503,
+        content={"status": "ok" if ok else "fail", "checks": checks},
+    )
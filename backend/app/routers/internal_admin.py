@@ -1,9 +1,36 @@
-from app.db.models import Application, ApplicationStatus
+import logging
+from datetime import datetime
+
+from app.core.responses import rows_response
+from app.core.settings import settings
+from app.db.models import (
+    Application,
+    ApplicationArchive,
+    ApplicationStatus,
+    Candidate,
+)
+from app.db.replica import read_session
 from app.db.session import SessionLocal
-from app.schemas.admin import AdminApplicationOut, AdminStatusUpdateIn
+from app.schemas.admin import (
+    AdminApplicationListOut,
+    AdminApplicationOut,
+    AdminApplicationSummaryOut,
+    AdminBulkStatusUpdateIn,
+    AdminStatusUpdateIn,
+)
 from app.security.internal_auth import require_internal_token
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from app.security.media_urls import sign_media_path
+from app.services.application_lists import ListFields, list_columns
+from app.services.archive import application_source
+from app.services.employer_cards import schedule_refresh
+from app.services.notifications import notification_queue
+from app.services.telegram import send_plain_message
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import Integer, any_, bindparam, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session, contains_eager
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/api/internal/admin",
@@ -20,6 +47,14 @@ def get_db() -> Session:
         db.close()
 
 
+def get_read_db(request: Request) -> Session:
+    db = read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def _parse_status(status: str) -> ApplicationStatus:
     """
     Принимаем и 'NEW', и 'new' -> приводим к enum ApplicationStatus.
@@ -35,44 +70,97 @@ def _parse_status(status: str) -> ApplicationStatus:
         )
 
 
-@router.get("/applications", response_model=list[AdminApplicationOut])
+@router.get(
+    "/applications",
+    response_model=list[AdminApplicationListOut] | list[AdminApplicationSummaryOut],
+)
 def list_applications(
     status: str | None = Query(default=None),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    fields: ListFields = "full",
     limit: int = 50,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    q = db.query(Application)
+    enum_status = _parse_status(status) if status else None
+    src = application_source(created_from, created_to, enum_status)
+    columns, names = list_columns(src, fields)
+    q = select(*columns)
 
-    if status:
-        enum_status = _parse_status(status)
-        q = q.filter(Application.status == enum_status)
+    if enum_status is not None:
+        q = q.where(src.c.status == enum_status)
+    if created_from is not None:
+        q = q.where(src.c.created_at >= created_from)
+    if created_to is not None:
+        q = q.where(src.c.created_at < created_to)
 
-    return (
+    q = (
         q.order_by(
-            Application.created_at.desc(),
+            src.c.created_at.desc(),
         )
         .limit(limit)
         .offset(offset)
-        .all()
     )
+    return rows_response(db.execute(q), names)
 
 
 @router.get(
     "/applications/{application_id}",
     response_model=AdminApplicationOut,
 )
-def get_application(application_id: int, db: Session = Depends(get_db)):
-    app = (
-        db.query(Application)
-        .filter(
-            Application.id == application_id,
-        )
-        .one_or_none()
+def get_application(
+    application_id: int,
+    db: Session = Depends(get_read_db),
+):
+    # архивные заявки тоже открываются по ссылке из старых уведомлений
+    app = db.get(Application, application_id) or db.get(
+        ApplicationArchive, application_id
     )
     if app is None:
         raise HTTPException(status_code=404, detail="not found")
-    return app
+
+    out = AdminApplicationOut.model_validate(app)
+    if app.photo_url:
+        out.photo_signed_url = sign_media_path(app.photo_url)
+    return out
+
+
+@router.patch("/applications/status")
+def bulk_update_status(
+    payload: AdminBulkStatusUpdateIn,
+    db: Session = Depends(get_db),
+):
+    """
+    Массовая смена статуса одним UPDATE ... WHERE id = ANY(:ids) RETURNING.
+    Заявки, у которых статус уже такой, не трогаем и не уведомляем.
+    """
+    ids = sorted(set(payload.ids))
+
+    # Core-UPDATE по таблице: ORM-объекты не грузим, identity map не трогаем
+    stmt = (
+        update(Application.__table__)
+        .where(
+            Application.candidate_id == Candidate.id,
+            Application.id == any_(bindparam("ids", ids, type_=ARRAY(Integer))),
+            Application.status != payload.status,
+        )
+        .values(status=payload.status)
+        .returning(Application.id, Candidate.tg_user_id)
+    )
+    rows = db.execute(stmt).all()
+    db.commit()
+
+    # уведомления кандидатам — в отложенную очередь, одним батчем
+    for app_id, tg_user_id in rows:
+        _schedule_status_notification(app_id, tg_user_id, payload.status)
+        schedule_refresh(app_id)
+
+    return {
+        "ok": True,
+        "status": payload.status.value,
+        "updated": sorted(app_id for app_id, _ in rows),
+    }
 
 
 @router.patch("/applications/{application_id}/status")
@@ -82,28 +170,83 @@ def update_status(
     app = (
         db.query(Application)
         .join(Candidate, Candidate.id == Application.candidate_id)
+        .options(contains_eager(Application.candidate))
         .filter(Application.id == application_id)
         .one_or_none()
     )
     if app is None:
         raise HTTPException(status_code=404, detail="not found")
 
+    candidate_tg_id = app.candidate.tg_user_id
     app.status = payload.status
     db.commit()
 
-    # notify candidate about decision / progress
+    # notify candidate about decision / progress — не ждём Telegram в запросе
+    _schedule_status_notification(application_id, candidate_tg_id, payload.status)
+    # карточки заявки у всех HR — на месте, без новых сообщений
+    schedule_refresh(application_id)
+
+    return {"ok": True, "id": application_id, "status": payload.status.value}
+
+
+def _schedule_status_notification(
+    application_id: int,
+    chat_id: int | None,
+    status: ApplicationStatus,
+) -> None:
+    """
+    Уведомление кандидату уходит через status_notify_delay секунд.
+    Повторные смены статуса той же заявки в этом окне схлопываются
+    в одно сообщение с последним статусом.
+    """
+    if chat_id is None:
+        # импортированная заявка: кандидата нет в Telegram
+        return
+    notification_queue.submit(
+        _send_status_if_current,
+        application_id,
+        chat_id,
+        status,
+        key=("status", application_id),
+        delay=settings.status_notify_delay,
+        max_delay=settings.status_notify_max_delay,
+    )
+
+
+def _send_status_if_current(
+    application_id: int,
+    chat_id: int,
+    status: ApplicationStatus,
+) -> None:
+    """
+    Задача очереди. Очередь у каждого воркера своя, и смены статуса,
+    принятые разными воркерами, в ней не схлопываются. Поэтому статус
+    перечитывается перед отправкой: уже другой — сообщение отправит
+    задача последней смены. Заявку могли успеть перенести в архив —
+    тогда статус берётся оттуда.
+    """
+    db = SessionLocal()
     try:
-        msg = _status_message(payload.status)
-        _send_telegram_plain_message(
-            bot_token=settings.bot_token,
-            chat_id=app.candidate.tg_user_id,
-            text=msg,
+        current = db.scalar(
+            select(Application.status).where(Application.id == application_id)
         )
-    except Exception:
-        pass
-
-    status_out = app.status.value if hasattr(app.status, "value") else app.status
-    return {"ok": True, "id": app.id, "status": status_out}
+        if current is None:
+            current = db.scalar(
+                select(ApplicationArchive.status).where(
+                    ApplicationArchive.id == application_id
+                )
+            )
+    finally:
+        db.close()
+    if current != status:
+        logger.info(
+            "status notification for %s skipped: %s is now %s",
+            application_id,
+            status.value,
+            current.value if current is not None else "gone",
+        )
+        return
+    send_plain_message(settings.bot_token, chat_id, _status_message(status))
 
 
 def _status_message(status: ApplicationStatus) -> str:
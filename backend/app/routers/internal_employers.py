@@ -1,7 +1,9 @@
-from app.db.models import Employer
+from app.db.models import Employer, NotificationMode
+from app.db.replica import read_session
 from app.db.session import SessionLocal
 from app.security.internal_auth import require_internal_token
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 router = APIRouter(
@@ -19,10 +21,23 @@ def get_db() -> Session:
         db.close()
 
 
+def get_read_db(request: Request) -> Session:
+    db = read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+class NotificationModeIn(BaseModel):
+    mode: NotificationMode
+    interval_minutes: int | None = Field(default=None, ge=5, le=24 * 60)
+
+
 @router.get("/by-tg/{tg_user_id}")
 def get_employer_by_tg(
     tg_user_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     emp = (
         db.query(Employer)
@@ -39,4 +54,41 @@ def get_employer_by_tg(
     return {
         "is_hr": True,
         "role": emp.role.value,  # важно!
+        "notification_mode": emp.notification_mode.value,
+        "digest_interval_minutes": emp.digest_interval_minutes,
+    }
+
+
+@router.patch("/by-tg/{tg_user_id}/notifications")
+def set_notification_mode(
+    tg_user_id: int,
+    payload: NotificationModeIn,
+    db: Session = Depends(get_db),
+):
+    """
+    instant — каждое событие сразу; batched/hourly — сводкой.
+    """
+    emp = (
+        db.query(Employer)
+        .filter(
+            Employer.tg_user_id == tg_user_id,
+            Employer.is_active == True,
+        )
+        .one_or_none()
+    )
+    if not emp:
+        raise HTTPException(status_code=404, detail="employer not found")
+
+    if emp.notification_mode != payload.mode:
+        emp.notification_mode = payload.mode
+        # сводка считает заявки с момента переключения
+        emp.last_digest_at = None
+    if payload.interval_minutes is not None:
+        emp.digest_interval_minutes = payload.interval_minutes
+    db.commit()
+
+    return {
+        "ok": True,
+        "notification_mode": emp.notification_mode.value,
+        "digest_interval_minutes": emp.digest_interval_minutes,
     }
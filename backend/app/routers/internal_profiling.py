@@ -0,0 +1,104 @@
+import os
+
+from app.security.debug_profile import DEBUG_PROFILE_HEADER, sign_debug_profile
+from app.security.internal_auth import require_internal_token
+from app.services.profiling import (
+    PROFILE_FORMATS,
+    PROFILE_ID_RE,
+    list_profiles,
+    profile_requests,
+    profiles_dir,
+    profiling_available,
+    target_info,
+)
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse
+from pydantic import BaseModel, Field
+
+router = APIRouter(
+    prefix="/api/internal/profiling",
+    tags=["internal-profiling"],
+    dependencies=[Depends(require_internal_token)],
+)
+
+
+class ProfileRequestIn(BaseModel):
+    # шаблон пути из /docs, например /api/admin/applications/{application_id}
+    route: str
+    method: str | None = None
+    count: int = Field(default=1, ge=1, le=100)
+    ttl_seconds: int = Field(default=600, ge=1, le=86400)
+
+
+class DebugHeaderIn(BaseModel):
+    ttl_seconds: int = Field(default=600, ge=1, le=3600)
+
+
+def _require_profiler() -> None:
+    if not profiling_available():
+        raise HTTPException(status_code=503, detail="pyinstrument is not installed")
+
+
+@router.post("")
+def arm_profiling(payload: ProfileRequestIn, request: Request):
+    """
+    Профилировать следующие count запросов к route (в этом воркере —
+    ответ содержит его pid). Результат: GET /api/internal/profiling,
+    у профилированного ответа — заголовок X-Profile-Id.
+    """
+    _require_profiler()
+    if not any(getattr(r, "path", None) == payload.route for r in request.app.routes):
+        raise HTTPException(status_code=400, detail="unknown route")
+    profile_requests.arm(
+        payload.route,
+        payload.method,
+        payload.count,
+        payload.ttl_seconds,
+    )
+    return {"pid": os.getpid(), "target": target_info()}
+
+
+@router.delete("")
+def disarm_profiling():
+    profile_requests.disarm()
+    return {"pid": os.getpid(), "target": None}
+
+
+@router.post("/header")
+def debug_profile_header(payload: DebugHeaderIn):
+    """
+    Подписанный заголовок: запрос с ним профилируется в любом воркере,
+    пока подпись не истекла.
+    """
+    _require_profiler()
+    return {
+        "header": DEBUG_PROFILE_HEADER,
+        "value": sign_debug_profile(payload.ttl_seconds),
+    }
+
+
+@router.get("")
+def profiles():
+    return {
+        "pid": os.getpid(),
+        "target": target_info(),
+        "profiles": list_profiles(),
+    }
+
+
+@router.get("/{profile_id}")
+def get_profile(
+    profile_id: str,
+    format: str = Query(default="html", pattern="^(html|speedscope)$"),
+):
+    """
+    html — интерактивное дерево pyinstrument, speedscope — JSON для
+    https://www.speedscope.app (flamegraph).
+    """
+    if not PROFILE_ID_RE.match(profile_id):
+        raise HTTPException(status_code=404, detail="not found")
+    suffix, media_type = PROFILE_FORMATS[format]
+    path = profiles_dir() / f"{profile_id}{suffix}"
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="not found")
+    return FileResponse(path, media_type=media_type)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+from app.core.settings import settings
+from app.db.session import SessionLocal
+from app.routers.admin import require_employer
+from app.security.media_urls import verify_media_signature
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+router = APIRouter(prefix="/media", tags=["media"], include_in_schema=False)
+
+# имена, которые генерирует upload_photo: <id>_<hex>.<ext>
+_FILENAME_RE = re.compile(r"^[A-Za-z0-9_-]+\.(jpg|png|webp)$")
+
+
+def get_db() -> Session:
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@router.get("/photos/{filename}")
+def get_photo(
+    filename: str,
+    exp: int | None = None,
+    sig: str | None = None,
+    authorization: str = Header(default=""),
+    x_tg_init_data: str = Header(default=""),
+    db: Session = Depends(get_db),
+):
+    """
+    Фото заявки. Доступ:
+    - подписанная ссылка (?exp=&sig=) — её получает Telegram;
+    - HR из WebApp (admin-токен или X-Tg-Init-Data активного работодателя).
+
+    Сами байты отдаёт nginx через X-Accel-Redirect (sendfile),
+    Python-воркер только проверяет доступ.
+    """
+    if not _FILENAME_RE.match(filename):
+        raise HTTPException(status_code=404, detail="not found")
+
+    path = f"/media/photos/{filename}"
+    if not (exp and sig and verify_media_signature(path, exp, sig)):
+        require_employer(authorization, x_tg_init_data, db)
+
+    if settings.media_accel_redirect:
+        return Response(
+            headers={
+                "X-Accel-Redirect": f"{settings.media_accel_prefix}/photos/{filename}",
+            }
+        )
+
+    # локальная разработка без nginx
+    filepath = Path(settings.media_root) / "photos" / filename
+    if not filepath.is_file():
+        raise HTTPException(status_code=404, detail="not found")
+    return FileResponse(filepath, headers={"Cache-Control": "private, max-age=300"})
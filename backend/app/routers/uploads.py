@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import uuid
+from datetime import timedelta
+
+from app.core.settings import settings
+from app.db.models import PhotoUpload
+from app.db.session import SessionLocal
+from app.routers.applications import get_tg_user_id
+from app.schemas.applications import PhotoUploadCreate, PhotoUploadOut
+from app.security.rate_limit import rate_limit
+from app.services.uploads import (
+    MAX_PHOTO_BYTES,
+    PHOTO_TYPES,
+    declared_size_error,
+    photo_head_error,
+    write_chunk,
+)
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+router = APIRouter(prefix="/api/uploads", tags=["uploads"])
+
+
+def get_db() -> Session:
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _out(upload: PhotoUpload, response: Response) -> PhotoUploadOut:
+    # как в tus: клиент может смотреть только на заголовок
+    response.headers["Upload-Offset"] = str(upload.offset)
+    response.headers["Upload-Length"] = str(upload.size)
+    return PhotoUploadOut(
+        upload_id=upload.id,
+        size=upload.size,
+        offset=upload.offset,
+        chunk_size=settings.upload_chunk_max_bytes,
+        expires_at=upload.expires_at,
+    )
+
+
+def _get_upload(
+    db: Session,
+    upload_id: str,
+    tg_user_id: int,
+    for_update: bool = False,
+) -> PhotoUpload:
+    q = db.query(PhotoUpload).filter(
+        PhotoUpload.id == upload_id,
+        PhotoUpload.tg_user_id == tg_user_id,
+        PhotoUpload.expires_at > func.localtimestamp(),
+    )
+    if for_update:
+        q = q.with_for_update()
+    upload = q.one_or_none()
+    if upload is None:
+        raise HTTPException(status_code=404, detail="upload not found")
+    return upload
+
+
+def _expires_at():
+    return func.localtimestamp() + timedelta(hours=settings.upload_ttl_hours)
+
+
+@router.post(
+    "/photos",
+    status_code=201,
+    response_model=PhotoUploadOut,
+    dependencies=[Depends(rate_limit("uploads:create", get_tg_user_id))],
+)
+def create_photo_upload(
+    data: PhotoUploadCreate,
+    response: Response,
+    tg_user_id: int = Depends(get_tg_user_id),
+    db: Session = Depends(get_db),
+):
+    """
+    Докачиваемая загрузка фото (по мотивам tus):
+    1. POST /api/uploads/photos {size, content_type} -> upload_id;
+    2. PATCH /api/uploads/photos/{id} с Upload-Offset и куском байт,
+       пока offset < size; после обрыва — GET, чтобы узнать offset;
+    3. upload_id в POST /api/applications/submit вместе с анкетой
+       (или POST /api/applications/{id}/photo/complete {upload_id}).
+    Незавершённая загрузка живёт upload_ttl_hours после последнего куска.
+    width/height (после уменьшения в WebApp) проверяются до загрузки
+    байт, а потом сверяются с заголовком файла.
+    """
+    if data.content_type not in PHOTO_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail="Only jpg, png, webp allowed",
+        )
+    if data.size > MAX_PHOTO_BYTES:
+        raise HTTPException(status_code=400, detail="Max file size is 5MB")
+    error = declared_size_error(data.width, data.height)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    upload = PhotoUpload(
+        id=uuid.uuid4().hex,
+        tg_user_id=tg_user_id,
+        content_type=data.content_type,
+        size=data.size,
+        width=data.width,
+        height=data.height,
+        offset=0,
+        expires_at=_expires_at(),
+    )
+    db.add(upload)
+    db.commit()
+    db.refresh(upload)
+    return _out(upload, response)
+
+
+@router.get("/photos/{upload_id}", response_model=PhotoUploadOut)
+def get_photo_upload(
+    upload_id: str,
+    response: Response,
+    tg_user_id: int = Depends(get_tg_user_id),
+    db: Session = Depends(get_db),
+):
+    """Сколько байт уже принято (после обрыва связи)."""
+    return _out(_get_upload(db, upload_id, tg_user_id), response)
+
+
+@router.patch(
+    "/photos/{upload_id}",
+    response_model=PhotoUploadOut,
+    dependencies=[Depends(rate_limit("uploads:chunk", get_tg_user_id))],
+)
+async def append_photo_chunk(
+    upload_id: str,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(..., ge=0),
+    tg_user_id: int = Depends(get_tg_user_id),
+    db: Session = Depends(get_db),
+):
+    """
+    Кусок файла с позиции Upload-Offset (тело — сырые байты).
+    Offset не совпал с принятым (кусок уже дошёл, ответ потерялся) —
+    409 и текущий offset в заголовке Upload-Offset.
+    """
+    limit = settings.upload_chunk_max_bytes
+    if int(request.headers.get("content-length") or 0) > limit:
+        raise HTTPException(status_code=413, detail="chunk is too large")
+
+    chunk = bytearray()
+    async for part in request.stream():
+        chunk += part
+        if len(chunk) > limit:
+            raise HTTPException(status_code=413, detail="chunk is too large")
+    if not chunk:
+        raise HTTPException(status_code=400, detail="empty chunk")
+
+    # БД и fsync — в потоке, не в event loop
+    upload = await asyncio.to_thread(
+        _append, db, upload_id, tg_user_id, upload_offset, bytes(chunk)
+    )
+    return _out(upload, response)
+
+
+def _append(
+    db: Session,
+    upload_id: str,
+    tg_user_id: int,
+    offset: int,
+    chunk: bytes,
+) -> PhotoUpload:
+    # строка заблокирована до commit: параллельные PATCH одной загрузки
+    # пишут по очереди и видят уже сдвинутый offset
+    upload = _get_upload(db, upload_id, tg_user_id, for_update=True)
+    if offset != upload.offset:
+        current = upload.offset
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="offset mismatch",
+            headers={"Upload-Offset": str(current)},
+        )
+    if offset + len(chunk) > upload.size:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="chunk exceeds upload size")
+    if offset == 0:
+        # заголовок картинки обычно в первом куске — не тот файл
+        # отклоняем сразу, а не после загрузки всех байт
+        error = photo_head_error(
+            io.BytesIO(chunk),
+            upload.content_type,
+            upload.width,
+            upload.height,
+            complete=len(chunk) == upload.size,
+        )
+        if error:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=error)
+
+    write_chunk(upload.id, offset, chunk)
+    upload.offset = offset + len(chunk)
+    upload.expires_at = _expires_at()
+    db.commit()
+    db.refresh(upload)
+    return upload
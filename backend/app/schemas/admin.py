@@ -1,10 +1,15 @@
 from datetime import date, datetime
 
-from app.db.models import ApplicationStatus, Gender
+from app.db.models import ApplicationStatus, EmployerRole, Gender
 from pydantic import BaseModel, Field
 
 
-class AdminApplicationOut(BaseModel):
+class AdminApplicationListOut(BaseModel):
+    """
+    Строка списка заявок: без длинного текста (why_hire_facts).
+    Списки собирают эти колонки Core-запросом, без ORM.
+    """
+
     id: int
     vacancy_id: int
 
@@ -23,7 +28,6 @@ class AdminApplicationOut(BaseModel):
     is_married: bool
     source: str | None
     desired_salary: str | None
-    why_hire_facts: str | None
 
     photo_url: str | None
 
@@ -34,7 +38,49 @@ class AdminApplicationOut(BaseModel):
         from_attributes = True
 
 
+# колонки applications для списков — в порядке полей схемы
+LIST_FIELDS = tuple(AdminApplicationListOut.model_fields)
+
+
+class AdminApplicationSummaryOut(BaseModel):
+    """Строка списка для бота (fields=summary)."""
+
+    id: int
+    full_name: str
+    status: ApplicationStatus
+    created_at: datetime
+    has_photo: bool
+
+
+SUMMARY_FIELDS = tuple(AdminApplicationSummaryOut.model_fields)
+
+
+class AdminApplicationOut(AdminApplicationListOut):
+    why_hire_facts: str | None
+
+    # подписанная ссылка на фото (для бота/Telegram), только во внутреннем API
+    photo_signed_url: str | None = None
+
+
 class AdminStatusUpdateIn(BaseModel):
     status: ApplicationStatus = Field(
         ..., description="NEW | IN_REVIEW | REJECTED | ACCEPTED"
     )
+
+
+class AdminBulkStatusUpdateIn(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=200)
+    status: ApplicationStatus = Field(
+        ..., description="NEW | IN_REVIEW | REJECTED | ACCEPTED"
+    )
+
+
+class AdminSessionOut(BaseModel):
+    """
+    Admin-сессия: токен передаётся как Authorization: Bearer <token>.
+    expires_at — unix time.
+    """
+
+    token: str
+    expires_at: int
+    role: EmployerRole
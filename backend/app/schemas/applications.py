@@ -1,7 +1,8 @@
-from datetime import date
+from datetime import date, datetime, timezone
 
 from app.db.models import Gender
-from pydantic import BaseModel, Field
+from fastapi import UploadFile
+from pydantic import BaseModel, Field, field_validator
 
 
 class ApplicationCreate(BaseModel):
@@ -25,3 +26,90 @@ class ApplicationCreate(BaseModel):
 
 class ApplicationCreated(BaseModel):
     id: int
+
+
+class ApplicationSubmitForm(ApplicationCreate):
+    """
+    Анкета и фото одним multipart-запросом (POST /api/applications/submit).
+    Фото — файлом photo (photo_width/photo_height — размер после уменьшения
+    в WebApp) или upload_id завершённой докачиваемой загрузки.
+    """
+
+    photo: UploadFile | None = None
+    upload_id: str | None = Field(default=None, max_length=32)
+    photo_width: int | None = Field(default=None, gt=0)
+    photo_height: int | None = Field(default=None, gt=0)
+
+
+class ApplicationSubmitted(ApplicationCreated):
+    photo_url: str | None = None
+
+
+class ApplicationImportRow(ApplicationCreate):
+    """
+    Строка CSV-импорта: те же поля, что у анкеты WebApp, плюс
+    необязательные tg_user_id и дата подачи (по умолчанию — сейчас).
+    """
+
+    tg_user_id: int | None = None
+    created_at: datetime | None = None
+
+    @field_validator("created_at")
+    @classmethod
+    def created_at_not_in_future(cls, value: datetime | None) -> datetime | None:
+        # будущая дата легла бы в applications_default (партиций там нет)
+        if value is None:
+            return value
+        now = datetime.now(timezone.utc) if value.tzinfo else datetime.now()
+        if value > now:
+            raise ValueError("must not be in the future")
+        return value
+
+
+class ApplicationImportError(BaseModel):
+    line: int
+    errors: list[str]
+
+
+class ApplicationImportReport(BaseModel):
+    total: int = 0
+    imported: int = 0
+    failed: int = 0
+    dry_run: bool = False
+    # первые N ошибок (остальные только в failed)
+    errors: list[ApplicationImportError] = []
+
+
+class PhotoUploadCreate(BaseModel):
+    """
+    Начало докачиваемой загрузки: полный размер файла и его тип.
+    width/height — размер картинки после уменьшения в WebApp.
+    """
+
+    size: int = Field(gt=0)
+    content_type: str = Field(max_length=32)
+    width: int | None = Field(default=None, gt=0)
+    height: int | None = Field(default=None, gt=0)
+
+
+class PhotoUploadOut(BaseModel):
+    upload_id: str
+    size: int
+    # сколько байт уже принято — с этого места слать следующий кусок
+    offset: int
+    # максимум байт в одном PATCH
+    chunk_size: int
+    expires_at: datetime
+
+
+class PhotoUploadComplete(BaseModel):
+    upload_id: str = Field(max_length=32)
+
+
+class WebAppConfig(BaseModel):
+    """Настройки WebApp с backend (GET /api/config/webapp)."""
+
+    photo_max_dimension: int
+    photo_jpeg_quality: float
+    photo_max_bytes: int
+    upload_chunk_size: int
@@ -0,0 +1,25 @@
+import argparse
+
+from app.db.partitions import ensure_partitions
+from app.services.archive import archive_closed_applications
+
+
+def main() -> None:
+    """
+    Разовый прогон обслуживания applications (то же делает backend
+    по расписанию): создать будущие партиции и перенести старые
+    закрытые заявки в архив.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    created = ensure_partitions()
+    print(f"partitions created: {len(created)}")
+
+    moved = archive_closed_applications(args.batch_size)
+    print(f"applications archived: {moved}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import json
+import time
+
+from app.core.responses import rows_response
+from app.db.models import Application, Candidate
+from app.db.session import SessionLocal
+from app.schemas.admin import LIST_FIELDS, AdminApplicationOut
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+
+
+def _orm_path(limit: int) -> int:
+    """Как было: ORM-объекты + pydantic from_attributes + json."""
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(Application)
+            .join(Candidate)
+            .order_by(Application.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+        payload = [AdminApplicationOut.model_validate(r) for r in rows]
+        body = json.dumps(jsonable_encoder(payload)).encode()
+    finally:
+        db.close()
+    assert body
+    return len(rows)
+
+
+def _projected_path(limit: int) -> int:
+    """Как стало: нужные колонки кортежами + orjson."""
+    table = Application.__table__
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(*(table.c[name] for name in LIST_FIELDS))
+            .order_by(table.c.created_at.desc())
+            .limit(limit)
+        ).all()
+        body = rows_response(rows, LIST_FIELDS).body
+    finally:
+        db.close()
+    assert body
+    return len(rows)
+
+
+def _bench(fn, limit: int, seconds: float) -> float:
+    fn(limit)  # прогрев: пул соединений, кэш запросов
+    rows = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        rows += fn(limit)
+    return rows / (time.perf_counter() - started)
+
+
+def main() -> None:
+    """
+    Сравнение списка заявок до/после проекции колонок (rows/s).
+    В БД должно быть не меньше --limit заявок.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    before = _bench(_orm_path, args.limit, args.seconds)
+    after = _bench(_projected_path, args.limit, args.seconds)
+    print(f"limit={args.limit}")
+    print(f"orm + pydantic: {before:,.0f} rows/s")
+    print(f"projected + orjson: {after:,.0f} rows/s ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import argparse
+import gzip
+import re
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+
+# <script src=...> и <link rel="stylesheet" href=...> оболочки
+_ASSET_RE = re.compile(
+    r'<script[^>]*\ssrc="([^"]+)"|<link[^>]*rel="stylesheet"[^>]*href="([^"]+)"'
+)
+
+# новое HTTPS-соединение: DNS + TCP + TLS
+HANDSHAKE_RTTS = 3
+
+
+def _fetch(client: httpx.Client, url: str) -> dict | None:
+    try:
+        resp = client.get(url, headers={"Accept-Encoding": "br, gzip"})
+    except httpx.HTTPError as exc:
+        print(f"  {url}: unreachable ({exc.__class__.__name__})")
+        return None
+    cache = resp.headers.get("cache-control", "")
+    # байты по сети — до распаковки
+    size = resp.num_bytes_downloaded
+    encoding = resp.headers.get("content-encoding")
+    if encoding is None:
+        # напрямую из uvicorn: в проде это сжал бы nginx (gzip on, level 1)
+        size = len(gzip.compress(resp.content, 1))
+        encoding = "gzip (est.)"
+    print(
+        f"  {url}: {resp.status_code} {size:,} B {encoding} "
+        f"cache-control={cache or '-'}"
+    )
+    return {
+        "url": url,
+        "bytes": size,
+        "cached": _cacheable(cache),
+        # при повторе придёт 304, а не тело
+        "revalidates": bool(
+            resp.headers.get("etag") or resp.headers.get("last-modified")
+        ),
+        "text": resp.text,
+    }
+
+
+def _cacheable(cache_control: str) -> bool:
+    """Повторный визит без запроса: immutable или max-age без no-cache."""
+    value = cache_control.lower()
+    if "no-cache" in value or "no-store" in value:
+        return False
+    return "immutable" in value or "max-age=" in value
+
+
+def _seconds(rtts: int, nbytes: int, rtt: float, bytes_per_s: float) -> float:
+    return rtts * rtt + nbytes / bytes_per_s
+
+
+def main() -> None:
+    """
+    Оценка времени передачи WebApp по медленной мобильной сети: скачивает
+    оболочку и её ассеты (реальные размеры по сети и Cache-Control) и
+    считает время до получения всех скриптов/стилей по модели RTT +
+    bytes/bandwidth. Первый визит и повторный (с кэшем браузера).
+
+    Это не время до интерактивности: разбор и выполнение JS, в том числе
+    JIT Tailwind Play CDN в несобранном варианте, и троттлинг CPU не
+    учитываются — их меряют в браузере (DevTools, Lighthouse).
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("url", help="например https://api.example.com/webapp")
+    # по умолчанию — профиль «Slow 3G» Chrome DevTools
+    parser.add_argument("--rtt-ms", type=float, default=400.0)
+    parser.add_argument("--kbps", type=float, default=400.0)
+    args = parser.parse_args()
+
+    rtt = args.rtt_ms / 1000
+    bytes_per_s = args.kbps * 1000 / 8
+
+    with httpx.Client(follow_redirects=True, timeout=20) as client:
+        print("fetch:")
+        shell = _fetch(client, args.url)
+        if shell is None:
+            raise SystemExit(1)
+        assets = []
+        for match in _ASSET_RE.finditer(shell["text"]):
+            asset = _fetch(client, urljoin(args.url, match.group(1) or match.group(2)))
+            if asset is not None:
+                assets.append(asset)
+
+    origin = urlsplit(args.url).netloc
+    other_origins = {urlsplit(a["url"]).netloc for a in assets} - {origin}
+    # ассеты качаются параллельно после оболочки, полоса общая
+    extra_handshake = HANDSHAKE_RTTS if other_origins else 0
+
+    cold = _seconds(HANDSHAKE_RTTS + 1, shell["bytes"], rtt, bytes_per_s)
+    cold += _seconds(
+        extra_handshake + 1, sum(a["bytes"] for a in assets), rtt, bytes_per_s
+    )
+
+    # повтор: с кэшем браузера; no-cache — условный запрос (304)
+    stale = [r for r in [shell, *assets] if not r["cached"]]
+    warm = 0.0
+    if stale:
+        warm = _seconds(
+            HANDSHAKE_RTTS + 1,
+            sum(r["bytes"] for r in stale if not r["revalidates"]),
+            rtt,
+            bytes_per_s,
+        )
+    if any(not a["cached"] for a in assets):
+        # ассеты проверяются уже после ответа на оболочку
+        warm += rtt
+
+    print(f"profile: rtt {args.rtt_ms:.0f} ms, {args.kbps:.0f} kbit/s")
+    print(f"bytes: shell {shell['bytes']:,}, assets {sum(a['bytes'] for a in assets):,}")
+    print(f"first visit: {cold:.2f} s")
+    print(f"repeat visit: {warm:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
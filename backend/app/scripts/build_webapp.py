@@ -0,0 +1,152 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shlex
+import subprocess
+import tempfile
+from pathlib import Path
+
+import brotli
+
+WEBAPP_DIR = Path(__file__).resolve().parents[1] / "webapp"
+DIST_DIR = WEBAPP_DIR / "dist"
+
+# Tailwind Play CDN — только для разработки без сборки
+TAILWIND_CDN_TAG = '<script src="https://cdn.tailwindcss.com"></script>'
+# cdn.tailwindcss.com — Tailwind v3, собираем той же версией
+DEFAULT_TAILWIND = "npx --yes tailwindcss@3.4.17"
+
+# ссылка в index.html -> исходный файл
+SOURCE_ASSETS = {"/webapp/app.js": "app.js"}
+
+
+def _hashed_name(name: str, data: bytes) -> str:
+    stem, suffix = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{suffix}"
+
+
+def _write(path: Path, data: bytes) -> None:
+    # сначала во временный файл: nginx не увидит недописанный
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _write_asset(assets_dir: Path, name: str, data: bytes) -> list[str]:
+    """Файл и готовые .br/.gz рядом (nginx отдаёт их без сжатия на лету)."""
+    _write(assets_dir / name, data)
+    _write(assets_dir / f"{name}.br", brotli.compress(data, quality=11))
+    # mtime=0 — одинаковый вход даёт одинаковый .gz
+    _write(assets_dir / f"{name}.gz", gzip.compress(data, 9, mtime=0))
+    return [name, f"{name}.br", f"{name}.gz"]
+
+
+def _compile_css(tailwind: str) -> bytes:
+    """Только классы, которые встречаются в index.html и app.js."""
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "app.css"
+        subprocess.run(
+            [
+                *shlex.split(tailwind),
+                "-i",
+                str(WEBAPP_DIR / "styles.css"),
+                "-o",
+                str(out),
+                "--content",
+                f"{WEBAPP_DIR / 'index.html'},{WEBAPP_DIR / 'app.js'}",
+                "--minify",
+            ],
+            check=True,
+        )
+        return out.read_bytes()
+
+
+def build(out_dir: Path, tailwind: str, base_url: str) -> dict[str, str]:
+    """
+    Собирает WebApp в out_dir:
+    - assets/<name>.<hash>.<ext> (+ .br, .gz) — кэшируются навсегда;
+    - index.html — маленькая оболочка со ссылками на них, не кэшируется.
+
+    Файлы прошлой сборки остаются (у открытых WebApp может быть старая
+    оболочка), более старые удаляются.
+
+    Returns:
+        dict: исходное имя -> имя в assets/
+    """
+    assets_dir = out_dir / "assets"
+    assets_dir.mkdir(parents=True, exist_ok=True)
+    html = (WEBAPP_DIR / "index.html").read_text(encoding="utf-8")
+    if TAILWIND_CDN_TAG not in html:
+        raise SystemExit(f"index.html: {TAILWIND_CDN_TAG} not found")
+
+    manifest: dict[str, str] = {}
+    files: list[str] = []
+
+    css = _compile_css(tailwind)
+    css_name = _hashed_name("app.css", css)
+    files += _write_asset(assets_dir, css_name, css)
+    manifest["styles.css"] = css_name
+    html = html.replace(
+        TAILWIND_CDN_TAG,
+        f'<link rel="stylesheet" href="{base_url}{css_name}" />',
+    )
+
+    for ref, source in SOURCE_ASSETS.items():
+        data = (WEBAPP_DIR / source).read_bytes()
+        name = _hashed_name(source, data)
+        files += _write_asset(assets_dir, name, data)
+        manifest[source] = name
+        html = html.replace(f'"{ref}"', f'"{base_url}{name}"')
+
+    # оболочку пишем последней — ассеты, на которые она ссылается, уже есть
+    manifest_path = out_dir / "manifest.json"
+    previous = []
+    if manifest_path.exists():
+        previous = json.loads(manifest_path.read_text()).get("files", [])
+    _write(out_dir / "index.html", html.encode("utf-8"))
+    _write(
+        manifest_path,
+        json.dumps({"assets": manifest, "files": files}, indent=2).encode(),
+    )
+
+    keep = set(files) | set(previous)
+    for path in assets_dir.iterdir():
+        if path.name not in keep:
+            path.unlink()
+    return manifest
+
+
+def main() -> None:
+    """
+    Сборка Telegram WebApp: Tailwind CSS вместо Play CDN, ассеты с хешем
+    в имени и заранее сжатые (brotli, gzip). Нужен Node (npx) или
+    standalone Tailwind CLI (--tailwind /path/to/tailwindcss).
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--out", type=Path, default=DIST_DIR)
+    parser.add_argument(
+        "--tailwind",
+        default=DEFAULT_TAILWIND,
+        help="команда Tailwind CLI",
+    )
+    parser.add_argument(
+        "--base-url",
+        default="/webapp/assets/",
+        help="URL каталога assets/ (как его отдаёт nginx)",
+    )
+    args = parser.parse_args()
+
+    manifest = build(args.out, args.tailwind, args.base_url)
+    for source, name in manifest.items():
+        path = args.out / "assets" / name
+        sizes = ", ".join(
+            f"{ext or 'raw'} {(path.parent / (name + ext)).stat().st_size:,} B"
+            for ext in ("", ".br", ".gz")
+        )
+        print(f"{source} -> assets/{name} ({sizes})")
+
+
+if __name__ == "__main__":
+    main()
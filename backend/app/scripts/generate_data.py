@@ -0,0 +1,467 @@
+import argparse
+import io
+import random
+import struct
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import partial
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from app.core.settings import settings
+from app.db.models import Employer, EmployerRole, Vacancy
+from app.db.partitions import ensure_partitions
+from app.db.session import SessionLocal, engine
+from sqlalchemy import func, select, text
+
+# tg_user_id синтетических пользователей: отдельный диапазон, чтобы
+# не пересечься с настоящими и чтобы повторный запуск продолжал нумерацию
+CANDIDATE_TG_BASE = 1_000_000_000
+EMPLOYER_TG_BASE = 900_000_000
+
+MALE_NAMES = [
+    "Aziz", "Bekzod", "Bobur", "Doniyor", "Eldor", "Farrux", "Jasur",
+    "Javohir", "Jamshid", "Sardor", "Sherzod", "Shoxrux", "Otabek",
+    "Oybek", "Ulug'bek", "Umid", "Rustam", "Sanjar", "Temur", "Islom",
+    "Akmal", "Anvar", "Dilshod", "Nodir", "Zafar", "Xurshid",
+]
+FEMALE_NAMES = [
+    "Dilnoza", "Gulnora", "Gulbahor", "Madina", "Malika", "Mohira",
+    "Nilufar", "Nodira", "Shahnoza", "Sevara", "Zarina", "Zebo",
+    "Kamola", "Feruza", "Laylo", "Munisa", "Sitora", "Yulduz",
+    "Dildora", "Maftuna", "Nargiza", "Ozoda", "Shoira", "Umida",
+]
+SURNAMES = [
+    "Abdullayev", "Aliyev", "Azimov", "Boboyev", "Ergashev", "Hasanov",
+    "Ibragimov", "Jo'rayev", "Karimov", "Mahmudov", "Mirzayev",
+    "Nazarov", "Normatov", "Qodirov", "Rahimov", "Rasulov", "Saidov",
+    "Sobirov", "Sultonov", "Tursunov", "Usmonov", "Xolmatov",
+    "Yusupov", "Zokirov", "Ismoilov", "Raximov",
+]
+NATIONALITIES = [
+    ("O'zbek", 80), ("Qozoq", 5), ("Tojik", 5), ("Rus", 4),
+    ("Qoraqalpoq", 4), ("Tatar", 2),
+]
+CITIES = [
+    "Toshkent sh., Chilonzor t.", "Toshkent sh., Yunusobod t.",
+    "Toshkent sh., Mirzo Ulug'bek t.", "Toshkent sh., Sergeli t.",
+    "Toshkent sh., Yakkasaroy t.", "Toshkent sh., Olmazor t.",
+    "Samarqand sh.", "Buxoro sh.", "Andijon sh.", "Namangan sh.",
+    "Farg'ona sh.", "Qarshi sh.", "Nukus sh.", "Urganch sh.",
+    "Toshkent vil., Chirchiq sh.", "Jizzax sh.", "Termiz sh.",
+]
+STREETS = [
+    "Amir Temur ko'chasi", "Navoiy ko'chasi", "Bunyodkor shoh ko'chasi",
+    "Mustaqillik ko'chasi", "Bog'ishamol ko'chasi", "Qatortol ko'chasi",
+    "Farg'ona yo'li", "Shota Rustaveli ko'chasi", "Mukimiy ko'chasi",
+]
+PREV_JOBS = [
+    "Korzinka supermarketi, kassir", "Makro, sotuvchi",
+    "Evos, oshpaz yordamchisi", "Uzum Market, kuryer",
+    "Artel, omborchi", "Oqtepa Lavash, kassir", "Havas, sotuvchi",
+    "Beeline, operator", "Texnomart, sotuv maslahatchisi",
+    "Safia, ofitsiant", "Bozor, sotuvchi", "Xususiy do'kon, sotuvchi",
+]
+DURATIONS = [
+    "3 oy", "6 oy", "1 yil", "1,5 yil", "2 yil", "3 yil", "5 yildan ortiq",
+]
+LEAVE_REASONS = [
+    "Oylik kam edi", "Uyga uzoq edi", "O'qishga kirdim",
+    "Kompaniya yopildi", "Ish vaqti to'g'ri kelmadi",
+    "Yangi tajriba olmoqchiman", "Oilaviy sabablar",
+]
+SOURCES = [
+    "Telegram kanal", "Instagram", "Do'stim tavsiya qildi", "OLX.uz",
+    "hh.uz", "E'lon (ko'chada)", "Facebook",
+]
+SALARIES = [
+    "3 000 000 so'm", "3 500 000 so'm", "4 000 000 so'm",
+    "4 500 000 so'm", "5 000 000 so'm", "6 000 000 so'm", "Kelishilgan holda",
+]
+FACTS = [
+    "Mas'uliyatliman va vaqtida ishga kelaman.",
+    "Mijozlar bilan muloqot qilishni yaxshi ko'raman.",
+    "Tez o'rganaman, jamoada ishlay olaman.",
+    "Rus tilini yaxshi bilaman.",
+    "Kassa apparati bilan ishlash tajribam bor.",
+    "Haydovchilik guvohnomam bor (B toifa).",
+    "Kompyuterda ishlay olaman (Excel, 1C).",
+    "Tunda ham ishlashga tayyorman.",
+    "Oldingi ish joyimda eng yaxshi xodim bo'lganman.",
+    "Stressga chidamliman va halolman.",
+]
+VACANCY_TITLES = [
+    "Kassir", "Sotuvchi-konsultant", "Omborchi", "Kuryer",
+    "Oshpaz yordamchisi", "Ofitsiant", "Call-markaz operatori",
+    "Farrosh", "Qo'riqchi", "Administrator", "Haydovchi",
+    "SMM mutaxassisi", "Buxgalter yordamchisi", "Menejer",
+]
+
+APPLICATION_COLUMNS = (
+    "candidate_id",
+    "vacancy_id",
+    "full_name",
+    "gender",
+    "phone",
+    "birth_date",
+    "nationality",
+    "address",
+    "prev_job",
+    "prev_job_duration",
+    "prev_job_leave_reason",
+    "is_married",
+    "source",
+    "desired_salary",
+    "why_hire_facts",
+    "photo_url",
+    "status",
+    "created_at",
+)
+
+
+class _LineStream(io.RawIOBase):
+    """
+    Файл для COPY FROM STDIN поверх итератора строк: psycopg2 читает
+    кусками, вся пачка в памяти не собирается.
+    """
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        self._lines = iter(lines)
+        self._buf = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        chunks = [self._buf]
+        size = len(self._buf)
+        for line in self._lines:
+            data = line.encode()
+            chunks.append(data)
+            size += len(data)
+            if size >= len(b):
+                break
+        data = b"".join(chunks)
+        n = min(len(b), len(data))
+        b[:n] = data[:n]
+        self._buf = data[n:]
+        return n
+
+
+def _copy(table: str, columns: Iterable[str], lines: Iterable[str]) -> None:
+    """COPY ... FROM STDIN одной транзакцией (одна пачка)."""
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cur:
+            cur.copy_expert(
+                f"COPY {table} ({', '.join(columns)}) FROM STDIN",
+                _LineStream(lines),
+                size=1 << 16,
+            )
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def _placeholder_png(rgb: tuple[int, int, int], size: int = 32) -> bytes:
+    """Однотонный PNG без Pillow."""
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(
+            ">I", zlib.crc32(body) & 0xFFFFFFFF
+        )
+
+    row = b"\x00" + bytes(rgb) * size
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(row * size))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _write_photos(count: int, rnd: random.Random) -> list[str]:
+    photos_dir = Path(settings.media_root) / "photos"
+    photos_dir.mkdir(parents=True, exist_ok=True)
+    urls = []
+    for i in range(count):
+        name = f"gen_{i:05d}.png"
+        path = photos_dir / name
+        if not path.exists():
+            rgb = (rnd.randrange(256), rnd.randrange(256), rnd.randrange(256))
+            path.write_bytes(_placeholder_png(rgb))
+        urls.append(f"/media/photos/{name}")
+    return urls
+
+
+# статусы по возрасту заявки: свежие ещё не разобраны, старые почти все закрыты
+_STATUS_NAMES = ("NEW", "IN_REVIEW", "REJECTED", "ACCEPTED")
+_STATUS_CUM_WEIGHTS = (
+    (3, (0.70, 0.95, 0.98, 1.0)),
+    (30, (0.20, 0.50, 0.85, 1.0)),
+    (None, (0.02, 0.05, 0.75, 1.0)),
+)
+
+
+def _status_name(age_days: float, r: float) -> str:
+    for max_age, cum in _STATUS_CUM_WEIGHTS:
+        if max_age is None or age_days < max_age:
+            for name, bound in zip(_STATUS_NAMES, cum):
+                if r < bound:
+                    return name
+    return _STATUS_NAMES[-1]
+
+
+def _candidate_lines(first_tg: int, count: int, rnd: random.Random) -> Iterator[str]:
+    names = [n.lower().replace("'", "") for n in MALE_NAMES + FEMALE_NAMES]
+    for i in range(count):
+        username = r"\N"
+        if rnd.random() < 0.7:
+            username = f"{rnd.choice(names)}_{rnd.randrange(10, 99999)}"
+        yield f"{first_tg + i}\t{username}\n"
+
+
+def _application_lines(
+    count: int,
+    candidate_ids: tuple[int, int],
+    vacancy_ids: list[int],
+    photo_urls: list[str],
+    photo_ratio: float,
+    now: datetime,
+    months: int,
+    rnd: random.Random,
+) -> Iterator[str]:
+    """
+    Строки COPY (text format) в порядке APPLICATION_COLUMNS.
+
+    Горячий цикл: значения берутся из заранее собранных пулов одним
+    random() на поле — на 10M строк это основная часть времени.
+    Все строки пулов без табов, переводов строк и обратных слэшей,
+    поэтому экранирование не нужно.
+    """
+    r = rnd.random
+    male = [f"{s} {n}\tMALE" for s in SURNAMES for n in MALE_NAMES]
+    female = [f"{s}a {n}\tFEMALE" for s in SURNAMES for n in FEMALE_NAMES]
+    nationalities = [n for n, w in NATIONALITIES for _ in range(w)]
+    addresses = [f"{c}, {s}" for c in CITIES for s in STREETS]
+    births = [
+        date(now.year - 18 - i // 336, i // 28 % 12 + 1, i % 28 + 1).isoformat()
+        for i in range(28 * 12 * 28)
+    ]
+    jobs = [
+        f"{j}\t{d}\t{reason}"
+        for j in PREV_JOBS
+        for d in DURATIONS
+        for reason in LEAVE_REASONS
+    ]
+    facts = [
+        " ".join(rnd.sample(FACTS, rnd.randint(1, 4))) for _ in range(500)
+    ]
+    operators = (90, 91, 93, 94, 95, 97, 98, 99, 33, 88)
+    tail = [f"{s}\t{sal}" for s in SOURCES for sal in SALARIES]
+    vacancies = [str(v) for v in vacancy_ids]
+    photos = photo_urls or [r"\N"]
+
+    first_id, last_id = candidate_ids
+    id_span = last_id - first_id + 1
+    max_age = months * 30 * 86400
+    no_job = "\\N\t\\N\t\\N"
+
+    for _ in range(count):
+        person = male if r() < 0.55 else female
+        # больше заявок в последние месяцы
+        age = max_age * r() ** 2
+        created_at = now - timedelta(seconds=age)
+        phone = int(r() * 10_000_000)
+        photo = photos[int(r() * len(photos))] if r() < photo_ratio else r"\N"
+
+        yield (
+            f"{first_id + int(r() * id_span)}\t"
+            f"{vacancies[int(r() * len(vacancies))]}\t"
+            # full_name и gender (соседние в APPLICATION_COLUMNS)
+            f"{person[int(r() * len(person))]}\t"
+            f"+998 {operators[int(r() * 10)]} {phone // 10000:03d} "
+            f"{phone // 100 % 100:02d} {phone % 100:02d}\t"
+            f"{births[int(r() * len(births))]}\t"
+            f"{nationalities[int(r() * len(nationalities))]}\t"
+            f"{addresses[int(r() * len(addresses))]}, {int(r() * 120) + 1}-uy\t"
+            f"{jobs[int(r() * len(jobs))] if r() < 0.75 else no_job}\t"
+            f"{'t' if r() < 0.4 else 'f'}\t"
+            f"{tail[int(r() * len(tail))]}\t"
+            f"{facts[int(r() * len(facts))]}\t"
+            f"{photo}\t"
+            f"{_status_name(age / 86400, r())}\t"
+            f"{created_at}\n"
+        )
+
+
+def _init_worker() -> None:
+    # соединения пула родителя после fork не используем
+    engine.dispose(close=False)
+
+
+def _load_applications(
+    job: int,
+    count: int,
+    *,
+    candidate_ids: tuple[int, int],
+    vacancy_ids: list[int],
+    photo_urls: list[str],
+    photo_ratio: float,
+    now: datetime,
+    months: int,
+    batch_size: int,
+    seed: int | None,
+) -> int:
+    """Загружает count заявок пачками по batch_size (одна пачка — один COPY)."""
+    rnd = random.Random(None if seed is None else seed * 1000 + job)
+    for offset in range(0, count, batch_size):
+        n = min(batch_size, count - offset)
+        _copy(
+            "applications",
+            APPLICATION_COLUMNS,
+            _application_lines(
+                n,
+                candidate_ids,
+                vacancy_ids,
+                photo_urls,
+                photo_ratio,
+                now,
+                months,
+                rnd,
+            ),
+        )
+        print(f"[job {job}] applications: {offset + n}/{count}", flush=True)
+    return count
+
+
+def _seed_small_tables(employers: int, vacancies: int) -> list[int]:
+    """Работодатели и вакансии — их мало, обычные INSERT."""
+    db = SessionLocal()
+    try:
+        existing = db.scalar(
+            select(func.count()).select_from(Employer).where(
+                Employer.tg_user_id >= EMPLOYER_TG_BASE,
+                Employer.tg_user_id < CANDIDATE_TG_BASE,
+            )
+        )
+        for i in range(existing, employers):
+            db.add(
+                Employer(
+                    tg_user_id=EMPLOYER_TG_BASE + i,
+                    role=EmployerRole.OWNER if i == 0 else EmployerRole.RECRUITER,
+                    is_active=True,
+                )
+            )
+
+        have = db.scalar(select(func.count()).select_from(Vacancy))
+        for i in range(have, vacancies):
+            db.add(
+                Vacancy(
+                    title=VACANCY_TITLES[i % len(VACANCY_TITLES)],
+                    description="Test vakansiya (generate_data)",
+                    is_active=i % 5 != 4,
+                )
+            )
+        db.commit()
+        return list(db.scalars(select(Vacancy.id)))
+    finally:
+        db.close()
+
+
+def main() -> None:
+    """
+    Синтетические данные для нагрузочных проверок: кандидаты, заявки
+    во всех статусах за несколько лет, работодатели, вакансии и
+    фото-заглушки. Кандидаты и заявки грузятся через COPY пачками.
+
+    Пример: python -m app.scripts.generate_data --applications 10000000
+    """
+    parser = argparse.ArgumentParser(
+        description=main.__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--applications", type=int, default=100_000)
+    parser.add_argument(
+        "--candidates",
+        type=int,
+        default=None,
+        help="по умолчанию — applications // 2",
+    )
+    parser.add_argument("--employers", type=int, default=10)
+    parser.add_argument("--vacancies", type=int, default=20)
+    parser.add_argument("--months", type=int, default=36, help="глубина истории")
+    parser.add_argument("--photos", type=int, default=200, help="файлов-заглушек")
+    parser.add_argument("--photo-ratio", type=float, default=0.6)
+    parser.add_argument("--batch-size", type=int, default=200_000)
+    parser.add_argument("--jobs", type=int, default=1, help="параллельных COPY")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    now = datetime.now()
+    candidates = args.candidates or max(args.applications // 2, 1)
+    started = time.perf_counter()
+
+    vacancy_ids = _seed_small_tables(args.employers, args.vacancies)
+    photo_urls = _write_photos(args.photos, rnd)
+    ensure_partitions(since=(now - timedelta(days=args.months * 30)).date())
+
+    # кандидаты: продолжаем после уже сгенерированных
+    with engine.connect() as conn:
+        first_tg = conn.execute(
+            text(
+                "SELECT COALESCE(MAX(tg_user_id) + 1, :base) FROM candidates "
+                "WHERE tg_user_id >= :base"
+            ),
+            {"base": CANDIDATE_TG_BASE},
+        ).scalar()
+    for offset in range(0, candidates, args.batch_size):
+        n = min(args.batch_size, candidates - offset)
+        _copy(
+            "candidates",
+            ("tg_user_id", "tg_username"),
+            _candidate_lines(first_tg + offset, n, rnd),
+        )
+    with engine.connect() as conn:
+        candidate_ids = conn.execute(
+            text("SELECT MIN(id), MAX(id) FROM candidates WHERE tg_user_id >= :tg"),
+            {"tg": first_tg},
+        ).one()
+    print(f"candidates: {candidates} ({time.perf_counter() - started:.1f}s)")
+
+    load = partial(
+        _load_applications,
+        candidate_ids=tuple(candidate_ids),
+        vacancy_ids=vacancy_ids,
+        photo_urls=photo_urls,
+        photo_ratio=args.photo_ratio,
+        now=now,
+        months=args.months,
+        batch_size=args.batch_size,
+        seed=args.seed,
+    )
+    jobs = max(args.jobs, 1)
+    shares = [
+        args.applications // jobs + (i < args.applications % jobs)
+        for i in range(jobs)
+    ]
+    if jobs == 1:
+        load(0, shares[0])
+    else:
+        # каждый процесс — своё соединение и свой COPY, Postgres пишет параллельно
+        with ProcessPoolExecutor(jobs, initializer=_init_worker) as pool:
+            list(pool.map(load, range(jobs), shares))
+    print(f"applications: {args.applications} ({time.perf_counter() - started:.1f}s)")
+
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE candidates"))
+        conn.execute(text("ANALYZE applications"))
+    print(f"done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import sys
+
+from app.services.application_import import import_applications, notify_imported
+
+
+def main() -> None:
+    """
+    Импорт заявок из CSV (то же, что POST /api/admin/applications/import).
+    Ошибки по строкам печатаются в stderr, код выхода 1 — если были ошибки.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("path", help="CSV (UTF-8), разделитель , или ;")
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument(
+        "--no-notify",
+        action="store_true",
+        help="не отправлять работодателям сводное уведомление",
+    )
+    args = parser.parse_args()
+
+    with open(args.path, encoding="utf-8-sig", newline="") as f:
+        try:
+            report = import_applications(f, args.batch_size, args.dry_run)
+        except ValueError as exc:
+            sys.exit(str(exc))
+
+    for error in report.errors:
+        print(f"line {error.line}: {'; '.join(error.errors)}", file=sys.stderr)
+    if report.failed > len(report.errors):
+        print(f"... {report.failed - len(report.errors)} more", file=sys.stderr)
+
+    print(
+        f"rows: {report.total}, imported: {report.imported}, "
+        f"failed: {report.failed}{' (dry run)' if args.dry_run else ''}"
+    )
+    if not args.no_notify and not args.dry_run:
+        notify_imported(report.imported)
+    if report.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import argparse
+import logging
+
+from app.services.media_gc import collect_orphans, purge_rejected_photos
+
+
+def main() -> None:
+    """
+    Чистка media/photos: фото отклонённых заявок старше
+    MEDIA_RETENTION_REJECTED_DAYS и файлы, на которые нет ссылок в БД.
+    Запускать по cron в контейнере backend.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="только показать, что будет удалено",
+    )
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--skip-rejected", action="store_true")
+    parser.add_argument("--skip-orphans", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if not args.skip_rejected:
+        n = purge_rejected_photos(args.dry_run, args.batch_size)
+        print(f"rejected applications cleaned: {n}")
+    if not args.skip_orphans:
+        n = collect_orphans(args.dry_run, args.batch_size)
+        print(f"orphan files removed: {n}")
+
+
+if __name__ == "__main__":
+    main()
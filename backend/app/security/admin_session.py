@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from app.core.settings import settings
+from app.db.models import Employer, EmployerRole
+from app.db.session import SessionLocal
+from sqlalchemy import select
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AdminSession:
+    tg_user_id: int
+    role: EmployerRole
+    version: int
+    expires_at: int
+
+
+def _secret() -> bytes:
+    secret = settings.admin_session_secret or settings.internal_api_token
+    return secret.encode("utf-8")
+
+
+def _signature(payload: str) -> str:
+    digest = hmac.new(
+        key=_secret(),
+        msg=payload.encode("utf-8"),
+        digestmod=hashlib.sha256,
+    ).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+def issue_session_token(
+    tg_user_id: int,
+    role: EmployerRole,
+    version: int,
+    ttl: int | None = None,
+) -> tuple[str, AdminSession]:
+    """
+    Токен вида <tg_user_id>.<role>.<version>.<exp>.<hmac>.
+
+    Returns:
+        tuple: (token, AdminSession)
+    """
+    exp = int(time.time()) + (ttl or settings.admin_session_ttl_seconds)
+    payload = f"{tg_user_id}.{role.name}.{version}.{exp}"
+    session = AdminSession(tg_user_id, role, version, exp)
+    return f"{payload}.{_signature(payload)}", session
+
+
+class EmployerVersions:
+    """
+    tg_user_id -> (role, auth_version) активных работодателей.
+
+    Перечитывается целиком раз в settings.admin_session_refresh_seconds
+    (PeriodicJob), поэтому проверка токена не ходит в БД. Отозванный
+    токен перестаёт работать не позже, чем через этот интервал.
+
+    Кэш в каждом воркере свой: новый HR или токен после повторного входа
+    могут быть ему ещё неизвестны. Такой промах перечитывает одного
+    работодателя (reload) — для каждой пары (role, version) из токена не
+    чаще admin_session_reload_seconds.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._versions: dict[int, tuple[EmployerRole, int]] | None = None
+        # (tg_user_id, role, version) -> time.monotonic() последнего reload
+        self._reloaded_at: dict[tuple[int, EmployerRole, int], float] = {}
+
+    def refresh(self) -> None:
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(
+                    Employer.tg_user_id,
+                    Employer.role,
+                    Employer.auth_version,
+                ).where(Employer.is_active == True)  # noqa: E712
+            ).all()
+        finally:
+            db.close()
+        versions = {tg: (role, version) for tg, role, version in rows}
+        with self._lock:
+            self._versions = versions
+            self._reloaded_at.clear()
+
+    def reload(
+        self,
+        tg_user_id: int,
+        expected: tuple[EmployerRole, int],
+    ) -> tuple[EmployerRole, int] | None:
+        """
+        Перечитывает одного работодателя и обновляет его запись в кэше.
+        Повтор для того же expected чаще admin_session_reload_seconds —
+        отдаёт закэшированное (отозванный токен не ходит в БД на каждый
+        запрос).
+        """
+        key = (tg_user_id, *expected)
+        now = time.monotonic()
+        with self._lock:
+            last = self._reloaded_at.get(key)
+            interval = settings.admin_session_reload_seconds
+            if last is not None and now - last < interval:
+                return self._versions.get(tg_user_id)
+            self._reloaded_at[key] = now
+
+        db = SessionLocal()
+        try:
+            row = db.execute(
+                select(Employer.role, Employer.auth_version).where(
+                    Employer.tg_user_id == tg_user_id,
+                    Employer.is_active == True,  # noqa: E712
+                )
+            ).first()
+        finally:
+            db.close()
+        current = (row.role, row.auth_version) if row is not None else None
+        with self._lock:
+            if current is None:
+                self._versions.pop(tg_user_id, None)
+            else:
+                self._versions[tg_user_id] = current
+        return current
+
+    def get(self, tg_user_id: int) -> tuple[EmployerRole, int] | None:
+        if self._versions is None:
+            # первый запрос до первого прохода планировщика
+            self.refresh()
+        return self._versions.get(tg_user_id)
+
+
+employer_versions = EmployerVersions()
+
+
+def verify_session_token(token: str) -> AdminSession:
+    """
+    Проверяет токен по кэшу версий; в БД — только при промахе кэша.
+
+    Raises:
+        ValueError: токен битый, просрочен или отозван
+    """
+    try:
+        payload, sig = token.rsplit(".", 1)
+        tg_raw, role_raw, version_raw, exp_raw = payload.split(".")
+        session = AdminSession(
+            tg_user_id=int(tg_raw),
+            role=EmployerRole[role_raw],
+            version=int(version_raw),
+            expires_at=int(exp_raw),
+        )
+    except (ValueError, KeyError):
+        raise ValueError("session token is malformed") from None
+
+    if not hmac.compare_digest(_signature(payload), sig):
+        raise ValueError("session token signature is invalid")
+    if session.expires_at < time.time():
+        raise ValueError("session token expired")
+
+    expected = (session.role, session.version)
+    current = employer_versions.get(session.tg_user_id)
+    if current != expected:
+        # кэш воркера мог отстать: новый HR, повторный вход после выхода
+        current = employer_versions.reload(session.tg_user_id, expected)
+    if current != expected:
+        raise ValueError("session revoked")
+    return session
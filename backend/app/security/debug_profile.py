@@ -0,0 +1,40 @@
+import hashlib
+import hmac
+import time
+
+from app.core.settings import settings
+
+# запрос с этим заголовком профилируется (services/profiling.py)
+DEBUG_PROFILE_HEADER = "X-Debug-Profile"
+
+
+def _secret() -> bytes:
+    return (settings.profiling_secret or settings.internal_api_token).encode("utf-8")
+
+
+def _signature(exp: int) -> str:
+    return hmac.new(
+        key=_secret(),
+        msg=f"profile:{exp}".encode("utf-8"),
+        digestmod=hashlib.sha256,
+    ).hexdigest()
+
+
+def sign_debug_profile(ttl: int) -> str:
+    """
+    Значение заголовка X-Debug-Profile: "<exp>.<sig>". Проверяется без
+    состояния — работает в любом воркере, пока не истёк.
+    """
+    exp = int(time.time()) + ttl
+    return f"{exp}.{_signature(exp)}"
+
+
+def verify_debug_profile(value: str) -> bool:
+    exp, _, sig = value.partition(".")
+    try:
+        exp_ts = int(exp)
+    except ValueError:
+        return False
+    if exp_ts < time.time():
+        return False
+    return hmac.compare_digest(_signature(exp_ts), sig)
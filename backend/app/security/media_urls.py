@@ -0,0 +1,41 @@
+import hashlib
+import hmac
+import time
+from urllib.parse import urlencode
+
+from app.core.settings import settings
+
+
+def _secret() -> bytes:
+    return (settings.media_url_secret or settings.internal_api_token).encode("utf-8")
+
+
+def _signature(path: str, exp: int) -> str:
+    return hmac.new(
+        key=_secret(),
+        msg=f"{path}:{exp}".encode("utf-8"),
+        digestmod=hashlib.sha256,
+    ).hexdigest()
+
+
+def sign_media_path(path: str, ttl: int | None = None) -> str:
+    """
+    Короткоживущая ссылка на файл из media (например, для Telegram,
+    который сам скачивает фото по URL).
+
+    Args:
+        path: путь вида /media/photos/<file>
+        ttl: время жизни ссылки в секундах
+
+    Returns:
+        str: путь с ?exp=...&sig=...
+    """
+    exp = int(time.time()) + (ttl or settings.media_url_ttl_seconds)
+    query = urlencode({"exp": exp, "sig": _signature(path, exp)})
+    return f"{path}?{query}"
+
+
+def verify_media_signature(path: str, exp: int, sig: str) -> bool:
+    if exp < time.time():
+        return False
+    return hmac.compare_digest(_signature(path, exp), sig)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Callable
+
+from app.core.settings import settings
+from fastapi import Depends, HTTPException, Request
+
+try:  # общий backend для нескольких воркеров — опционально
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+
+_UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_limit(raw: str) -> tuple[int, int]:
+    """
+    "5/minute" -> (5, 60)
+    """
+    count, _, unit = raw.partition("/")
+    unit = unit.strip().rstrip("s")
+    if unit not in _UNITS:
+        raise ValueError(f"unknown rate limit unit in {raw!r}")
+    return int(count), _UNITS[unit]
+
+
+class MemoryStore:
+    """
+    Счётчики в памяти процесса. В каждом uvicorn-воркере свои,
+    поэтому реальный лимит = лимит * число воркеров.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = {}
+        self._expires: dict[str, float] = {}
+        self._next_prune = 0.0
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key: str, ttl: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            self._expires[key] = now + ttl
+            if now >= self._next_prune:
+                self._prune(now)
+                self._next_prune = now + 60
+
+    def _prune(self, now: float) -> None:
+        stale = [k for k, exp in self._expires.items() if exp <= now]
+        for key in stale:
+            self._counters.pop(key, None)
+            self._expires.pop(key, None)
+
+
+class RedisStore:
+    """
+    Счётчики в Redis — общий лимит для всех воркеров и инстансов.
+    """
+
+    def __init__(self, url: str) -> None:
+        if redis is None:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL is set but redis is not installed")
+        self._client = redis.Redis.from_url(url, socket_timeout=0.2)
+
+    def get(self, key: str) -> int:
+        return int(self._client.get(key) or 0)
+
+    def incr(self, key: str, ttl: int) -> None:
+        pipe = self._client.pipeline()
+        pipe.incr(key)
+        pipe.expire(key, ttl)
+        pipe.execute()
+
+
+class SlidingWindowLimiter:
+    """
+    Sliding window counter: текущее окно + остаток предыдущего,
+    взвешенный по тому, какая его часть ещё попадает в окно.
+    Память — два счётчика на ключ.
+    """
+
+    def __init__(self, store: MemoryStore | RedisStore) -> None:
+        self.store = store
+
+    @staticmethod
+    def _keys(key: str, window: int, now: float) -> tuple[str, str, float]:
+        bucket = int(now // window)
+        return (
+            f"rl:{key}:{window}:{bucket}",
+            f"rl:{key}:{window}:{bucket - 1}",
+            now - bucket * window,
+        )
+
+    def retry_after(self, key: str, limit: int, window: int) -> int:
+        """
+        0, если запрос укладывается в лимит,
+        иначе — через сколько секунд повторить.
+        """
+        current_key, previous_key, elapsed = self._keys(key, window, time.time())
+        previous = self.store.get(previous_key)
+        current = self.store.get(current_key)
+
+        estimated = previous * (1 - elapsed / window) + current
+        if estimated < limit:
+            return 0
+
+        if current >= limit or previous == 0:
+            # текущее окно уже забито — ждём следующее
+            return max(1, math.ceil(window - elapsed))
+        # ждём, пока "хвост" предыдущего окна уйдёт настолько,
+        # чтобы освободилось место
+        excess = estimated - limit + 1
+        return max(1, math.ceil(excess / previous * window))
+
+    def record(self, key: str, window: int) -> None:
+        current_key, _, _ = self._keys(key, window, time.time())
+        self.store.incr(current_key, ttl=window * 2)
+
+
+def _build_limiter() -> SlidingWindowLimiter:
+    if settings.rate_limit_redis_url:
+        return SlidingWindowLimiter(RedisStore(settings.rate_limit_redis_url))
+    return SlidingWindowLimiter(MemoryStore())
+
+
+limiter = _build_limiter()
+
+
+def client_ip(request: Request) -> str:
+    # за nginx uvicorn запущен с --proxy-headers и доверяет X-Forwarded-For
+    # только адресу nginx (FORWARDED_ALLOW_IPS), client.host — реальный IP
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit(route: str, user_dependency: Callable[..., int]):
+    """
+    Dependency: лимит по проверенному tg_user_id и по IP клиента.
+
+    Лимиты берутся из settings.rate_limits[route], например
+    {"user": "5/minute", "ip": "30/minute"}. Ставится в dependencies
+    эндпоинта, чтобы отработать до любой работы с БД.
+    """
+
+    def dependency(
+        request: Request,
+        tg_user_id: int = Depends(user_dependency),
+    ) -> None:
+        limits = settings.rate_limits.get(route, {})
+        subjects = {
+            "user": str(tg_user_id),
+            "ip": client_ip(request),
+        }
+
+        checks = []
+        for kind, raw in limits.items():
+            if kind not in subjects:
+                continue
+            limit, window = parse_limit(raw)
+            checks.append((f"{route}:{kind}:{subjects[kind]}", limit, window))
+
+        # сначала проверяем все лимиты, засчитываем — только если прошли все
+        retry_after = max(
+            (limiter.retry_after(key, limit, window) for key, limit, window in checks),
+            default=0,
+        )
+        if retry_after:
+            raise HTTPException(
+                status_code=429,
+                detail="too many requests",
+                headers={"Retry-After": str(retry_after)},
+            )
+        for key, _, window in checks:
+            limiter.record(key, window)
+
+    return dependency
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import csv
+import itertools
+import logging
+import re
+from datetime import date, timedelta
+from typing import Iterable
+
+from app.core.settings import settings
+from app.db.models import Application, ApplicationStatus, Candidate, Vacancy
+from app.db.partitions import ensure_partitions
+from app.db.session import SessionLocal
+from app.schemas.applications import (
+    ApplicationImportError,
+    ApplicationImportReport,
+    ApplicationImportRow,
+)
+from app.services.digest import instant_employer_ids
+from app.services.notifications import notification_queue
+from app.services.telegram import send_plain_message
+from pydantic import ValidationError
+from sqlalchemy import DateTime, bindparam, func, insert, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VACANCY_TITLE = "Umumiy ariza"
+
+# сколько ошибок по строкам возвращать в отчёте
+MAX_REPORTED_ERRORS = 1000
+
+REQUIRED_COLUMNS = ("full_name", "phone")
+
+_IMPORT_FIELDS = tuple(
+    name
+    for name in ApplicationImportRow.model_fields
+    if name not in ("tg_user_id", "created_at")
+)
+
+# created_at не задан — как у заявок из WebApp, время БД
+_insert_applications = insert(Application.__table__).values(
+    created_at=func.coalesce(
+        bindparam("created_at_in", type_=DateTime),
+        func.localtimestamp(),
+    )
+)
+
+
+def default_vacancy(db: Session) -> Vacancy:
+    """Вакансия по умолчанию («Umumiy ariza»), создаётся при первом обращении."""
+    vacancy = (
+        db.query(Vacancy)
+        .filter(
+            Vacancy.title == DEFAULT_VACANCY_TITLE,
+        )
+        .one_or_none()
+    )
+    if vacancy is None:
+        vacancy = Vacancy(
+            title=DEFAULT_VACANCY_TITLE,
+            description="Default application",
+        )
+        db.add(vacancy)
+        db.flush()
+    return vacancy
+
+
+def phone_key(phone: str) -> str:
+    """Телефон для сопоставления кандидатов без Telegram: только цифры."""
+    return re.sub(r"\D", "", phone)
+
+
+def _clean(row: dict) -> dict:
+    # пустые ячейки — «нет значения», лишние колонки без заголовка — мимо
+    return {
+        key.strip().lower(): value.strip()
+        for key, value in row.items()
+        if key is not None and isinstance(value, str) and value.strip()
+    }
+
+
+def _fail(report: ApplicationImportReport, line: int, errors: list[str]) -> None:
+    report.failed += 1
+    if len(report.errors) < MAX_REPORTED_ERRORS:
+        report.errors.append(ApplicationImportError(line=line, errors=errors))
+
+
+def _candidate_ids(db: Session, rows: list[ApplicationImportRow]) -> dict:
+    """
+    Upsert кандидатов пачки. Ключ — tg_user_id, для кандидатов без
+    Telegram — телефон. Возвращает {ключ: candidate_id}.
+    """
+    table = Candidate.__table__
+    ids: dict = {}
+
+    tg_ids = sorted({r.tg_user_id for r in rows if r.tg_user_id is not None})
+    if tg_ids:
+        stmt = pg_insert(table).values([{"tg_user_id": t} for t in tg_ids])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["tg_user_id"],
+            set_={"tg_user_id": stmt.excluded.tg_user_id},
+        ).returning(table.c.id, table.c.tg_user_id)
+        ids.update({("tg", tg): cid for cid, tg in db.execute(stmt)})
+
+    phones = sorted({phone_key(r.phone) for r in rows if r.tg_user_id is None})
+    if phones:
+        stmt = pg_insert(table).values([{"phone": p} for p in phones])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["phone"],
+            index_where=text("tg_user_id IS NULL"),
+            set_={"phone": stmt.excluded.phone},
+        ).returning(table.c.id, table.c.phone)
+        ids.update({("phone", phone): cid for cid, phone in db.execute(stmt)})
+
+    return ids
+
+
+def _ensure_past_partitions(
+    rows: list[ApplicationImportRow],
+    covered_since: date,
+) -> date:
+    """
+    Партиции для исторических created_at пачки. Иначе строки лягут в
+    applications_default, и CREATE партиции этого месяца потом упадёт.
+    Возвращает первый месяц, с которого партиции уже есть.
+    """
+    dates = [row.created_at.date() for row in rows if row.created_at is not None]
+    if not dates or min(dates) >= covered_since:
+        return covered_since
+    # запас в сутки: created_at с часовым поясом БД переведёт в свой
+    since = (min(dates) - timedelta(days=1)).replace(day=1)
+    ensure_partitions(since=since)
+    return since
+
+
+def _flush(
+    db: Session,
+    batch: list[tuple[int, ApplicationImportRow]],
+    vacancy_id: int,
+    report: ApplicationImportReport,
+    dry_run: bool,
+) -> None:
+    rows = [row for _, row in batch]
+    # пачка — savepoint: ошибка БД откатывает только её, dry_run — каждую
+    savepoint = db.begin_nested()
+    try:
+        candidates = _candidate_ids(db, rows)
+        params = []
+        for row in rows:
+            key = (
+                ("tg", row.tg_user_id)
+                if row.tg_user_id is not None
+                else ("phone", phone_key(row.phone))
+            )
+            values = {name: getattr(row, name) for name in _IMPORT_FIELDS}
+            values.update(
+                candidate_id=candidates[key],
+                vacancy_id=vacancy_id,
+                status=ApplicationStatus.NEW,
+                created_at_in=row.created_at,
+            )
+            params.append(values)
+        # один executemany — psycopg2 собирает многострочные INSERT
+        db.execute(_insert_applications, params)
+    except DBAPIError as exc:
+        savepoint.rollback()
+        logger.exception("import batch failed")
+        message = f"db: {exc.orig.__class__.__name__ if exc.orig else exc}"
+        for line, _ in batch:
+            _fail(report, line, [message])
+        return
+
+    if dry_run:
+        savepoint.rollback()
+    else:
+        savepoint.commit()
+        db.commit()
+    report.imported += len(batch)
+
+
+def import_applications(
+    lines: Iterable[str],
+    batch_size: int | None = None,
+    dry_run: bool = False,
+) -> ApplicationImportReport:
+    """
+    Импорт заявок из CSV (заголовок — имена полей ApplicationImportRow,
+    разделитель «,» или «;»). Файл читается потоком, строки проверяются
+    схемой и пишутся пачками по batch_size: одна пачка — одна транзакция.
+
+    Ошибочные строки пропускаются и попадают в отчёт с номером строки.
+    Для прошлых месяцев из created_at партиции создаются до записи.
+    dry_run — всё проверить (включая БД) и откатить.
+    Уведомления работодателям здесь не отправляются — см. notify_imported().
+
+    Raises:
+        ValueError: не UTF-8, нет заголовка или обязательных колонок
+    """
+    if batch_size is None:
+        batch_size = settings.import_batch_size
+
+    lines = iter(lines)
+    try:
+        header = next(lines, "")
+    except UnicodeDecodeError:
+        raise ValueError("CSV must be UTF-8") from None
+    if not header.strip():
+        raise ValueError("CSV is empty")
+    delimiter = ";" if header.count(";") > header.count(",") else ","
+    reader = csv.DictReader(itertools.chain([header], lines), delimiter=delimiter)
+
+    columns = {c.strip().lower() for c in reader.fieldnames or [] if c}
+    missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+    if missing:
+        raise ValueError(f"CSV: missing columns {', '.join(missing)}")
+
+    report = ApplicationImportReport(dry_run=dry_run)
+    db = SessionLocal()
+    try:
+        vacancy_id = default_vacancy(db).id
+        if not dry_run:
+            db.commit()
+
+        batch: list[tuple[int, ApplicationImportRow]] = []
+        # с этого месяца партиции точно есть (ensure_partitions в lifespan)
+        partitions_since = date.today().replace(day=1)
+
+        def flush() -> None:
+            nonlocal partitions_since
+            if not dry_run:
+                partitions_since = _ensure_past_partitions(
+                    [row for _, row in batch], partitions_since
+                )
+            _flush(db, batch, vacancy_id, report, dry_run)
+
+        rows = iter(reader)
+        while True:
+            try:
+                raw = next(rows, None)
+            except UnicodeDecodeError:
+                # предыдущие пачки уже записаны — сообщаем, где остановились
+                _fail(report, reader.line_num + 1, ["CSV must be UTF-8"])
+                break
+            if raw is None:
+                break
+            report.total += 1
+            try:
+                row = ApplicationImportRow.model_validate(_clean(raw))
+            except ValidationError as exc:
+                _fail(
+                    report,
+                    reader.line_num,
+                    [
+                        f"{'.'.join(map(str, e['loc'])) or 'row'}: {e['msg']}"
+                        for e in exc.errors()
+                    ],
+                )
+                continue
+            if row.tg_user_id is None and len(phone_key(row.phone)) < 6:
+                # без Telegram кандидата узнаём только по телефону
+                _fail(report, reader.line_num, ["phone: not a phone number"])
+                continue
+            batch.append((reader.line_num, row))
+            if len(batch) >= batch_size:
+                flush()
+                batch = []
+        if batch:
+            flush()
+        if dry_run:
+            db.rollback()
+    finally:
+        db.close()
+
+    logger.info(
+        "import%s: %s rows, %s imported, %s failed",
+        " (dry run)" if dry_run else "",
+        report.total,
+        report.imported,
+        report.failed,
+    )
+    return report
+
+
+def notify_imported(imported: int) -> None:
+    """
+    Одно сводное сообщение instant-работодателям вместо уведомления
+    на каждую заявку. Digest-работодатели увидят новые заявки в сводке.
+    """
+    if imported <= 0:
+        return
+    db = SessionLocal()
+    try:
+        chat_ids = instant_employer_ids(db)
+    finally:
+        db.close()
+
+    message = f"📥 Import: {imported} ta yangi ariza qo'shildi"
+    for chat_id in chat_ids:
+        if notification_queue.running():
+            notification_queue.submit(
+                send_plain_message,
+                settings.bot_token,
+                chat_id,
+                message,
+            )
+            continue
+        # CLI: очереди нет, шлём сразу
+        try:
+            send_plain_message(settings.bot_token, chat_id, message)
+        except Exception:
+            logger.exception("import summary to %s failed", chat_id)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from app.schemas.admin import LIST_FIELDS, SUMMARY_FIELDS
+from sqlalchemy import ColumnElement, FromClause
+
+# fields= у списков заявок:
+# full — AdminApplicationListOut, summary — AdminApplicationSummaryOut
+ListFields = Literal["full", "summary"]
+
+
+def list_columns(
+    src: FromClause,
+    fields: ListFields = "full",
+) -> tuple[list[ColumnElement], tuple[str, ...]]:
+    """
+    Колонки для select() списка и имена полей ответа в том же порядке.
+
+    summary покрывается индексом ix_applications_summary
+    (status, created_at) INCLUDE (id, full_name, photo_url).
+    """
+    if fields == "summary":
+        columns = [
+            src.c.id,
+            src.c.full_name,
+            src.c.status,
+            src.c.created_at,
+            src.c.photo_url.is_not(None),
+        ]
+        return columns, SUMMARY_FIELDS
+    return [src.c[name] for name in LIST_FIELDS], LIST_FIELDS
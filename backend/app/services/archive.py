@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+
+from app.core.settings import settings
+from app.db.models import Application, ApplicationArchive, ApplicationStatus
+from app.db.session import engine
+from sqlalchemy import FromClause, select, text, union_all
+
+logger = logging.getLogger(__name__)
+
+# в архив уезжают только закрытые заявки
+CLOSED_STATUSES = (ApplicationStatus.ACCEPTED, ApplicationStatus.REJECTED)
+
+# DELETE из партиций и INSERT в архив одним запросом: строка либо
+# в горячей таблице, либо в архиве. SKIP LOCKED — чтобы параллельные
+# воркеры брали разные пачки.
+_ARCHIVE_BATCH_SQL = text(
+    """
+    WITH moved AS (
+        DELETE FROM applications a
+        WHERE (a.id, a.created_at) IN (
+            SELECT id, created_at
+            FROM applications
+            WHERE status IN ({statuses})
+              AND created_at < localtimestamp - make_interval(days => :days)
+            ORDER BY created_at
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING a.*
+    )
+    INSERT INTO applications_archive SELECT * FROM moved
+    """.format(statuses=", ".join(f"'{s.name}'" for s in CLOSED_STATUSES))
+)
+
+
+def local_naive(value: datetime) -> datetime:
+    """
+    Время из запроса (может быть с часовым поясом: ...Z) — в локальное
+    без пояса, как created_at в БД и archive_cutoff().
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def archive_cutoff() -> datetime:
+    """Заявки старше этой даты могут лежать в архиве."""
+    return datetime.now() - timedelta(days=settings.archive_after_days)
+
+
+def archive_closed_applications(batch_size: int | None = None) -> int:
+    """
+    Переносит закрытые заявки старше settings.archive_after_days
+    в applications_archive пачками. Возвращает число перенесённых.
+    """
+    if batch_size is None:
+        batch_size = settings.archive_batch_size
+
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            moved = conn.execute(
+                _ARCHIVE_BATCH_SQL,
+                {"days": settings.archive_after_days, "batch_size": batch_size},
+            ).rowcount
+        total += moved
+        if moved < batch_size:
+            break
+
+    if total:
+        logger.info("archived %s applications", total)
+    return total
+
+
+def application_source(
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    status: ApplicationStatus | None = None,
+) -> FromClause:
+    """
+    Откуда читать список заявок.
+
+    Без фильтров (текущие заявки) — только горячая applications. Архив
+    добавляется через UNION ALL, если статус может быть закрытым и
+    запрошен закрытый статус или период, захватывающий время до границы
+    архивации (в том числе только created_to). Колонки у обеих таблиц
+    одинаковые.
+    """
+    hot = Application.__table__
+    if status is not None and status not in CLOSED_STATUSES:
+        return hot
+    if status is None and created_from is None and created_to is None:
+        return hot
+    # запас в сутки: граница архивации сдвигается, пока идёт запрос
+    hot_only_since = archive_cutoff() + timedelta(days=1)
+    if created_from is not None and local_naive(created_from) >= hot_only_since:
+        return hot
+
+    return union_all(
+        select(hot),
+        select(ApplicationArchive.__table__),
+    ).subquery("applications")
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+
+from app.core.settings import settings
+from app.db.models import Application, Employer, NotificationMode
+from app.db.session import SessionLocal
+from app.services.notifications import notification_queue
+from app.services.telegram import send_digest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# сколько заявок показываем в сводке кнопками
+DIGEST_ITEMS = 10
+
+
+def instant_employer_ids(db: Session) -> list[int]:
+    """
+    tg_user_id работодателей, которым события шлём сразу.
+    Остальные получат их в сводке.
+    """
+    return list(
+        db.scalars(
+            select(Employer.tg_user_id).where(
+                Employer.is_active == True,  # noqa: E712
+                Employer.notification_mode == NotificationMode.INSTANT,
+            )
+        )
+    )
+
+
+def _interval(emp: Employer) -> timedelta:
+    if emp.notification_mode == NotificationMode.HOURLY:
+        return timedelta(hours=1)
+    return timedelta(minutes=max(emp.digest_interval_minutes, 1))
+
+
+def _format_digest(total: int, rows: list, since: datetime) -> str:
+    parts = [f"🗂 Yangi arizalar: {total} ta ({since.strftime('%H:%M')} dan beri)"]
+    for app_id, full_name, photo_url in rows:
+        mark = " 📸" if photo_url else ""
+        parts.append(f"#{app_id} — {full_name}{mark}")
+    if total > len(rows):
+        parts.append(f"… va yana {total - len(rows)} ta")
+    return "\n".join(parts)
+
+
+def run_digests() -> int:
+    """
+    Один проход планировщика: каждому digest-работодателю, у которого
+    подошёл срок, ставит в очередь одно сводное сообщение.
+
+    Число сообщений зависит только от числа работодателей и интервала,
+    а не от того, сколько заявок пришло. Возвращает число сводок.
+    """
+    db = SessionLocal()
+    sends = []
+    try:
+        # время БД: created_at тоже ставится на стороне БД
+        now = db.scalar(select(func.localtimestamp()))
+
+        # SKIP LOCKED: если сводку этому работодателю уже собирает другой
+        # воркер — пропускаем, дублей не будет
+        employers = db.scalars(
+            select(Employer)
+            .where(
+                Employer.is_active == True,  # noqa: E712
+                Employer.notification_mode != NotificationMode.INSTANT,
+            )
+            .with_for_update(skip_locked=True)
+        ).all()
+
+        for emp in employers:
+            since = emp.last_digest_at
+            if since is None:
+                # только что переключился на сводки — считаем с этого момента
+                emp.last_digest_at = now
+                continue
+            if since + _interval(emp) > now:
+                continue
+
+            window = (Application.created_at > since) & (
+                Application.created_at <= now
+            )
+            total = db.scalar(select(func.count(Application.id)).where(window))
+            if total:
+                rows = db.execute(
+                    select(Application.id, Application.full_name, Application.photo_url)
+                    .where(window)
+                    .order_by(Application.created_at.desc())
+                    .limit(DIGEST_ITEMS)
+                ).all()
+                sends.append(
+                    (
+                        emp.tg_user_id,
+                        _format_digest(total, rows, since),
+                        [r.id for r in rows],
+                        total > len(rows),
+                    )
+                )
+            emp.last_digest_at = now
+
+        db.commit()
+    finally:
+        db.close()
+
+    # отправляем только после commit — иначе при откате будет дубль
+    for chat_id, text, app_ids, has_more in sends:
+        notification_queue.submit(
+            send_digest,
+            settings.bot_token,
+            chat_id,
+            text,
+            app_ids,
+            has_more,
+        )
+
+    if sends:
+        logger.info("digest: queued %s summaries", len(sends))
+    return len(sends)
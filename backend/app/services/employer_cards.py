@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+
+from app.core.settings import settings
+from app.db.models import Application, ApplicationStatus, SentMessage
+from app.db.session import SessionLocal
+from app.security.media_urls import sign_media_path
+from app.services.digest import instant_employer_ids
+from app.services.notifications import notification_queue
+from app.services.telegram import (
+    TelegramBadRequest,
+    edit_message_caption,
+    edit_message_media,
+    edit_message_text,
+    send_message,
+    send_photo,
+)
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+STATUS_TITLES = {
+    ApplicationStatus.NEW: "🆕 Yangi ariza",
+    ApplicationStatus.IN_REVIEW: "🕒 Ko‘rib chiqilmoqda — ariza",
+    ApplicationStatus.ACCEPTED: "✅ Qabul qilindi — ariza",
+    ApplicationStatus.REJECTED: "❌ Rad etildi — ariza",
+}
+
+
+def card_text(app: Application, photo_note: bool = False) -> str:
+    """
+    Текст карточки заявки для работодателя. Заголовок — текущий статус,
+    photo_note — у текстовой карточки появилось фото (видно по «Ko‘rish»).
+    """
+    parts = [
+        f"{STATUS_TITLES.get(app.status, '🆕 Yangi ariza')} #{app.id}",
+        f"👤 F.I.SH: {app.full_name}",
+        f"📞 Telefon: {app.phone}",
+    ]
+
+    if app.birth_date:
+        parts.append(
+            f"🎂 Tug‘ilgan sana: {app.birth_date.strftime('%d.%m.%Y')}",
+        )
+    if app.nationality:
+        parts.append(f"🌍 Millat: {app.nationality}")
+    if app.address:
+        parts.append(f"📍 Manzil: {app.address}")
+    if app.gender:
+        parts.append(
+            f"🚻 Jins: {app.gender.value if hasattr(app.gender, 'value') else app.gender}"
+        )
+
+    if app.prev_job:
+        parts.append(f"🏢 Oldin ishlagan joy: {app.prev_job}")
+    if app.prev_job_duration:
+        parts.append(f"⏳ Ish muddati: {app.prev_job_duration}")
+    if app.prev_job_leave_reason:
+        parts.append(f"📌 Nega bo‘shagan: {app.prev_job_leave_reason}")
+
+    parts.append(f"💍 Oilali: {'Ha' if app.is_married else 'Yo‘q'}")
+
+    if app.source:
+        parts.append(f"🔎 Qayerdan bildi: {app.source}")
+    if app.desired_salary:
+        parts.append(f"💰 Istagan maosh: {app.desired_salary}")
+    if app.why_hire_facts:
+        parts.append(f"⭐ Nega ishga olish kerak: {app.why_hire_facts}")
+    if photo_note:
+        parts.append("📸 Rasm yuklandi")
+
+    parts.append("\nBot orqali ko‘rish: HR menyu → Arizalar")
+    return "\n".join(parts)
+
+
+def _public_photo(photo_url: str) -> str:
+    # media закрыта — Telegram скачивает фото по подписанной ссылке
+    return f"{settings.backend_url}{sign_media_path(photo_url)}"
+
+
+def notify_new_application(db: Session, app: Application) -> None:
+    """
+    Карточка новой заявки instant-работодателям: одно сообщение на
+    работодателя (фото с анкетой в подписи или текст). Отправленные
+    сообщения запоминаются, дальше карточка правится на месте.
+    """
+    text = card_text(app)
+    for emp_tg_id in instant_employer_ids(db):
+        notification_queue.submit(
+            send_card,
+            settings.bot_token,
+            emp_tg_id,
+            app.id,
+            text,
+            app.photo_url,
+        )
+
+
+def send_card(
+    bot_token: str,
+    chat_id: int,
+    application_id: int,
+    text: str,
+    photo_url: str | None = None,
+) -> None:
+    """Задача очереди: отправить карточку и записать её в реестр."""
+    if photo_url:
+        message_id = send_photo(
+            bot_token,
+            chat_id,
+            _public_photo(photo_url),
+            text,
+            application_id,
+        )
+    else:
+        message_id = send_message(bot_token, chat_id, text, application_id)
+
+    db = SessionLocal()
+    try:
+        db.add(
+            SentMessage(
+                application_id=application_id,
+                employer_tg_id=chat_id,
+                chat_id=chat_id,
+                message_id=message_id,
+                photo_url=photo_url,
+                expires_at=func.localtimestamp()
+                + timedelta(hours=settings.employer_card_ttl_hours),
+            )
+        )
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+    finally:
+        db.close()
+
+
+def schedule_refresh(application_id: int) -> None:
+    """
+    Поправить карточки заявки у всех работодателей. Несколько смен
+    статуса подряд схлопываются в одну правку с последним состоянием.
+    """
+    notification_queue.submit(
+        refresh_cards,
+        application_id,
+        key=("card", application_id),
+        delay=settings.employer_card_refresh_delay,
+        max_delay=settings.employer_card_refresh_max_delay,
+    )
+
+
+def _edit(row: SentMessage, app: Application) -> None:
+    if row.photo_url is None:
+        # в текстовое сообщение фото не добавить — только отметка
+        edit_message_text(
+            settings.bot_token,
+            row.chat_id,
+            row.message_id,
+            card_text(app, photo_note=app.photo_url is not None),
+            app.id,
+        )
+    elif app.photo_url and app.photo_url != row.photo_url:
+        edit_message_media(
+            settings.bot_token,
+            row.chat_id,
+            row.message_id,
+            _public_photo(app.photo_url),
+            card_text(app),
+            app.id,
+        )
+        row.photo_url = app.photo_url
+    else:
+        edit_message_caption(
+            settings.bot_token,
+            row.chat_id,
+            row.message_id,
+            card_text(app),
+            app.id,
+        )
+
+
+def refresh_cards(application_id: int) -> int:
+    """
+    Задача очереди: ставит правку каждой запомненной карточки заявки
+    отдельной задачей, с шагом employer_card_edit_interval. Поток очереди
+    не спит между правками — остальные задачи идут своим чередом.
+
+    Returns:
+        int: сколько правок поставлено
+    """
+    db = SessionLocal()
+    try:
+        if db.get(Application, application_id) is None:
+            # заявка уехала в архив
+            return 0
+        row_ids = db.scalars(
+            select(SentMessage.id)
+            .where(
+                SentMessage.application_id == application_id,
+                SentMessage.expires_at > func.localtimestamp(),
+            )
+            .order_by(SentMessage.id)
+        ).all()
+    finally:
+        db.close()
+
+    for i, row_id in enumerate(row_ids):
+        notification_queue.submit(
+            edit_card,
+            row_id,
+            key=("card-edit", row_id),
+            delay=i * settings.employer_card_edit_interval,
+        )
+    return len(row_ids)
+
+
+def edit_card(row_id: int) -> bool:
+    """
+    Задача очереди: правит одну карточку под текущий статус и фото
+    заявки. 429 очередь повторит через retry_after.
+
+    Returns:
+        bool: сообщение изменено
+    """
+    db = SessionLocal()
+    try:
+        row = db.get(SentMessage, row_id)
+        if row is None:
+            return False
+        app = db.get(Application, row.application_id)
+        if app is None:
+            return False
+        try:
+            _edit(row, app)
+        except TelegramBadRequest as exc:
+            if "not modified" in exc.description:
+                return False
+            # сообщение удалено или чат недоступен — больше не трогаем
+            logger.warning("card %s: %s", row.message_id, exc)
+            db.delete(row)
+            return False
+        finally:
+            db.commit()
+        return True
+    finally:
+        db.close()
+
+
+def prune_expired(batch_size: int = 5000) -> int:
+    """
+    Удаляет просроченные записи реестра пачками. Возвращает число удалённых.
+    """
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            ids = (
+                select(SentMessage.id)
+                .where(SentMessage.expires_at < func.localtimestamp())
+                .limit(batch_size)
+            )
+            deleted = db.execute(
+                delete(SentMessage.__table__).where(SentMessage.id.in_(ids))
+            ).rowcount
+            db.commit()
+            total += deleted
+            if deleted < batch_size:
+                return total
+    finally:
+        db.close()
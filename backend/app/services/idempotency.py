@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+
+from app.core.settings import settings
+from app.db.models import IdempotencyKey
+from app.db.session import SessionLocal
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+
+def get_replay(
+    db: Session,
+    tg_user_id: int,
+    scope: str,
+    key: str,
+) -> dict | None:
+    """
+    Сохранённый ответ для (tg_user_id, scope, key) или None.
+    Просроченную запись удаляет, чтобы ключ можно было использовать заново.
+    """
+    found = db.execute(
+        select(
+            IdempotencyKey,
+            (IdempotencyKey.expires_at <= func.localtimestamp()).label("expired"),
+        ).where(
+            IdempotencyKey.tg_user_id == tg_user_id,
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key == key,
+        )
+    ).one_or_none()
+    if found is None:
+        return None
+
+    row, expired = found
+    if expired:
+        db.delete(row)
+        db.flush()
+        return None
+
+    return json.loads(row.response_body)
+
+
+def remember(
+    db: Session,
+    tg_user_id: int,
+    scope: str,
+    key: str,
+    body: dict,
+) -> None:
+    """
+    Кладёт ответ в ту же транзакцию, что и сами изменения.
+    Параллельный дубль упадёт на уникальном индексе при commit.
+    """
+    db.add(
+        IdempotencyKey(
+            tg_user_id=tg_user_id,
+            scope=scope,
+            key=key,
+            response_body=json.dumps(body),
+            expires_at=func.localtimestamp()
+            + timedelta(hours=settings.idempotency_ttl_hours),
+        )
+    )
+
+
+def prune_expired(batch_size: int = 5000) -> int:
+    """
+    Удаляет просроченные ключи пачками. Возвращает число удалённых.
+    """
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            ids = (
+                select(IdempotencyKey.id)
+                .where(IdempotencyKey.expires_at < func.localtimestamp())
+                .limit(batch_size)
+            )
+            deleted = db.execute(
+                delete(IdempotencyKey.__table__).where(IdempotencyKey.id.in_(ids))
+            ).rowcount
+            db.commit()
+            total += deleted
+            if deleted < batch_size:
+                return total
+    finally:
+        db.close()
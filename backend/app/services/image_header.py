@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import struct
+from typing import BinaryIO
+
+# маркеры SOF: C0-CF, кроме DHT (C4), JPG (C8), DAC (CC)
+_JPEG_SOF = {m for m in range(0xC0, 0xD0)} - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_size(f: BinaryIO) -> tuple[int, int] | None:
+    # сегменты пропускаем по длине: EXIF, ICC и превью перед SOF не читаем
+    i = 2
+    while True:
+        f.seek(i)
+        seg = f.read(9)
+        if len(seg) < 4 or seg[0] != 0xFF:
+            return None
+        marker = seg[1]
+        if marker == 0xFF:  # заполнитель
+            i += 1
+            continue
+        if marker in (0x01, *range(0xD0, 0xD8)):  # без длины
+            i += 2
+            continue
+        if marker in _JPEG_SOF:
+            if len(seg) < 9:
+                return None
+            height, width = struct.unpack(">HH", seg[5:9])
+            return width, height
+        if marker == 0xDA:  # данные скана раньше SOF — битый файл
+            return None
+        (length,) = struct.unpack(">H", seg[2:4])
+        i += 2 + length
+
+
+def _webp_size(head: bytes) -> tuple[int, int] | None:
+    chunk = head[12:16]
+    if chunk == b"VP8 " and len(head) >= 30:
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and len(head) >= 25:
+        (bits,) = struct.unpack("<I", head[21:25])
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X" and len(head) >= 30:
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def image_type(head: bytes) -> str | None:
+    """Тип по сигнатуре (нужны первые 16 байт)."""
+    if head.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def image_info(f: BinaryIO) -> tuple[str, int, int] | None:
+    """
+    Тип и размер картинки по заголовку файла, без декодирования.
+
+    Args:
+        f: файл с позиционированием (открытый файл, BytesIO)
+
+    Returns:
+        tuple: (content_type, width, height) или None, если это не
+        jpg/png/webp или размер до конца файла не найден
+    """
+    f.seek(0)
+    head = f.read(32)
+    content_type = image_type(head)
+    if content_type == "image/jpeg":
+        size = _jpeg_size(f)
+    elif content_type == "image/png":
+        size = None
+        if head[12:16] == b"IHDR" and len(head) >= 24:
+            size = struct.unpack(">II", head[16:24])
+    elif content_type == "image/webp":
+        size = _webp_size(head)
+    else:
+        return None
+    if size is None:
+        return None
+    return content_type, size[0], size[1]
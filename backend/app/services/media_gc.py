@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from app.core.settings import settings
+from app.db.models import Application, ApplicationArchive, ApplicationStatus
+from app.db.session import engine
+from sqlalchemy import String, any_, bindparam, func, select, union_all, update
+from sqlalchemy.dialects.postgresql import ARRAY
+
+logger = logging.getLogger(__name__)
+
+# так upload_photo пишет photo_url
+PHOTO_URL_PREFIX = "/media/photos/"
+
+_TABLES = (Application.__table__, ApplicationArchive.__table__)
+
+
+def photos_dir() -> Path:
+    return Path(settings.media_root) / "photos"
+
+
+def _photo_path(photo_url: str) -> Path | None:
+    if not photo_url.startswith(PHOTO_URL_PREFIX):
+        return None
+    name = photo_url[len(PHOTO_URL_PREFIX) :]
+    if not name or "/" in name or name.startswith("."):
+        return None
+    return photos_dir() / name
+
+
+def _unlink(path: Path, dry_run: bool) -> int:
+    """Удаляет файл, возвращает его размер (0 — файла нет)."""
+    try:
+        size = path.stat().st_size
+        if not dry_run:
+            path.unlink()
+    except FileNotFoundError:
+        return 0
+    return size
+
+
+def purge_rejected_photos(
+    dry_run: bool = False,
+    batch_size: int | None = None,
+) -> int:
+    """
+    Удаляет фото заявок, отклонённых больше
+    settings.media_retention_rejected_days назад (и в архиве тоже). Срок
+    считается от status_changed_at — момента отклонения, а не подачи.
+
+    Сначала обнуляем photo_url и коммитим, потом удаляем файлы: если
+    удаление не удалось, файл станет сиротой и его уберёт collect_orphans.
+    Возвращает число заявок, у которых удалено фото.
+    """
+    if batch_size is None:
+        batch_size = settings.media_gc_batch_size
+    max_age = timedelta(days=settings.media_retention_rejected_days)
+
+    total = 0
+    freed = 0
+    for table in _TABLES:
+        last_id = 0
+        while True:
+            q = (
+                select(table.c.id, table.c.photo_url)
+                .where(
+                    table.c.status == ApplicationStatus.REJECTED,
+                    table.c.photo_url.is_not(None),
+                    func.coalesce(table.c.status_changed_at, table.c.created_at)
+                    < func.localtimestamp() - max_age,
+                    table.c.id > last_id,
+                )
+                .order_by(table.c.id)
+                .limit(batch_size)
+            )
+            with engine.begin() as conn:
+                if not dry_run:
+                    q = q.with_for_update(skip_locked=True)
+                rows = conn.execute(q).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                if not dry_run:
+                    conn.execute(
+                        update(table)
+                        .where(table.c.id.in_([r.id for r in rows]))
+                        .values(photo_url=None)
+                    )
+
+            for row in rows:
+                path = _photo_path(row.photo_url)
+                if path is not None:
+                    freed += _unlink(path, dry_run)
+                if dry_run:
+                    logger.info("would delete %s (#%s)", row.photo_url, row.id)
+            total += len(rows)
+
+    logger.info(
+        "rejected photos%s: %s applications, %s bytes",
+        " (dry run)" if dry_run else "",
+        total,
+        freed,
+    )
+    return total
+
+
+def _referenced(conn, urls: list[str]) -> set[str]:
+    param = bindparam("urls", value=urls, type_=ARRAY(String))
+    q = union_all(
+        *(select(t.c.photo_url).where(t.c.photo_url == any_(param)) for t in _TABLES)
+    )
+    return set(conn.execute(q).scalars())
+
+
+def collect_orphans(
+    dry_run: bool = False,
+    batch_size: int | None = None,
+) -> int:
+    """
+    Удаляет файлы из media/photos, на которые не ссылается ни одна заявка
+    (упавший commit после записи файла, повторная загрузка фото).
+
+    Каталог читается потоком os.scandir, имена сверяются с БД пачками
+    по индексу photo_url — память не зависит от числа файлов. Файлы
+    моложе settings.media_gc_grace_minutes не трогаем: их заявка может
+    быть ещё не закоммичена. Возвращает число удалённых файлов.
+    """
+    if batch_size is None:
+        batch_size = settings.media_gc_batch_size
+    directory = photos_dir()
+    if not directory.is_dir():
+        return 0
+    min_mtime = time.time() - settings.media_gc_grace_minutes * 60
+
+    total = 0
+    freed = 0
+
+    def flush(names: list[str]) -> None:
+        nonlocal total, freed
+        urls = [PHOTO_URL_PREFIX + name for name in names]
+        with engine.connect() as conn:
+            referenced = _referenced(conn, urls)
+        for name, url in zip(names, urls):
+            if url in referenced:
+                continue
+            path = directory / name
+            try:
+                if path.stat().st_mtime > min_mtime:
+                    continue
+            except FileNotFoundError:
+                continue
+            if dry_run:
+                logger.info("would delete orphan %s", name)
+            freed += _unlink(path, dry_run)
+            total += 1
+
+    batch: list[str] = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.startswith(".") or not entry.is_file(follow_symlinks=False):
+                continue
+            batch.append(entry.name)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+    if batch:
+        flush(batch)
+
+    logger.info(
+        "orphan photos%s: %s files, %s bytes",
+        " (dry run)" if dry_run else "",
+        total,
+        freed,
+    )
+    return total
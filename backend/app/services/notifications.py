@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Hashable
+
+from app.core import tracing
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Job:
+    fn: Callable[..., Any]
+    args: tuple
+    kwargs: dict
+    due: float
+    # дальше этого момента задачу не откладываем, сколько бы её ни обновляли
+    deadline: float
+    key: Hashable = None
+    seq: int = field(default=0)
+    attempt: int = 0
+    # трейс запроса, поставившего задачу (None — трейсинг выключен)
+    context: Any = None
+
+
+class NotificationQueue:
+    """
+    Отложенная очередь с фоновым потоком.
+
+    Задачи с одинаковым key схлопываются: новая заменяет старую и
+    переносит отправку на delay вперёд (но не дальше max_delay от первой
+    постановки). Так HR, нажавший in_review и сразу rejected, даёт
+    кандидату одно сообщение — о последнем статусе.
+
+    Если задача упала с исключением, у которого есть retry_after
+    (429 от Telegram), она повторяется через retry_after секунд.
+
+    Очередь живёт в процессе: в каждом uvicorn-воркере своя.
+    """
+
+    max_attempts = 3
+
+    def __init__(self, name: str = "notifications") -> None:
+        self.name = name
+        self._cond = threading.Condition()
+        self._jobs: dict[Hashable, _Job] = {}
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._seq = itertools.count()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    def start(self) -> None:
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run,
+                name=self.name,
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> int:
+        """
+        Отправляет всё, что накопилось (не дожидаясь delay), и
+        останавливает поток. Возвращает число задач, которые не успели.
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+
+        if thread is not None:
+            thread.join(timeout)
+
+        with self._cond:
+            left = len(self._jobs)
+            if thread is not None and not thread.is_alive():
+                self._thread = None
+        if left:
+            logger.warning("%s: %s jobs dropped on shutdown", self.name, left)
+        return left
+
+    def running(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive() and not self._stopping
+
+    def backlog(self) -> int:
+        with self._cond:
+            return len(self._jobs)
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        key: Hashable | None = None,
+        delay: float = 0.0,
+        max_delay: float | None = None,
+        **kwargs: Any,
+    ) -> None:
+        now = time.monotonic()
+        seq = next(self._seq)
+        if key is None:
+            key = ("job", seq)
+
+        with self._cond:
+            prev = self._jobs.get(key)
+            deadline = (
+                prev.deadline
+                if prev is not None
+                else now + (max_delay if max_delay is not None else delay)
+            )
+            due = min(now + delay, deadline)
+
+            self._put(
+                _Job(
+                    fn=fn,
+                    args=args,
+                    kwargs=kwargs,
+                    due=due,
+                    deadline=deadline,
+                    key=key,
+                    seq=seq,
+                    context=tracing.current_context(),
+                )
+            )
+
+    def _put(self, job: _Job) -> None:
+        # вызывается под self._cond
+        self._jobs[job.key] = job
+        heapq.heappush(self._heap, (job.due, job.seq, job.key))
+        self._cond.notify()
+
+    def _retry(self, job: _Job, retry_after: float) -> None:
+        with self._cond:
+            # за это время могли поставить более свежую задачу с тем же key
+            if job.key in self._jobs:
+                return
+            due = time.monotonic() + retry_after
+            self._put(
+                replace(
+                    job,
+                    due=due,
+                    deadline=due,
+                    seq=next(self._seq),
+                    attempt=job.attempt + 1,
+                )
+            )
+
+    def _peek(self) -> _Job | None:
+        # вызывается под self._cond; выкидывает устаревшие записи кучи
+        while self._heap:
+            _, seq, key = self._heap[0]
+            job = self._jobs.get(key)
+            if job is not None and job.seq == seq:
+                return job
+            heapq.heappop(self._heap)
+        return None
+
+    def _next_job(self) -> _Job | None:
+        """
+        Ждёт задачу, у которой наступил срок (при остановке — любую).
+        None — очередь остановлена и пуста.
+        """
+        with self._cond:
+            while True:
+                job = self._peek()
+                if job is None:
+                    if self._stopping:
+                        return None
+                    self._cond.wait()
+                    continue
+
+                wait = job.due - time.monotonic()
+                if wait <= 0 or self._stopping:
+                    heapq.heappop(self._heap)
+                    del self._jobs[job.key]
+                    return job
+
+                self._cond.wait(wait)
+
+    def _run(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            try:
+                with tracing.attached(job.context), tracing.span(
+                    f"queue {job.fn.__name__}",
+                    attempt=job.attempt,
+                ):
+                    job.fn(*job.args, **job.kwargs)
+            except Exception as exc:
+                retry_after = getattr(exc, "retry_after", None)
+                if (
+                    retry_after is not None
+                    and not self._stopping
+                    and job.attempt + 1 < self.max_attempts
+                ):
+                    logger.warning(
+                        "%s: %s rate limited, retry in %ss",
+                        self.name,
+                        job.fn.__name__,
+                        retry_after,
+                    )
+                    self._retry(job, retry_after)
+                    continue
+                logger.exception("%s: job %s failed", self.name, job.fn.__name__)
+
+
+notification_queue = NotificationQueue()
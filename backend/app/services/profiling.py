@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from app.core.settings import settings
+from app.security.debug_profile import DEBUG_PROFILE_HEADER, verify_debug_profile
+from starlette.routing import Match
+
+try:  # сэмплирующий профайлер — опционально
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+except ImportError:  # pragma: no cover
+    Profiler = None
+
+logger = logging.getLogger(__name__)
+
+_HEADER = DEBUG_PROFILE_HEADER.lower().encode("latin-1")
+PROFILE_ID_RE = re.compile(r"^[0-9a-f]{16}$")
+
+# формат -> (суффикс файла, media type)
+PROFILE_FORMATS = {
+    "html": (".html", "text/html"),
+    "speedscope": (".speedscope.json", "application/json"),
+}
+
+
+@dataclass
+class ProfileTarget:
+    # шаблон пути, как в роутере: /api/admin/applications/{application_id}
+    route: str
+    method: str | None
+    remaining: int
+    expires_at: float
+
+
+class ProfileRequests:
+    """
+    Какие запросы профилировать. Состояние — в процессе: POST
+    /api/internal/profiling включает профилирование только в воркере,
+    который его принял (заголовок X-Debug-Profile — в любом).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # читается без блокировки на каждом запросе: None — выключено
+        self.target: ProfileTarget | None = None
+
+    def arm(
+        self,
+        route: str,
+        method: str | None,
+        count: int,
+        ttl: int,
+    ) -> ProfileTarget:
+        target = ProfileTarget(
+            route=route,
+            method=method.upper() if method else None,
+            remaining=count,
+            expires_at=time.time() + ttl,
+        )
+        with self._lock:
+            self.target = target
+        return target
+
+    def disarm(self) -> None:
+        with self._lock:
+            self.target = None
+
+    def claim(self, route: str, method: str) -> bool:
+        """Запрос подходит — забирает одну из N попыток."""
+        with self._lock:
+            target = self.target
+            if target is None:
+                return False
+            if target.expires_at < time.time():
+                self.target = None
+                return False
+            if target.route != route or target.method not in (None, method):
+                return False
+            target.remaining -= 1
+            if target.remaining <= 0:
+                self.target = None
+            return True
+
+
+profile_requests = ProfileRequests()
+
+# sync-эндпоинт выполняется в threadpool: профайлер запускается там же
+_thread_profile: contextvars.ContextVar[dict | None] = contextvars.ContextVar(
+    "thread_profile", default=None
+)
+
+
+def profiling_available() -> bool:
+    return Profiler is not None
+
+
+def profiles_dir() -> Path:
+    return Path(settings.profiling_dir)
+
+
+def _profiled_call(call):
+    @functools.wraps(call)
+    def wrapper(*args, **kwargs):
+        holder = _thread_profile.get()
+        if holder is None:
+            return call(*args, **kwargs)
+        profiler = Profiler(interval=settings.profiling_interval)
+        profiler.start()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            holder["session"] = profiler.stop()
+
+    wrapper.profiled = True
+    return wrapper
+
+
+def wrap_sync_endpoints(app) -> None:
+    """
+    Один раз при старте оборачивает sync-эндпоинты: их профиль снимается
+    в потоке threadpool. Без профилирования обёртка — один ContextVar.get().
+    """
+    if Profiler is None:
+        return
+    for route in app.routes:
+        dependant = getattr(route, "dependant", None)
+        if dependant is None or inspect.iscoroutinefunction(route.endpoint):
+            continue
+        if not getattr(dependant.call, "profiled", False):
+            dependant.call = _profiled_call(dependant.call)
+
+
+def _match_route(scope):
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route
+    return None
+
+
+def _debug_header(scope) -> bytes | None:
+    for name, value in scope["headers"]:
+        if name == _HEADER:
+            return value
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    ASGI-middleware профилирования по запросу. Пока ничего не запрошено,
+    запрос идёт дальше после проверки одного атрибута и заголовков.
+
+    Профиль async-эндпоинта снимается в event loop (async_mode: чужие
+    запросы в это время не попадают), sync-эндпоинта — в потоке
+    threadpool вокруг функции эндпоинта (без sync-зависимостей).
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or Profiler is None:
+            return await self.app(scope, receive, send)
+        header = _debug_header(scope)
+        if profile_requests.target is None and header is None:
+            return await self.app(scope, receive, send)
+
+        route = _match_route(scope)
+        path = getattr(route, "path", None)
+        if header is not None and verify_debug_profile(header.decode("latin-1")):
+            trigger = "header"
+        elif path is not None and profile_requests.claim(path, scope["method"]):
+            trigger = "armed"
+        else:
+            return await self.app(scope, receive, send)
+
+        await self._profile(scope, receive, send, route, trigger)
+
+    async def _profile(self, scope, receive, send, route, trigger: str) -> None:
+        profile_id = uuid.uuid4().hex[:16]
+        status = {}
+
+        async def send_with_id(message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-profile-id", profile_id.encode()),
+                ]
+            await send(message)
+
+        endpoint = getattr(route, "dependant", None)
+        is_sync = endpoint is not None and not inspect.iscoroutinefunction(
+            route.endpoint
+        )
+        session = None
+        started = time.perf_counter()
+        if is_sync:
+            # endpoint.call обёрнут при старте (wrap_sync_endpoints)
+            holder: dict = {}
+            token = _thread_profile.set(holder)
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                _thread_profile.reset(token)
+                session = holder.get("session")
+        else:
+            profiler = Profiler(
+                interval=settings.profiling_interval,
+                async_mode="enabled",
+            )
+            profiler.start()
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                session = profiler.stop()
+        duration = time.perf_counter() - started
+        if session is None:
+            return
+
+        meta = {
+            "id": profile_id,
+            "route": getattr(route, "path", None),
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status.get("code"),
+            "duration_ms": round(duration * 1000, 1),
+            "trigger": trigger,
+            "created_at": time.time(),
+        }
+        try:
+            # ответ уже отправлен — рендер не задерживает клиента
+            await asyncio.to_thread(save_profile, meta, session)
+        except Exception:
+            logger.exception("profile %s: save failed", profile_id)
+
+
+def save_profile(meta: dict, session) -> None:
+    """
+    Пишет <id>.html (pyinstrument), <id>.speedscope.json и <id>.json
+    (метаданные). Старше последних profiling_keep профилей — удаляются.
+    """
+    target_dir = profiles_dir()
+    target_dir.mkdir(parents=True, exist_ok=True)
+    profile_id = meta["id"]
+    (target_dir / f"{profile_id}.html").write_text(
+        HTMLRenderer().render(session), encoding="utf-8"
+    )
+    (target_dir / f"{profile_id}.speedscope.json").write_text(
+        SpeedscopeRenderer().render(session), encoding="utf-8"
+    )
+    # метаданные последними: профиль виден в списке, когда файлы уже есть
+    (target_dir / f"{profile_id}.json").write_text(json.dumps(meta))
+    logger.info(
+        "profile %s: %s %s %.0f ms",
+        profile_id,
+        meta["method"],
+        meta["path"],
+        meta["duration_ms"],
+    )
+
+    for old in list_profiles()[settings.profiling_keep :]:
+        for suffix in (".json", *(s for s, _ in PROFILE_FORMATS.values())):
+            (target_dir / f"{old['id']}{suffix}").unlink(missing_ok=True)
+
+
+def list_profiles() -> list[dict]:
+    """Метаданные сохранённых профилей, новые первыми."""
+    metas = []
+    try:
+        paths = list(profiles_dir().glob("*.json"))
+    except FileNotFoundError:
+        return []
+    for path in paths:
+        if path.name.endswith(".speedscope.json"):
+            continue
+        try:
+            metas.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    metas.sort(key=lambda m: m.get("created_at", 0), reverse=True)
+    return metas
+
+
+def target_info() -> dict | None:
+    target = profile_requests.target
+    return asdict(target) if target is not None else None
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """
+    Запускает fn каждые interval секунд в отдельном потоке.
+
+    Работает в каждом uvicorn-воркере, поэтому сама задача должна быть
+    безопасной для параллельного запуска (например, через
+    SELECT ... FOR UPDATE SKIP LOCKED).
+    """
+
+    def __init__(self, name: str, interval: float, fn: Callable[[], object]) -> None:
+        self.name = name
+        self.interval = interval
+        self.fn = fn
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.fn()
+            except Exception:
+                logger.exception("periodic job %s failed", self.name)
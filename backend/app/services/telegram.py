@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import httpx
+
+TELEGRAM_API = "https://api.telegram.org"
+
+# один клиент на процесс — переиспользуем соединения к api.telegram.org
+_client: httpx.Client | None = None
+
+
+def _get_client() -> httpx.Client:
+    global _client
+    if _client is None:
+        _client = httpx.Client(timeout=10)
+    return _client
+
+
+class TelegramRetryAfter(Exception):
+    """
+    429 от Bot API. NotificationQueue повторит задачу через retry_after.
+    """
+
+    def __init__(self, method: str, retry_after: int) -> None:
+        super().__init__(f"{method}: flood control, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class TelegramBadRequest(Exception):
+    """
+    400 от Bot API (сообщение удалено, текст не изменился и т.п.).
+    """
+
+    def __init__(self, method: str, description: str) -> None:
+        super().__init__(f"{method}: {description}")
+        self.description = description
+
+
+def _call(bot_token: str, method: str, payload: dict) -> dict:
+    url = f"{TELEGRAM_API}/bot{bot_token}/{method}"
+    r = _get_client().post(url, json=payload)
+    if r.status_code == 429:
+        try:
+            retry_after = int(r.json()["parameters"]["retry_after"])
+        except (ValueError, KeyError, TypeError):
+            retry_after = 1
+        raise TelegramRetryAfter(method, retry_after)
+    if r.status_code == 400:
+        try:
+            description = str(r.json()["description"])
+        except (ValueError, KeyError, TypeError):
+            description = r.text
+        raise TelegramBadRequest(method, description)
+    r.raise_for_status()
+    return r.json()
+
+
+def hr_open_kb(application_id: int) -> dict:
+    """
+    Inline keyboard, чтобы бот поймал callback: hr:open:<id>
+    """
+    return {
+        "inline_keyboard": [
+            [
+                {
+                    "text": "👀 Ko‘rish",
+                    "callback_data": f"hr:open:{application_id}",
+                }
+            ]
+        ]
+    }
+
+
+def send_plain_message(bot_token: str, chat_id: int, text: str) -> None:
+    """
+    Простое сообщение без клавиатуры (для кандидата).
+    """
+    _call(
+        bot_token,
+        "sendMessage",
+        {
+            "chat_id": chat_id,
+            "text": text,
+            "disable_web_page_preview": True,
+        },
+    )
+
+
+def send_message(
+    bot_token: str,
+    chat_id: int,
+    text: str,
+    application_id: int,
+) -> int:
+    """Карточка заявки текстом. Возвращает message_id."""
+    result = _call(
+        bot_token,
+        "sendMessage",
+        {
+            "chat_id": chat_id,
+            "text": text,
+            "disable_web_page_preview": True,
+            "reply_markup": hr_open_kb(application_id),
+        },
+    )
+    return result["result"]["message_id"]
+
+
+def send_photo(
+    bot_token: str,
+    chat_id: int,
+    photo_url: str,
+    caption: str,
+    application_id: int,
+) -> int:
+    """Карточка заявки с фото. Возвращает message_id."""
+    result = _call(
+        bot_token,
+        "sendPhoto",
+        {
+            "chat_id": chat_id,
+            "photo": photo_url,
+            "caption": caption[:1024],  # лимит Telegram
+            "reply_markup": hr_open_kb(application_id),
+        },
+    )
+    return result["result"]["message_id"]
+
+
+def edit_message_text(
+    bot_token: str,
+    chat_id: int,
+    message_id: int,
+    text: str,
+    application_id: int,
+) -> None:
+    _call(
+        bot_token,
+        "editMessageText",
+        {
+            "chat_id": chat_id,
+            "message_id": message_id,
+            "text": text[:4096],
+            "disable_web_page_preview": True,
+            "reply_markup": hr_open_kb(application_id),
+        },
+    )
+
+
+def edit_message_caption(
+    bot_token: str,
+    chat_id: int,
+    message_id: int,
+    caption: str,
+    application_id: int,
+) -> None:
+    _call(
+        bot_token,
+        "editMessageCaption",
+        {
+            "chat_id": chat_id,
+            "message_id": message_id,
+            "caption": caption[:1024],
+            "reply_markup": hr_open_kb(application_id),
+        },
+    )
+
+
+def edit_message_media(
+    bot_token: str,
+    chat_id: int,
+    message_id: int,
+    photo_url: str,
+    caption: str,
+    application_id: int,
+) -> None:
+    """Новое фото в уже отправленной карточке (только сообщения с фото)."""
+    _call(
+        bot_token,
+        "editMessageMedia",
+        {
+            "chat_id": chat_id,
+            "message_id": message_id,
+            "media": {
+                "type": "photo",
+                "media": photo_url,
+                "caption": caption[:1024],
+            },
+            "reply_markup": hr_open_kb(application_id),
+        },
+    )
+
+
+def send_digest(
+    bot_token: str,
+    chat_id: int,
+    text: str,
+    application_ids: list[int],
+    has_more: bool = False,
+) -> None:
+    """
+    Сводка новых заявок: по кнопке на заявку + ссылка на полный список.
+    """
+    buttons = [
+        {"text": f"👀 #{app_id}", "callback_data": f"hr:open:{app_id}"}
+        for app_id in application_ids
+    ]
+    keyboard = [buttons[i : i + 2] for i in range(0, len(buttons), 2)]
+    if has_more:
+        keyboard.append(
+            [{"text": "📄 Barcha yangi arizalar", "callback_data": "hr:list:new"}]
+        )
+    _call(
+        bot_token,
+        "sendMessage",
+        {
+            "chat_id": chat_id,
+            "text": text[:4096],  # лимит Telegram
+            "disable_web_page_preview": True,
+            "reply_markup": {"inline_keyboard": keyboard},
+        },
+    )
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import BinaryIO
+
+from app.core.settings import settings
+from app.db.models import PhotoUpload
+from app.db.session import SessionLocal
+from app.services.image_header import image_info, image_type
+from app.services.media_gc import photos_dir
+from sqlalchemy import delete, func
+
+logger = logging.getLogger(__name__)
+
+PHOTO_TYPES = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+}
+MAX_PHOTO_BYTES = 5 * 1024 * 1024
+
+
+def declared_size_error(width: int | None, height: int | None) -> str | None:
+    """Заявленный размер: оба или ни одного, не больше photo_max_dimension."""
+    if (width is None) != (height is None):
+        return "width and height go together"
+    if width is not None and max(width, height) > settings.photo_max_dimension:
+        return f"Max photo size is {settings.photo_max_dimension}px"
+    return None
+
+
+def photo_head_error(
+    f: BinaryIO,
+    content_type: str,
+    width: int | None = None,
+    height: int | None = None,
+    complete: bool = True,
+) -> str | None:
+    """
+    Сверяет заголовок файла с заявленным типом и размером и проверяет
+    предел photo_max_dimension, без декодирования. complete=False — файл
+    ещё не весь: не найденный заголовок не ошибка, проверим при завершении.
+
+    Returns:
+        str | None: текст ошибки для 400 или None
+    """
+    f.seek(0)
+    head = f.read(16)
+    kind = image_type(head)
+    if kind is not None and kind != content_type:
+        return "Photo content does not match its type"
+    info = image_info(f)
+    if info is None:
+        if complete or (len(head) >= 16 and kind is None):
+            return "Not a valid jpg, png or webp image"
+        return None
+    _, actual_w, actual_h = info
+    # предел — и без заявленного размера: клиент мог его не прислать
+    if max(actual_w, actual_h) > settings.photo_max_dimension:
+        return f"Max photo size is {settings.photo_max_dimension}px"
+    # сторону не сравниваем: поворот по EXIF меняет их местами
+    if width is not None and sorted((width, height)) != sorted((actual_w, actual_h)):
+        return "Photo dimensions do not match"
+    return None
+
+
+def uploads_dir() -> Path:
+    return Path(settings.media_root) / "uploads"
+
+
+def part_path(upload_id: str) -> Path:
+    return uploads_dir() / f"{upload_id}.part"
+
+
+def write_chunk(upload_id: str, offset: int, data: bytes) -> None:
+    """
+    Пишет кусок с позиции offset. fsync — принятый offset не должен
+    потеряться при падении: клиент продолжит именно с него.
+    """
+    path = part_path(upload_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        os.pwrite(fd, data, offset)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def upload_head_error(upload: PhotoUpload) -> str | None:
+    """photo_head_error по собранному файлу загрузки."""
+    with open(part_path(upload.id), "rb") as f:
+        return photo_head_error(f, upload.content_type, upload.width, upload.height)
+
+
+def photo_path(application_id: int, content_type: str) -> Path:
+    """Новый файл фото заявки в media/photos (каталог создаётся)."""
+    target_dir = photos_dir()
+    target_dir.mkdir(parents=True, exist_ok=True)
+    ext = PHOTO_TYPES[content_type]
+    return target_dir / f"{application_id}_{uuid.uuid4().hex}{ext}"
+
+
+def move_to_photos(upload_id: str, target: Path) -> None:
+    """
+    Готовый файл загрузки — на место фото. Только после commit: при
+    откате строка загрузки вернётся, и .part должен остаться на месте.
+    """
+    # один том media: rename, без копирования
+    os.replace(part_path(upload_id), target)
+
+
+def purge_expired(batch_size: int = 1000) -> int:
+    """
+    Удаляет просроченные незавершённые загрузки и их .part-файлы, а
+    также .part без строки в БД (упали между записью файла и commit).
+    Возвращает число удалённых файлов.
+    """
+    removed = 0
+    db = SessionLocal()
+    try:
+        while True:
+            ids = (
+                db.query(PhotoUpload.id)
+                .filter(PhotoUpload.expires_at < func.localtimestamp())
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            deleted = (
+                db.execute(
+                    delete(PhotoUpload)
+                    .where(PhotoUpload.id.in_(ids))
+                    .returning(PhotoUpload.id)
+                )
+                .scalars()
+                .all()
+            )
+            db.commit()
+            for upload_id in deleted:
+                part_path(upload_id).unlink(missing_ok=True)
+                removed += 1
+            if len(deleted) < batch_size:
+                break
+    finally:
+        db.close()
+
+    # сироты: старше TTL, строки уже точно нет (она продлевается с каждым куском)
+    cutoff = time.time() - settings.upload_ttl_hours * 3600
+    try:
+        entries = list(os.scandir(uploads_dir()))
+    except FileNotFoundError:
+        entries = []
+    for entry in entries:
+        if entry.name.endswith(".part") and entry.stat().st_mtime < cutoff:
+            Path(entry.path).unlink(missing_ok=True)
+            removed += 1
+
+    if removed:
+        logger.info("expired uploads removed: %s", removed)
+    return removed
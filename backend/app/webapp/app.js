@@ -0,0 +1,595 @@
+const tg = window.Telegram?.WebApp
+if (tg) tg.expand()
+
+// Telegram Autofill
+function getTgUser() {
+	try {
+		return tg?.initDataUnsafe?.user || null
+	} catch {
+		return null
+	}
+}
+
+function buildFullNameFromTg(user) {
+	if (!user) return null
+	const first = (user.first_name || '').trim()
+	const last = (user.last_name || '').trim()
+	const name = `${first} ${last}`.trim()
+	return name || null
+}
+
+function applyTelegramAutofill() {
+	const user = getTgUser()
+	if (!user) return
+
+	const fullNameEl = document.getElementById('full_name')
+	const sourceEl = document.getElementById('source')
+
+	// 1) ФИО: заполняем только если поле пустое
+	const tgName = buildFullNameFromTg(user)
+	if (tgName && fullNameEl && !fullNameEl.value.trim()) {
+		fullNameEl.value = tgName
+	}
+
+	// 2) Source: если пусто — ставим Telegram
+	if (sourceEl && !sourceEl.value.trim()) {
+		sourceEl.value = 'Telegram'
+	}
+
+	// 3) сохраним в draft (если autosave уже подключен)
+	try {
+		if (typeof saveDraftDebounced === 'function') {
+			saveDraftDebounced()
+		}
+	} catch {}
+}
+
+// Запускаем autofill после загрузки draft (если draft есть — он приоритетнее)
+setTimeout(applyTelegramAutofill, 0)
+
+// Manual trigger button
+const tgFillBtn = document.getElementById('tgFillBtn')
+if (tgFillBtn) {
+	tgFillBtn.addEventListener('click', () => {
+		applyTelegramAutofill()
+		showAlert('✅ Telegram ma’lumotlari qo‘llandi.', 'ok')
+		setTimeout(hideAlert, 1200)
+	})
+}
+
+const alertBox = document.getElementById('alertBox')
+
+function showAlert(message, type = 'error') {
+	alertBox.classList.remove('hidden')
+	alertBox.textContent = message
+
+	// reset classes
+	alertBox.className = 'mb-4 rounded-xl border p-4 text-sm'
+
+	if (type === 'ok') {
+		alertBox.classList.add(
+			'border-green-200',
+			'bg-green-50',
+			'text-green-800',
+		)
+	} else if (type === 'warn') {
+		alertBox.classList.add(
+			'border-amber-200',
+			'bg-amber-50',
+			'text-amber-800',
+		)
+	} else {
+		alertBox.classList.add('border-red-200', 'bg-red-50', 'text-red-800')
+	}
+}
+
+function hideAlert() {
+	alertBox.classList.add('hidden')
+	alertBox.textContent = ''
+}
+
+function parseBirthDate(s) {
+	if (!s) return null
+	const m = /^(\d{2})\.(\d{2})\.(\d{4})$/.exec(s.trim())
+	if (!m) return null
+	const dd = m[1],
+		mm = m[2],
+		yyyy = m[3]
+	return `${yyyy}-${mm}-${dd}`
+}
+
+function validatePhone(phone) {
+	// простой вариант: разрешаем + и цифры, 9-15 цифр
+	const cleaned = phone.replace(/\s+/g, '')
+	return /^\+?\d{9,15}$/.test(cleaned)
+}
+
+// Phone mask +998 (__) ___-__-__
+function digitsOnly(s) {
+	return (s || '').replace(/\D/g, '')
+}
+
+function formatUzPhone(value) {
+	let d = digitsOnly(value)
+
+	// всегда начинаем с 998
+	if (!d.startsWith('998')) {
+		d = '998' + d.replace(/^998?/, '')
+	}
+
+	d = d.slice(0, 12)
+
+	const cc = d.slice(0, 3)
+	const aa = d.slice(3, 5)
+	const bbb = d.slice(5, 8)
+	const c2 = d.slice(8, 10)
+	const d2 = d.slice(10, 12)
+
+	let out = `+${cc}`
+
+	if (aa) out += ` (${aa}`
+	if (aa.length === 2) out += ')'
+
+	if (bbb) out += ` ${bbb}`
+	if (c2) out += `-${c2}`
+	if (d2) out += `-${d2}`
+
+	return out
+}
+
+function phoneToE164(masked) {
+	const d = digitsOnly(masked)
+	if (d.length === 12 && d.startsWith('998')) {
+		return `+${d}`
+	}
+	return null
+}
+
+const phoneEl = document.getElementById('phone')
+
+phoneEl.addEventListener('input', () => {
+	phoneEl.value = formatUzPhone(phoneEl.value)
+	saveDraftDebounced()
+})
+
+// AUTOSAVE
+const DRAFT_KEY = 'hr_app_draft_v1'
+
+const FIELD_IDS = [
+	'full_name',
+	'phone',
+	'birth_date',
+	'nationality',
+	'address',
+	'gender',
+	'prev_job',
+	'prev_job_duration',
+	'prev_job_leave_reason',
+	'is_married',
+	'source',
+	'desired_salary',
+	'why_hire_facts',
+]
+
+function saveDraft() {
+	const data = {}
+
+	FIELD_IDS.forEach(id => {
+		const el = document.getElementById(id)
+		if (el) data[id] = el.value
+	})
+
+	localStorage.setItem(DRAFT_KEY, JSON.stringify(data))
+}
+
+let draftTimer
+
+function saveDraftDebounced() {
+	clearTimeout(draftTimer)
+	draftTimer = setTimeout(saveDraft, 400)
+}
+
+function loadDraft() {
+	const raw = localStorage.getItem(DRAFT_KEY)
+	if (!raw) return
+
+	try {
+		const data = JSON.parse(raw)
+
+		FIELD_IDS.forEach(id => {
+			const el = document.getElementById(id)
+			if (el && data[id]) {
+				el.value = data[id]
+			}
+		})
+
+		phoneEl.value = formatUzPhone(phoneEl.value)
+	} catch {}
+}
+
+function clearDraft() {
+	localStorage.removeItem(DRAFT_KEY)
+}
+
+// сохраняем при вводе
+FIELD_IDS.forEach(id => {
+	const el = document.getElementById(id)
+	if (!el) return
+
+	el.addEventListener('input', saveDraftDebounced)
+	el.addEventListener('change', saveDraftDebounced)
+})
+
+// загрузим draft
+loadDraft()
+
+// Idempotency-Key: один на попытку отправки анкеты.
+// Повторная отправка после сетевой ошибки идёт с тем же ключом,
+// и backend вернёт уже созданную заявку вместо дубля.
+let submitKey = null
+
+function newIdempotencyKey() {
+	if (window.crypto?.randomUUID) return crypto.randomUUID()
+	return `${Date.now()}-${Math.random().toString(16).slice(2)}`
+}
+
+// fetch с повтором только на сетевых ошибках (ответ не дошёл)
+async function fetchWithRetry(url, options, retries = 2) {
+	for (let attempt = 0; ; attempt++) {
+		try {
+			return await fetch(url, options)
+		} catch (e) {
+			if (attempt >= retries) throw e
+			await new Promise(r => setTimeout(r, 1000 * (attempt + 1)))
+		}
+	}
+}
+
+// Фото уменьшаем и пережимаем в браузере: 12 МП снимок с телефона
+// превращается в ~300 КБ JPEG. Параметры — с backend.
+const DEFAULT_CONFIG = {
+	photo_max_dimension: 1600,
+	photo_jpeg_quality: 0.85,
+	photo_max_bytes: 5 * 1024 * 1024,
+	upload_chunk_size: 512 * 1024,
+}
+const configPromise = fetch('/api/config/webapp')
+	.then(res => (res.ok ? res.json() : DEFAULT_CONFIG))
+	.catch(() => DEFAULT_CONFIG)
+
+async function decodeImage(file) {
+	if (window.createImageBitmap) {
+		try {
+			// поворот по EXIF применяется при декодировании
+			return await createImageBitmap(file, { imageOrientation: 'from-image' })
+		} catch {}
+	}
+	const url = URL.createObjectURL(file)
+	try {
+		const img = new Image()
+		img.src = url
+		await img.decode()
+		return img
+	} finally {
+		URL.revokeObjectURL(url)
+	}
+}
+
+// Результат для одного и того же файла кэшируем: повторная отправка
+// должна докачать те же байты, а не пережатые заново
+let preparedPhoto = null
+
+async function preparePhoto(file) {
+	if (preparedPhoto?.key === fileKey(file)) return preparedPhoto
+
+	const config = await configPromise
+	const image = await decodeImage(file)
+	const srcW = image.width
+	const srcH = image.height
+	const scale = Math.min(1, config.photo_max_dimension / Math.max(srcW, srcH))
+	const width = Math.round(srcW * scale)
+	const height = Math.round(srcH * scale)
+
+	const canvas = document.createElement('canvas')
+	canvas.width = width
+	canvas.height = height
+	canvas.getContext('2d').drawImage(image, 0, 0, width, height)
+	image.close?.()
+
+	const blob = await new Promise(resolve =>
+		canvas.toBlob(resolve, 'image/jpeg', config.photo_jpeg_quality),
+	)
+	if (!blob) throw new Error('photo encode failed')
+
+	preparedPhoto = {
+		key: fileKey(file),
+		file: new File([blob], 'photo.jpg', {
+			type: 'image/jpeg',
+			lastModified: file.lastModified,
+		}),
+		width,
+		height,
+		maxBytes: config.photo_max_bytes,
+		chunkSize: config.upload_chunk_size,
+	}
+	return preparedPhoto
+}
+
+// Докачиваемая загрузка фото (backend: routers/uploads.py).
+// Файл уходит кусками; после обрыва спрашиваем у backend, сколько
+// уже дошло, и продолжаем с этого места, а не с нуля.
+// Загрузку одного и того же файла помним — повторное нажатие
+// «Yuborish» её продолжит.
+let photoUpload = null
+
+function fileKey(file) {
+	return `${file.name}:${file.size}:${file.lastModified}`
+}
+
+async function uploadRequest(url, options, initData) {
+	const res = await fetch(url, {
+		...options,
+		headers: { ...options.headers, 'X-Tg-Init-Data': initData || '' },
+	})
+	const body = await res.json().catch(() => ({}))
+	return { res, body }
+}
+
+async function uploadPhotoResumable(photo, initData, onProgress) {
+	const { file, width, height } = photo
+	const MAX_FAILURES = 8
+
+	if (!photoUpload || photoUpload.key !== photo.key) {
+		const { res, body } = await uploadRequest(
+			'/api/uploads/photos',
+			{
+				method: 'POST',
+				headers: { 'Content-Type': 'application/json' },
+				body: JSON.stringify({
+					size: file.size,
+					content_type: file.type,
+					width,
+					height,
+				}),
+			},
+			initData,
+		)
+		if (!res.ok) throw new Error(body.detail || 'upload create failed')
+		photoUpload = { key: photo.key, ...body }
+	}
+
+	const url = `/api/uploads/photos/${photoUpload.upload_id}`
+	let failures = 0
+
+	while (photoUpload.offset < file.size) {
+		onProgress?.(photoUpload.offset / file.size)
+		const start = photoUpload.offset
+		const chunk = file.slice(start, start + photoUpload.chunk_size)
+		try {
+			const { res, body } = await uploadRequest(
+				url,
+				{
+					method: 'PATCH',
+					headers: {
+						'Content-Type': 'application/offset+octet-stream',
+						'Upload-Offset': String(start),
+					},
+					body: chunk,
+				},
+				initData,
+			)
+			if (res.ok) {
+				photoUpload.offset = body.offset
+				failures = 0
+				continue
+			}
+			if (res.status === 409) {
+				// кусок уже дошёл, потерялся только ответ
+				photoUpload.offset = Number(res.headers.get('Upload-Offset'))
+				continue
+			}
+			if (res.status === 404) {
+				// загрузка истекла — начнём заново
+				photoUpload = null
+				return uploadPhotoResumable(photo, initData, onProgress)
+			}
+			if (res.status !== 429 && res.status < 500) {
+				throw new Error(body.detail || `upload failed: ${res.status}`)
+			}
+		} catch (e) {
+			if (e instanceof Error && !(e instanceof TypeError)) throw e
+			// TypeError — сеть: ответ не дошёл
+		}
+
+		failures += 1
+		if (failures >= MAX_FAILURES) throw new Error('upload: network')
+		await new Promise(r => setTimeout(r, Math.min(1000 * 2 ** failures, 15000)))
+		// где остановились — знает только backend
+		try {
+			const { res, body } = await uploadRequest(url, { method: 'GET' }, initData)
+			if (res.ok) photoUpload.offset = body.offset
+		} catch {}
+	}
+
+	onProgress?.(1)
+	return photoUpload.upload_id
+}
+
+// Анкета и фото — одним multipart-запросом: одна проверка initData и
+// один commit на backend. Фото — файлом (влезает в один кусок) или
+// upload_id докачанной загрузки
+async function submitApplication(payload, photo, uploadId, initData, idemKey) {
+	const form = new FormData()
+	for (const [key, value] of Object.entries(payload)) {
+		if (value !== null && value !== undefined) form.append(key, String(value))
+	}
+	if (uploadId) {
+		// размер фото backend уже знает из загрузки
+		form.append('upload_id', uploadId)
+	} else {
+		form.append('photo', photo.file)
+		form.append('photo_width', String(photo.width))
+		form.append('photo_height', String(photo.height))
+	}
+	const res = await fetchWithRetry('/api/applications/submit', {
+		method: 'POST',
+		headers: {
+			'X-Tg-Init-Data': initData || '',
+			'Idempotency-Key': idemKey,
+		},
+		body: form,
+	})
+	if (!res.ok) throw new Error(await res.text())
+	return res.json()
+}
+
+// Preview
+const photoInput = document.getElementById('photo')
+const photoPreviewWrap = document.getElementById('photoPreviewWrap')
+const photoPreview = document.getElementById('photoPreview')
+
+photoInput.addEventListener('change', () => {
+	hideAlert()
+	const f = photoInput.files?.[0]
+	if (!f) {
+		photoPreviewWrap.classList.add('hidden')
+		photoPreview.src = ''
+		return
+	}
+	if (!f.type.startsWith('image/')) {
+		showAlert('Faqat rasm fayl yuklang (jpg/png).', 'warn')
+		photoInput.value = ''
+		photoPreviewWrap.classList.add('hidden')
+		return
+	}
+	const url = URL.createObjectURL(f)
+	photoPreview.src = url
+	photoPreviewWrap.classList.remove('hidden')
+})
+
+document
+	.getElementById('submitBtn')
+	.addEventListener('click', async () => {
+		hideAlert()
+
+		const btn = document.getElementById('submitBtn')
+		btn.disabled = true
+		btn.textContent = 'Yuborilmoqda...'
+
+		try {
+			const initData = tg?.initData || ''
+
+			const fullName = document.getElementById('full_name').value.trim()
+			const phoneMasked = document.getElementById('phone').value.trim()
+			const phone = phoneToE164(phoneMasked)
+
+			if (!fullName || !phone) {
+				showAlert('F.I.SH va Telefon majburiy.', 'warn')
+				throw new Error('validation')
+			}
+
+			if (!phone) {
+				showAlert(
+					'Telefon raqam formati noto‘g‘ri. Masalan: +998 (90) 123-45-67',
+					'warn',
+				)
+				throw new Error('validation')
+			}
+
+			const birthRaw = document.getElementById('birth_date').value.trim()
+			const birthParsed = parseBirthDate(birthRaw)
+			if (birthRaw && !birthParsed) {
+				showAlert(
+					'Tug‘ilgan sana formati noto‘g‘ri. Format: DD.MM.YYYY',
+					'warn',
+				)
+				throw new Error('validation')
+			}
+
+			const photo = document.getElementById('photo').files[0]
+			if (!photo) {
+				showAlert('Rasm majburiy. Iltimos rasm yuklang.', 'warn')
+				throw new Error('photo required')
+			}
+
+			if (!photo.type.startsWith('image/')) {
+				showAlert('Faqat rasm fayl yuklang (jpg/png).', 'warn')
+				throw new Error('invalid file type')
+			}
+
+			// лимит 5MB — уже для уменьшенного фото
+			let prepared
+			try {
+				prepared = await preparePhoto(photo)
+			} catch (e) {
+				showAlert('Rasmni ochib bo‘lmadi. Boshqa rasm tanlang.', 'warn')
+				throw e
+			}
+			if (prepared.file.size > prepared.maxBytes) {
+				showAlert('Rasm hajmi 5MB dan oshmasin.', 'warn')
+				throw new Error('file too large')
+			}
+
+			const payload = {
+				full_name: fullName,
+				phone: phone,
+				birth_date: birthParsed,
+				nationality:
+					document.getElementById('nationality').value.trim() || null,
+				address: document.getElementById('address').value.trim() || null,
+				gender: document.getElementById('gender').value || null,
+				prev_job:
+					document.getElementById('prev_job').value.trim() || null,
+				prev_job_duration:
+					document.getElementById('prev_job_duration').value.trim() ||
+					null,
+				prev_job_leave_reason:
+					document.getElementById('prev_job_leave_reason').value.trim() ||
+					null,
+				is_married:
+					document.getElementById('is_married').value === 'true',
+				source: document.getElementById('source').value.trim() || null,
+				desired_salary:
+					document.getElementById('desired_salary').value.trim() || null,
+				why_hire_facts:
+					document.getElementById('why_hire_facts').value.trim() || null,
+			}
+
+			if (!submitKey) submitKey = newIdempotencyKey()
+
+			// Обычно уменьшенное фото меньше одного куска — уходит прямо в
+			// /submit (один запрос на заявку). Больше — докачиваемая
+			// загрузка, затем /submit со ссылкой на неё
+			let uploadId = null
+			if (prepared.file.size > prepared.chunkSize) {
+				uploadId = await uploadPhotoResumable(prepared, initData, p => {
+					btn.textContent = `Rasm yuklanmoqda... ${Math.round(p * 100)}%`
+				})
+			}
+			btn.textContent = 'Yuborilmoqda...'
+
+			await submitApplication(payload, prepared, uploadId, initData, submitKey)
+
+			showAlert('✅ Ariza yuborildi! Rahmat.', 'ok')
+
+			submitKey = null
+			photoUpload = null
+			preparedPhoto = null
+			clearDraft()
+
+			setTimeout(() => {
+				if (tg) tg.close()
+			}, 600)
+		} catch (e) {
+			console.error(e)
+			if (alertBox.classList.contains('hidden')) {
+				showAlert(
+					'Xatolik: ariza yuborilmadi. Qayta urinib ko‘ring.',
+					'error',
+				)
+			}
+		} finally {
+			btn.disabled = false
+			btn.textContent = '✅ Yuborish'
+		}
+	})
@@ -0,0 +1,18 @@
+from datetime import datetime, timedelta, timezone
+
+from app.db.models import Application, ApplicationStatus
+from app.services.archive import application_source
+
+
+def test_aware_created_from_after_cutoff_reads_hot_table():
+    assert application_source(datetime.now(timezone.utc)) is Application.__table__
+
+
+def test_aware_created_from_before_cutoff_includes_archive():
+    old = datetime.now(timezone.utc) - timedelta(days=3650)
+    assert application_source(old) is not Application.__table__
+
+
+def test_closed_status_without_dates_includes_archive():
+    source = application_source(status=ApplicationStatus.REJECTED)
+    assert source is not Application.__table__
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -9,6 +11,47 @@ class Settings(BaseSettings):
     owner_tg_id: int | None = None
     webapp_url: str
 
+    # polling — для локальной разработки, webhook — для прода (несколько реплик)
+    bot_mode: Literal["polling", "webhook"] = "polling"
+
+    # Публичный адрес, на который Telegram шлёт апдейты (через nginx)
+    webhook_base_url: str | None = None
+    webhook_path: str = "/tg/webhook"
+    # X-Telegram-Bot-Api-Secret-Token: только A-Z, a-z, 0-9, _ и -
+    webhook_secret: str | None = None
+
+    # Где слушает aiohttp внутри контейнера
+    webhook_host: str = "0.0.0.0"
+    webhook_port: int = 8080
+
+    # Flood control исходящих запросов к Bot API. Глобальный лимит — на
+    # весь бот: делится между BOT_REPLICAS репликами (--scale bot=N).
+    # Backend шлёт тем же токеном без него — отсюда запас до ~30/с
+    tg_global_rate: float = 25.0
+    tg_global_burst: float = 25.0
+    tg_chat_rate: float = 1.0
+    tg_chat_burst: float = 3.0
+    tg_max_retries: int = 3
+    bot_replicas: int = 1
+
+    # GET /metrics (Prometheus): время апдейтов по хендлерам, вызовов
+    # backend и Bot API, flood control. 0 — выключено
+    metrics_host: str = "0.0.0.0"
+    metrics_port: int = 9100
+
+    # Трейсинг OpenTelemetry: otlp — в коллектор (OTLP/HTTP), jsonl — в
+    # файл для разбора офлайн; не задан — выключен
+    tracing_exporter: Literal["otlp", "jsonl"] | None = None
+    tracing_otlp_endpoint: str = "http://otel-collector:4318/v1/traces"
+    tracing_jsonl_path: str = "traces/bot.jsonl"
+    # доля апдейтов, для которых пишется трейс (backend следует решению)
+    tracing_sample_ratio: float = 1.0
+    tracing_service_name: str = "hr-bot"
+
+    @property
+    def webhook_url(self) -> str:
+        return f"{(self.webhook_base_url or '').rstrip('/')}{self.webhook_path}"
+
     class Config:
         env_file = ".env"
         extra = "ignore"
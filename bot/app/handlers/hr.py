@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 from aiogram import F, Router
-from aiogram.filters import CommandObject, CommandStart
+from aiogram.filters import Command, CommandObject, CommandStart
 from aiogram.types import CallbackQuery, Message
 from app.config import settings
-from app.db.models import EmployerRole
 from app.keyboards.hr import (
     application_actions_kb,
     applications_list_kb,
     candidate_start_kb,
     hr_menu_kb,
+    notification_mode_kb,
+    selected_ids,
+    toggle_selection,
 )
 from app.services.api import BackendClient
 
@@ -33,7 +35,7 @@ async def require_owner(user_id: int) -> bool:
     Разрешено: только OWNER.
     """
     emp = await api.get_employer(user_id)
-    return emp.get("is_hr") is True and emp.get("role") == EmployerRole.OWNER.value
+    return emp.get("is_hr") is True and emp.get("role") == "OWNER"
 
 
 @router.message(CommandStart(deep_link=True))
@@ -99,11 +101,53 @@ async def hr_list(cb: CallbackQuery) -> None:
 
     await cb.message.edit_text(
         f"📄 Arizalar ({status}):",
-        reply_markup=applications_list_kb(rows),
+        reply_markup=applications_list_kb(rows, status=status),
     )
     await cb.answer()
 
 
+@router.callback_query(F.data.startswith("hr:sel:"))
+async def hr_toggle_select(cb: CallbackQuery) -> None:
+    if not await require_hr(cb.from_user.id):
+        await cb.answer("Ruxsat yo'q", show_alert=True)
+        return
+
+    app_id = int(cb.data.split(":")[-1])
+    await cb.message.edit_reply_markup(
+        reply_markup=toggle_selection(cb.message.reply_markup, app_id),
+    )
+    await cb.answer()
+
+
+@router.callback_query(F.data.startswith("hr:bulk:"))
+async def hr_bulk_status(cb: CallbackQuery) -> None:
+    if not await require_hr(cb.from_user.id):
+        await cb.answer("Ruxsat yo'q", show_alert=True)
+        return
+
+    _, _, list_status, target = cb.data.split(":")
+    ids = selected_ids(cb.message.reply_markup)
+    if not ids:
+        await cb.answer("Hech qaysi ariza tanlanmagan", show_alert=True)
+        return
+
+    res = await api.bulk_set_status(ids, status=target)
+    await cb.answer(f"{len(res.get('updated', []))} ta ariza yangilandi ✅")
+
+    # перерисовываем список текущего статуса
+    rows = await api.list_applications(status=list_status, limit=20, offset=0)
+    if not rows:
+        await cb.message.edit_text(
+            f"Arizalar {list_status} statusida yo'q.", reply_markup=hr_menu_kb()
+        )
+        return
+
+    await cb.message.edit_text(
+        f"📄 Arizalar ({list_status}):",
+        reply_markup=applications_list_kb(rows, status=list_status),
+    )
+
+
 @router.callback_query(F.data.startswith("hr:status:"))
 async def hr_set_status(cb: CallbackQuery) -> None:
     if not await require_hr(cb.from_user.id):
@@ -136,7 +180,8 @@ async def hr_set_status(cb: CallbackQuery) -> None:
         f"📊 Status: {updated['status']}"
     )
 
-    photo_url = updated.get("photo_url")
+    # media закрыта: Telegram скачивает фото по подписанной ссылке
+    photo_url = updated.get("photo_signed_url") or updated.get("photo_url")
     if photo_url:
         await cb.message.answer_photo(
             photo=f"{settings.backend_url}{photo_url}",
@@ -177,7 +222,8 @@ async def hr_open_app(cb: CallbackQuery) -> None:
         f"📊 Status: {data['status']}"
     )
 
-    photo_url = data.get("photo_url")
+    # media закрыта: Telegram скачивает фото по подписанной ссылке
+    photo_url = data.get("photo_signed_url") or data.get("photo_url")
     if photo_url:
         await cb.message.answer_photo(
             photo=f"{settings.backend_url}{photo_url}",
@@ -193,6 +239,42 @@ async def hr_open_app(cb: CallbackQuery) -> None:
     await cb.answer()
 
 
+@router.callback_query(F.data == "hr:notify")
+async def hr_notify_menu(cb: CallbackQuery) -> None:
+    emp = await api.get_employer(cb.from_user.id)
+    if not emp.get("is_hr"):
+        await cb.answer("Ruxsat yo'q", show_alert=True)
+        return
+
+    await cb.message.edit_text(
+        "🔔 Yangi arizalar haqida qanday xabar beraylik?\n\n"
+        "Xulosa rejimida bitta xabarda barcha yangi arizalar keladi.",
+        reply_markup=notification_mode_kb(
+            emp.get("notification_mode"),
+            emp.get("digest_interval_minutes"),
+        ),
+    )
+    await cb.answer()
+
+
+@router.callback_query(F.data.startswith("hr:notify:"))
+async def hr_set_notify_mode(cb: CallbackQuery) -> None:
+    if not await require_hr(cb.from_user.id):
+        await cb.answer("Ruxsat yo'q", show_alert=True)
+        return
+
+    mode = cb.data.split(":")[-1]
+    res = await api.set_notification_mode(cb.from_user.id, mode)
+
+    await cb.message.edit_reply_markup(
+        reply_markup=notification_mode_kb(
+            res.get("notification_mode"),
+            res.get("digest_interval_minutes"),
+        ),
+    )
+    await cb.answer("Saqlandi ✅")
+
+
 @router.callback_query(F.data == "hr:add_recruiter")
 async def add_recruiter(cb: CallbackQuery):
     emp = await api.get_employer(cb.from_user.id)
@@ -222,7 +304,7 @@ async def cmd_new_applications(message: Message) -> None:
 
     await message.answer(
         "📄 Yangi arizalar:",
-        reply_markup=applications_list_kb(rows),
+        reply_markup=applications_list_kb(rows, status="new"),
     )
 
 
@@ -238,7 +320,8 @@ async def cmd_in_review_applications(message: Message) -> None:
         return
 
     await message.answer(
-        "📄 Ko‘rib chiqilmoqda:", reply_markup=applications_list_kb(rows)
+        "📄 Ko‘rib chiqilmoqda:",
+        reply_markup=applications_list_kb(rows, status="in_review"),
     )
 
 
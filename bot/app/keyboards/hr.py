@@ -13,7 +13,34 @@ def hr_menu_kb() -> InlineKeyboardMarkup:
     b.button(text="✅ Qabul qilish", callback_data="hr:list:accepted")
     b.button(text="❌ Rad etish", callback_data="hr:list:rejected")
     b.button(text="➕ HR qo‘shish", callback_data="hr:add_recruiter")
-    b.adjust(2, 2)
+    b.button(text="🔔 Bildirishnomalar", callback_data="hr:notify")
+    b.adjust(2, 2, 2)
+    return b.as_markup()
+
+
+# {minutes} — digest_interval_minutes работодателя
+NOTIFICATION_MODES = {
+    "instant": "⚡ Darhol",
+    "batched": "🕒 Har {minutes} daqiqada",
+    "hourly": "🗂 Soatlik xulosa",
+}
+DEFAULT_DIGEST_MINUTES = 15
+
+
+def notification_mode_kb(
+    current: str | None,
+    interval_minutes: int | None = None,
+) -> InlineKeyboardMarkup:
+    minutes = interval_minutes or DEFAULT_DIGEST_MINUTES
+    b = InlineKeyboardBuilder()
+    for mode, label in NOTIFICATION_MODES.items():
+        mark = "✅ " if mode == current else ""
+        b.button(
+            text=f"{mark}{label.format(minutes=minutes)}",
+            callback_data=f"hr:notify:{mode}",
+        )
+    b.button(text="⬅️ Menu", callback_data="hr:menu")
+    b.adjust(1)
     return b.as_markup()
 
 
@@ -36,21 +63,95 @@ def application_actions_kb(app_id: int) -> InlineKeyboardMarkup:
     return b.as_markup()
 
 
-def applications_list_kb(rows):
+# Тексты кнопок массового действия по целевому статусу
+BULK_ACTIONS = {
+    "in_review": "👀 Ko'rib chiqish",
+    "accepted": "✅ Qabul qilish",
+    "rejected": "❌ Rad etish",
+}
+
+SELECT_OFF = "☐"
+SELECT_ON = "☑️"
+
+
+def applications_list_kb(rows, status: str | None = None):
+    """
+    Список заявок. Если передан status — у каждой строки есть чекбокс,
+    а внизу кнопки "применить статус ко всем отмеченным".
+
+    Отметки живут прямо в клавиатуре сообщения (без состояния в боте),
+    поэтому работают при нескольких репликах.
+    """
     kb = InlineKeyboardBuilder()
 
     for r in rows[:10]:
-        kb.button(
+        open_btn = InlineKeyboardButton(
             text=f"#{r['id']} — {r['full_name']}",
             callback_data=f"hr:open:{r['id']}",
         )
+        if status is None:
+            kb.row(open_btn)
+        else:
+            kb.row(
+                open_btn,
+                InlineKeyboardButton(
+                    text=SELECT_OFF,
+                    callback_data=f"hr:sel:{r['id']}",
+                ),
+            )
 
-    kb.button(text="⬅️ Menu", callback_data="hr:menu")
+    if status is not None:
+        kb.row(
+            *[
+                InlineKeyboardButton(
+                    text=f"{SELECT_ON} {label}",
+                    callback_data=f"hr:bulk:{status}:{target}",
+                )
+                for target, label in BULK_ACTIONS.items()
+                if target != status
+            ]
+        )
 
-    kb.adjust(1)
+    kb.row(InlineKeyboardButton(text="⬅️ Menu", callback_data="hr:menu"))
     return kb.as_markup()
 
 
+def toggle_selection(
+    markup: InlineKeyboardMarkup,
+    app_id: int,
+) -> InlineKeyboardMarkup:
+    """
+    Переключает чекбокс заявки app_id в существующей клавиатуре.
+    """
+    target = f"hr:sel:{app_id}"
+    rows = []
+    for row in markup.inline_keyboard:
+        new_row = []
+        for btn in row:
+            if btn.callback_data == target:
+                text = SELECT_OFF if btn.text == SELECT_ON else SELECT_ON
+                btn = btn.model_copy(update={"text": text})
+            new_row.append(btn)
+        rows.append(new_row)
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+def selected_ids(markup: InlineKeyboardMarkup | None) -> list[int]:
+    """
+    id отмеченных заявок из клавиатуры сообщения.
+    """
+    if markup is None:
+        return []
+    return [
+        int(btn.callback_data.split(":")[-1])
+        for row in markup.inline_keyboard
+        for btn in row
+        if btn.callback_data
+        and btn.callback_data.startswith("hr:sel:")
+        and btn.text == SELECT_ON
+    ]
+
+
 def candidate_start_kb(webapp_url: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
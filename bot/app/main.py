@@ -1,18 +1,140 @@
 import asyncio
+import logging
 
 from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
 from app.config import settings
+from app.metrics import start_metrics_server
 from app.handlers.candidate import router as candidate_router
 from app.handlers.hr import router as hr_router
+from app.middlewares.actor import ActorMiddleware
+from app.middlewares.flood_control import FloodControlMiddleware
+from app.middlewares.timing import (
+    HandlerTimingMiddleware,
+    TelegramTimingMiddleware,
+    UpdateTimingMiddleware,
+)
+from app.middlewares.tracing import HandlerNameMiddleware, UpdateTracingMiddleware
+from app.tracing import setup_tracing, shutdown_tracing
 
+logger = logging.getLogger(__name__)
 
-async def main() -> None:
-    bot = Bot(token=settings.bot_token)
+
+def build_dispatcher(tracing: bool = False) -> Dispatcher:
     dp = Dispatcher()
+    # read-your-writes в backend — по HR, а не по реплике бота
+    dp.update.outer_middleware(ActorMiddleware())
+    # время апдейтов по хендлерам: GET /metrics (settings.metrics_port)
+    dp.update.outer_middleware(UpdateTimingMiddleware())
+    dp.message.middleware(HandlerTimingMiddleware())
+    dp.callback_query.middleware(HandlerTimingMiddleware())
+    if tracing:
+        dp.update.outer_middleware(UpdateTracingMiddleware())
+        # inner-middleware диспетчера действуют и во вложенных роутерах
+        dp.message.middleware(HandlerNameMiddleware())
+        dp.callback_query.middleware(HandlerNameMiddleware())
     dp.include_router(candidate_router)
     dp.include_router(hr_router)
+    return dp
+
+
+async def run_polling(bot: Bot, dp: Dispatcher) -> None:
+    """
+    Long polling — только для локальной разработки (один процесс).
+    """
+    # если раньше был выставлен webhook, polling без этого не получит апдейты
+    await bot.delete_webhook(drop_pending_updates=False)
     await dp.start_polling(bot)
 
 
+async def run_webhook(bot: Bot, dp: Dispatcher) -> None:
+    """
+    Webhook-режим: aiohttp-сервер за nginx.
+
+    Бот не хранит состояние между апдейтами, поэтому можно поднять
+    несколько реплик — nginx раскидывает запросы Telegram между ними.
+    """
+    if not settings.webhook_base_url or not settings.webhook_secret:
+        raise RuntimeError(
+            "BOT_MODE=webhook requires WEBHOOK_BASE_URL and WEBHOOK_SECRET",
+        )
+
+    async def on_startup(bot: Bot) -> None:
+        # setWebhook идемпотентен: каждая реплика может вызвать его при старте
+        await bot.set_webhook(
+            url=settings.webhook_url,
+            secret_token=settings.webhook_secret,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+        logger.info("webhook set to %s", settings.webhook_url)
+
+    # ВАЖНО: webhook не удаляем на shutdown — остальные реплики продолжают работать
+    dp.startup.register(on_startup)
+
+    app = web.Application()
+    # SimpleRequestHandler сам проверяет X-Telegram-Bot-Api-Secret-Token
+    # и отвечает 200 сразу, обрабатывая апдейт в фоне
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=settings.webhook_secret,
+    ).register(app, path=settings.webhook_path)
+    setup_application(app, dp, bot=bot)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=settings.webhook_host, port=settings.webhook_port)
+    await site.start()
+    logger.info(
+        "webhook server listening on %s:%s%s",
+        settings.webhook_host,
+        settings.webhook_port,
+        settings.webhook_path,
+    )
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+async def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    # до Bot: его aiohttp-сессия должна создаваться уже инструментированной
+    tracing = setup_tracing()
+
+    bot = Bot(token=settings.bot_token)
+    # первым — внешний слой: время вызова включает ожидание flood control
+    bot.session.middleware(TelegramTimingMiddleware())
+    flood_control = FloodControlMiddleware(
+        global_rate=settings.tg_global_rate / settings.bot_replicas,
+        global_burst=settings.tg_global_burst / settings.bot_replicas,
+        chat_rate=settings.tg_chat_rate,
+        chat_burst=settings.tg_chat_burst,
+        max_retries=settings.tg_max_retries,
+    )
+    bot.session.middleware(flood_control)
+    dp = build_dispatcher(tracing)
+
+    metrics_runner = None
+    if settings.metrics_port:
+        metrics_runner = await start_metrics_server(
+            settings.metrics_host,
+            settings.metrics_port,
+            flood_control.stats,
+        )
+
+    try:
+        if settings.bot_mode == "webhook":
+            await run_webhook(bot, dp)
+        else:
+            await run_polling(bot, dp)
+    finally:
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
+        shutdown_tracing()
+
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, TypeVar
+
+from aiohttp import web
+
+if TYPE_CHECKING:
+    from app.middlewares.flood_control import FloodControlStats
+
+logger = logging.getLogger(__name__)
+
+# секунды: от быстрого ответа из кэша до таймаута Telegram
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+T = TypeVar("T")
+
+
+class Histogram:
+    """
+    Гистограмма в формате Prometheus (кумулятивные бакеты, sum, count)
+    с одной меткой. Без зависимостей: метрик немного, процесс один.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # значение метки -> (счётчики по бакетам, sum, count)
+        self._series: dict[str, tuple[list[int], float, int]] = {}
+
+    def observe(self, value: str, seconds: float) -> None:
+        with self._lock:
+            counts, total, count = self._series.get(
+                value, ([0] * len(self.buckets), 0.0, 0)
+            )
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[i] += 1
+            self._series[value] = (counts, total + seconds, count + 1)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = sorted(self._series.items())
+        for value, (counts, total, count) in series:
+            label = f'{self.label}="{_escape(value)}"'
+            for bound, n in zip(self.buckets, counts):
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {n}')
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{label}}} {total:.6f}")
+            lines.append(f"{self.name}_count{{{label}}} {count}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+UPDATE_SECONDS = Histogram(
+    "bot_update_seconds",
+    "Update processing time, end to end",
+    "handler",
+)
+UPDATE_BACKEND_SECONDS = Histogram(
+    "bot_update_backend_seconds",
+    "Time one update spent in BackendClient calls",
+    "handler",
+)
+UPDATE_TELEGRAM_SECONDS = Histogram(
+    "bot_update_telegram_seconds",
+    "Time one update spent in Bot API calls (flood control wait included)",
+    "handler",
+)
+BACKEND_REQUEST_SECONDS = Histogram(
+    "bot_backend_request_seconds",
+    "BackendClient call time",
+    "method",
+)
+TELEGRAM_REQUEST_SECONDS = Histogram(
+    "bot_telegram_request_seconds",
+    "Bot API call time (flood control wait included)",
+    "method",
+)
+HISTOGRAMS = (
+    UPDATE_SECONDS,
+    UPDATE_BACKEND_SECONDS,
+    UPDATE_TELEGRAM_SECONDS,
+    BACKEND_REQUEST_SECONDS,
+    TELEGRAM_REQUEST_SECONDS,
+)
+
+_errors: dict[str, int] = {}
+
+
+@dataclass
+class UpdateTiming:
+    """Куда ушло время одного апдейта (заполняется по ходу обработки)."""
+
+    handler: str = "unhandled"
+    backend: float = 0.0
+    telegram: float = 0.0
+
+
+current_update: contextvars.ContextVar[UpdateTiming | None] = contextvars.ContextVar(
+    "current_update", default=None
+)
+
+
+def observe_update(timing: UpdateTiming, seconds: float, failed: bool) -> None:
+    UPDATE_SECONDS.observe(timing.handler, seconds)
+    UPDATE_BACKEND_SECONDS.observe(timing.handler, timing.backend)
+    UPDATE_TELEGRAM_SECONDS.observe(timing.handler, timing.telegram)
+    if failed:
+        _errors[timing.handler] = _errors.get(timing.handler, 0) + 1
+
+
+def observe_telegram(method: str, seconds: float) -> None:
+    TELEGRAM_REQUEST_SECONDS.observe(method, seconds)
+    timing = current_update.get()
+    if timing is not None:
+        timing.telegram += seconds
+
+
+def timed_backend(
+    fn: Callable[..., Awaitable[T]],
+) -> Callable[..., Awaitable[T]]:
+    """Декоратор метода BackendClient: время вызова в метрики."""
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        started = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - started
+            BACKEND_REQUEST_SECONDS.observe(fn.__name__, seconds)
+            timing = current_update.get()
+            if timing is not None:
+                timing.backend += seconds
+
+    return wrapper
+
+
+def render(flood_stats: FloodControlStats | None = None) -> str:
+    lines: list[str] = []
+    for histogram in HISTOGRAMS:
+        lines += histogram.render()
+
+    lines += [
+        "# HELP bot_update_errors_total Updates whose handler raised",
+        "# TYPE bot_update_errors_total counter",
+    ]
+    for handler, count in sorted(_errors.items()):
+        lines.append(f'bot_update_errors_total{{handler="{_escape(handler)}"}} {count}')
+
+    if flood_stats is not None:
+        lines += [
+            "# HELP bot_flood_requests_total Bot API calls through flood control",
+            "# TYPE bot_flood_requests_total counter",
+            f"bot_flood_requests_total {flood_stats.requests}",
+            "# HELP bot_flood_waited_total Calls that had to wait",
+            "# TYPE bot_flood_waited_total counter",
+            f"bot_flood_waited_total {flood_stats.waited}",
+            "# HELP bot_flood_wait_seconds_total Total flood control wait",
+            "# TYPE bot_flood_wait_seconds_total counter",
+            f"bot_flood_wait_seconds_total {flood_stats.total_wait:.6f}",
+            "# HELP bot_flood_max_wait_seconds Longest wait of one call",
+            "# TYPE bot_flood_max_wait_seconds gauge",
+            f"bot_flood_max_wait_seconds {flood_stats.max_wait:.6f}",
+            "# HELP bot_flood_retries_total Retries after 429",
+            "# TYPE bot_flood_retries_total counter",
+            f"bot_flood_retries_total {flood_stats.retries}",
+            "# HELP bot_flood_failures_total Calls that ran out of retries",
+            "# TYPE bot_flood_failures_total counter",
+            f"bot_flood_failures_total {flood_stats.failures}",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+async def start_metrics_server(
+    host: str,
+    port: int,
+    flood_stats: FloodControlStats | None = None,
+) -> web.AppRunner:
+    """
+    GET /metrics (формат Prometheus) на отдельном порту — наружу через
+    nginx не публикуется.
+    """
+
+    async def metrics(_request: web.Request) -> web.Response:
+        return web.Response(
+            text=render(flood_stats),
+            content_type="text/plain",
+            charset="utf-8",
+            headers={"Cache-Control": "no-store"},
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host=host, port=port).start()
+    logger.info("metrics on %s:%s/metrics", host, port)
+    return runner
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update, User
+from app.services.api import current_actor
+
+
+class ActorMiddleware(BaseMiddleware):
+    """
+    Outer-middleware на dp.update: вызовы BackendClient за время апдейта
+    идут от имени его автора (заголовок X-Actor-Tg-Id).
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: dict[str, Any],
+    ) -> Any:
+        user: User | None = data.get("event_from_user")
+        token = current_actor.set(user.id if user is not None else None)
+        try:
+            return await handler(event, data)
+        finally:
+            current_actor.reset(token)
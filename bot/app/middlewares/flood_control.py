@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket без блокировок (всё крутится в одном event loop).
+
+    reserve() сразу списывает токен и возвращает, сколько нужно подождать.
+    Баланс может уйти в минус — так вызовы встают в очередь по порядку.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated) * self.rate,
+        )
+        self.updated = now
+
+    def reserve(self) -> float:
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def is_idle(self) -> bool:
+        self._refill(time.monotonic())
+        return self.tokens >= self.capacity
+
+
+@dataclass
+class FloodControlStats:
+    """
+    Сколько времени запросы провели в очереди перед отправкой в Telegram.
+    """
+
+    requests: int = 0
+    waited: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    retries: int = 0
+    failures: int = 0
+
+    def observe_wait(self, seconds: float) -> None:
+        """Один вызов и его ожидание в очереди (с повторами после 429)."""
+        self.requests += 1
+        if seconds <= 0:
+            return
+        self.waited += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "waited": self.waited,
+            "avg_wait": self.total_wait / self.waited if self.waited else 0.0,
+            "max_wait": self.max_wait,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+
+class FloodControlMiddleware(BaseRequestMiddleware):
+    """
+    Session middleware для исходящих вызовов Bot API.
+
+    - глобальный bucket (лимит Telegram ~30 сообщений/сек на бота);
+    - bucket на каждый chat_id (~1 сообщение/сек в один чат);
+    - на 429 (TelegramRetryAfter) ждём retry_after и повторяем,
+      пока не кончатся попытки.
+
+    Bucket'ы живут в процессе: у каждой реплики бота свой бюджет, поэтому
+    global_rate — доля реплики (main.py делит TG_GLOBAL_RATE на
+    BOT_REPLICAS). Backend шлёт тем же токеном мимо этого лимита.
+
+    Под нагрузкой HR получает ответ чуть медленнее вместо ошибки.
+    """
+
+    # чтобы словарь bucket'ов не рос бесконечно
+    _max_chat_buckets = 10_000
+
+    def __init__(
+        self,
+        global_rate: float = 25.0,
+        global_burst: float = 25.0,
+        chat_rate: float = 1.0,
+        chat_burst: float = 3.0,
+        max_retries: int = 3,
+    ) -> None:
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+        self.stats = FloodControlStats()
+
+        self._chat_buckets: dict[int | str, TokenBucket] = {}
+        # после глобального 429 все запросы ждут до этого момента
+        self._blocked_until = 0.0
+
+    def _chat_bucket(self, chat_id: int | str) -> TokenBucket:
+        # порядок словаря — от давно не писавших к недавним
+        bucket = self._chat_buckets.pop(chat_id, None)
+        if bucket is None:
+            if len(self._chat_buckets) >= self._max_chat_buckets:
+                self._prune()
+            bucket = TokenBucket(self.chat_rate, self.chat_burst)
+        self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    def _prune(self) -> None:
+        idle = [k for k, b in self._chat_buckets.items() if b.is_idle()]
+        for key in idle:
+            del self._chat_buckets[key]
+        # активных больше лимита — забываем самые давние
+        while len(self._chat_buckets) >= self._max_chat_buckets:
+            del self._chat_buckets[next(iter(self._chat_buckets))]
+
+    async def _acquire(self, chat_id: int | str | None) -> float:
+        """
+        Ждёт своей очереди. Возвращает время ожидания в секундах.
+
+        Сначала очередь чата, и только потом глобальный токен: запрос,
+        который всё равно ждёт свой чат, не занимает общий бюджет.
+        """
+        waited = 0.0
+
+        if chat_id is not None:
+            delay = self._chat_bucket(chat_id).reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                waited += delay
+            delay = max(
+                self.global_bucket.reserve(),
+                self._blocked_until - time.monotonic(),
+            )
+        else:
+            delay = self._blocked_until - time.monotonic()
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        # лимитируем только то, что что-то пишет в чат
+        # (answerCallbackQuery, getMe и т.п. не имеют chat_id)
+        chat_id = getattr(method, "chat_id", None)
+
+        waited = await self._acquire(chat_id)
+        if waited > 1:
+            logger.info(
+                "flood control: %s to %s waited %.2fs",
+                method.__api_method__,
+                chat_id,
+                waited,
+            )
+
+        attempt = 0
+        try:
+            while True:
+                try:
+                    return await make_request(bot, method)
+                except TelegramRetryAfter as exc:
+                    attempt += 1
+                    if attempt > self.max_retries:
+                        self.stats.failures += 1
+                        raise
+
+                    self.stats.retries += 1
+                    self._blocked_until = max(
+                        self._blocked_until,
+                        time.monotonic() + exc.retry_after,
+                    )
+                    logger.warning(
+                        "flood control: 429 on %s, retry in %ss (%s/%s)",
+                        method.__api_method__,
+                        exc.retry_after,
+                        attempt,
+                        self.max_retries,
+                    )
+                    waited += await self._acquire(chat_id)
+        finally:
+            # один раз на вызов: повторы не считаются новыми запросами
+            self.stats.observe_wait(waited)
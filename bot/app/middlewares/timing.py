@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject, Update
+from app.metrics import UpdateTiming, current_update, observe_telegram, observe_update
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+
+class UpdateTimingMiddleware(BaseMiddleware):
+    """
+    Outer-middleware на dp.update: время апдейта целиком, из него — в
+    BackendClient и в Bot API (app/metrics.py).
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: dict[str, Any],
+    ) -> Any:
+        timing = UpdateTiming()
+        token = current_update.set(timing)
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await handler(event, data)
+            failed = False
+            return result
+        finally:
+            current_update.reset(token)
+            observe_update(timing, time.perf_counter() - started, failed)
+
+
+class HandlerTimingMiddleware(BaseMiddleware):
+    """
+    Inner-middleware: записывает, какой хендлер обработал апдейт
+    (hr_open_app, cmd_start, ...) — метка гистограмм апдейта.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        timing = current_update.get()
+        handler_object = data.get("handler")
+        if timing is not None and handler_object is not None:
+            timing.handler = handler_object.callback.__name__
+        return await handler(event, data)
+
+
+class TelegramTimingMiddleware(BaseRequestMiddleware):
+    """
+    Session middleware: время вызовов Bot API по методам. Регистрируется
+    до FloodControlMiddleware — ожидание в очереди тоже входит.
+    """
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        finally:
+            observe_telegram(method.__api_method__, time.perf_counter() - started)
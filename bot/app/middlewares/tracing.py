@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, TelegramObject, Update
+from opentelemetry import trace
+
+tracer = trace.get_tracer(__name__)
+
+
+class UpdateTracingMiddleware(BaseMiddleware):
+    """
+    Outer-middleware на dp.update: спан на весь апдейт. Запросы к backend
+    и Telegram внутри него — дочерние спаны (aiohttp-инструментирование).
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: dict[str, Any],
+    ) -> Any:
+        attributes = {
+            "telegram.update_id": event.update_id,
+            "telegram.update_type": event.event_type,
+        }
+        user = data.get("event_from_user")
+        if user is not None:
+            attributes["telegram.user_id"] = user.id
+        with tracer.start_as_current_span(
+            f"update {event.event_type}",
+            kind=trace.SpanKind.SERVER,
+            attributes=attributes,
+        ):
+            return await handler(event, data)
+
+
+class HandlerNameMiddleware(BaseMiddleware):
+    """
+    Inner-middleware: называет спан апдейта по хендлеру (hr_open_app,
+    cmd_start, ...), чтобы искать медленные кнопки по имени.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        span = trace.get_current_span()
+        handler_object = data.get("handler")
+        if span.is_recording() and handler_object is not None:
+            name = handler_object.callback.__name__
+            span.update_name(f"handler {name}")
+            span.set_attribute("aiogram.handler", name)
+            if isinstance(event, CallbackQuery) and event.data:
+                span.set_attribute("telegram.callback_data", event.data)
+        return await handler(event, data)
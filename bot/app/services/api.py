@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+from contextvars import ContextVar
 from dataclasses import dataclass
 from typing import Any
 
 import aiohttp
+from app.metrics import timed_backend
+
+# от чьего имени вызовы (tg_user_id HR): после записи backend сам держит
+# для него метку read-your-writes, общую для всех реплик бота
+ACTOR_HEADER = "X-Actor-Tg-Id"
+
+current_actor: ContextVar[int | None] = ContextVar("current_actor", default=None)
 
 
 @dataclass(frozen=True)
@@ -12,8 +20,13 @@ class BackendClient:
     internal_token: str
 
     def _headers(self) -> dict[str, str]:
-        return {"X-Internal-Token": self.internal_token}
+        headers = {"X-Internal-Token": self.internal_token}
+        actor = current_actor.get()
+        if actor is not None:
+            headers[ACTOR_HEADER] = str(actor)
+        return headers
 
+    @timed_backend
     async def list_applications(
         self,
         status: str,
@@ -23,7 +36,13 @@ class BackendClient:
 
         status = status.lower()
         url = f"{self.base_url}/api/internal/admin/applications"
-        params = {"status": status, "limit": limit, "offset": offset}
+        # списку нужны только id/full_name — без длинных текстовых полей
+        params = {
+            "status": status,
+            "fields": "summary",
+            "limit": limit,
+            "offset": offset,
+        }
 
         async with aiohttp.ClientSession() as session:
             async with session.get(
@@ -34,6 +53,7 @@ class BackendClient:
                 resp.raise_for_status()
                 return await resp.json()
 
+    @timed_backend
     async def get_application(
         self,
         application_id: int,
@@ -46,6 +66,7 @@ class BackendClient:
                 resp.raise_for_status()
                 return await resp.json()
 
+    @timed_backend
     async def set_status(
         self,
         application_id: int,
@@ -62,6 +83,26 @@ class BackendClient:
                 resp.raise_for_status()
                 return await resp.json()
 
+    @timed_backend
+    async def bulk_set_status(
+        self,
+        application_ids: list[int],
+        status: str,
+    ) -> dict[str, Any]:
+
+        status = status.lower()
+        url = f"{self.base_url}/api/internal/admin/applications/status"
+
+        async with aiohttp.ClientSession() as session:
+            async with session.patch(
+                url,
+                headers=self._headers(),
+                json={"ids": application_ids, "status": status},
+            ) as resp:
+                resp.raise_for_status()
+                return await resp.json()
+
+    @timed_backend
     async def get_employer(self, tg_user_id: int) -> dict:
 
         url = f"{self.base_url}/api/internal/employers/by-tg/{tg_user_id}"
@@ -77,6 +118,25 @@ class BackendClient:
                 resp.raise_for_status()
                 return await resp.json()
 
+    @timed_backend
+    async def set_notification_mode(
+        self,
+        tg_user_id: int,
+        mode: str,
+    ) -> dict[str, Any]:
+
+        url = f"{self.base_url}/api/internal/employers/by-tg/{tg_user_id}/notifications"
+
+        async with aiohttp.ClientSession() as session:
+            async with session.patch(
+                url,
+                headers=self._headers(),
+                json={"mode": mode},
+            ) as resp:
+                resp.raise_for_status()
+                return await resp.json()
+
+    @timed_backend
     async def create_invite(
         self,
         tg_user_id: int,
@@ -94,6 +154,7 @@ class BackendClient:
                 resp.raise_for_status()
                 return await resp.json()
 
+    @timed_backend
     async def join_invite(
         self,
         tg_user_id: int,
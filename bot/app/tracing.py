@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# токен бота в пути запросов к Bot API — в трейсы не пишем
+_TOKEN_IN_PATH = re.compile(r"/bot[^/]+/")
+
+_provider = None
+
+
+def setup_tracing() -> bool:
+    """
+    Трейсинг OpenTelemetry (settings.tracing_exporter). Вызывать до
+    создания Bot: инструментируются ClientSession, созданные после —
+    и запросы к backend (BackendClient, заголовок traceparent), и к
+    api.telegram.org. Спаны апдейтов — middlewares/tracing.py.
+
+    Returns:
+        bool: трейсинг включён
+    """
+    global _provider
+    if not settings.tracing_exporter or _provider is not None:
+        return _provider is not None
+
+    from opentelemetry import trace
+    from opentelemetry.instrumentation.aiohttp_client import AioHttpClientInstrumentor
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.tracing_service_name}),
+        sampler=_sampler(),
+    )
+    provider.add_span_processor(BatchSpanProcessor(_exporter()))
+    trace.set_tracer_provider(provider)
+    AioHttpClientInstrumentor().instrument(
+        url_filter=_redact_url,
+        request_hook=_name_client_span,
+    )
+
+    _provider = provider
+    logger.info(
+        "tracing: %s exporter, sample ratio %s",
+        settings.tracing_exporter,
+        settings.tracing_sample_ratio,
+    )
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Досылает накопленные спаны."""
+    global _provider
+    if _provider is not None:
+        _provider.shutdown()
+        _provider = None
+
+
+def _redact_url(url) -> str:
+    return _TOKEN_IN_PATH.sub("/bot<token>/", str(url))
+
+
+def _name_client_span(span, params) -> None:
+    """«telegram sendMessage» / «backend GET /api/...» вместо «GET»/«POST»."""
+    path = params.url.path
+    if path.startswith("/bot"):
+        span.update_name(f"telegram {path.rsplit('/', 1)[-1]}")
+    else:
+        span.update_name(f"backend {params.method} {path}")
+
+
+def _sampler():
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace.sampling import (
+        Decision,
+        ParentBased,
+        Sampler,
+        SamplingResult,
+        TraceIdRatioBased,
+    )
+
+    # трейс начинается с апдейта: здесь и решается, пишем ли его
+    base = ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio))
+
+    class SkipOrphanClients(Sampler):
+        """
+        HTTP вне апдейта (getUpdates в polling, setWebhook) — без трейса.
+        """
+
+        def should_sample(
+            self, parent_context, trace_id, name, kind=None, *args, **kwargs
+        ):
+            parent = trace.get_current_span(parent_context).get_span_context()
+            if not parent.is_valid and kind == trace.SpanKind.CLIENT:
+                return SamplingResult(Decision.DROP)
+            return base.should_sample(
+                parent_context, trace_id, name, kind, *args, **kwargs
+            )
+
+        def get_description(self) -> str:
+            return f"SkipOrphanClients({base.get_description()})"
+
+    return SkipOrphanClients()
+
+
+def _exporter():
+    if settings.tracing_exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+    if settings.tracing_exporter == "jsonl":
+        return _jsonl_exporter(Path(settings.tracing_jsonl_path))
+    raise RuntimeError(f"unknown TRACING_EXPORTER: {settings.tracing_exporter}")
+
+
+def _jsonl_exporter(path: Path):
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+    class JsonlSpanExporter(SpanExporter):
+        """Спан — строка JSON в файле: разбор без коллектора (jq, pandas)."""
+
+        def __init__(self) -> None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = path.open("a", encoding="utf-8")
+            self._lock = threading.Lock()
+
+        def export(self, spans) -> SpanExportResult:
+            lines = [
+                json.dumps(json.loads(span.to_json()), ensure_ascii=False)
+                for span in spans
+            ]
+            with self._lock:
+                self._file.write("\n".join(lines) + "\n")
+                self._file.flush()
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self) -> None:
+            with self._lock:
+                self._file.close()
+
+    return JsonlSpanExporter()